@@ -1,10 +1,17 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+import json
 import os
 import time
+from typing import Optional
 
 # Configuration with better error handling
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+# Only request the article fields the UI actually renders
+DIGEST_FIELDS = "title,description,source,url,ai_summary"
+# Reruns (any widget change) reuse a digest this long instead of refetching it
+DIGEST_CACHE_SECONDS = 300
 
 st.set_page_config(
     page_title="AI News Digest",
@@ -15,18 +22,183 @@ st.set_page_config(
 st.title("📰 AI-Powered News Digest - DEBUG MODE")
 st.markdown("Get personalized news summaries powered by AI")
 
+@st.cache_resource
+def api_session() -> requests.Session:
+    """One pooled keep-alive session for all backend calls, shared across reruns"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+class DigestError(Exception):
+    """The backend answered, but without a digest"""
+    
+    def __init__(self, response: requests.Response):
+        super().__init__(f"API returned error: {response.status_code}")
+        self.response = response
+
+def summary_label(item: dict) -> str:
+    """Extractive summaries are the backend's fallback when the LLM is unavailable"""
+    if item.get('summary_type') == 'extractive':
+        return "Key Sentences (AI unavailable)"
+    return "AI Summary"
+
+def digest_params(max_articles: int, interests: str) -> dict:
+    """The backend ranks its candidates and only summarizes the top max_articles"""
+    params = {"fields": DIGEST_FIELDS, "top_k": max_articles}
+    if interests.strip():
+        params["interests"] = interests
+    return params
+
+@st.cache_data(ttl=10, show_spinner=False)
+def check_health() -> Optional[dict]:
+    """The backend's /health answer, or None if it isn't healthy"""
+    response = api_session().get(f"{API_BASE_URL}/health", timeout=5)
+    return response.json() if response.status_code == 200 else None
+
+def run_digest_job(topic: str, max_articles: int, interests: str) -> requests.Response:
+    """Queue the digest as a backend job and long-poll it; returns the last response"""
+    session = api_session()
+    response = session.post(
+        f"{API_BASE_URL}/jobs",
+        json={
+            "topic": topic,
+            "top_k": max_articles,
+            "interests": [interest.strip() for interest in interests.split(",") if interest.strip()]
+        },
+        timeout=10
+    )
+    if response.status_code != 202:
+        return response  # e.g. 429 - the queue is full
+    
+    poll_url = f"{API_BASE_URL}{response.json()['poll_url']}"
+    while True:
+        # Each poll returns as soon as the job finishes, or after `wait` seconds
+        response = session.get(poll_url, params={"wait": 25, "fields": DIGEST_FIELDS}, timeout=30)
+        if response.status_code != 200 or response.json()["status"] in ("succeeded", "failed"):
+            return response
+
+@st.cache_data(ttl=DIGEST_CACHE_SECONDS, show_spinner=False)
+def fetch_digest(topic: str, max_articles: int, interests: str) -> dict:
+    """A finished digest, cached per topic and options - failures raise and aren't cached"""
+    response = run_digest_job(topic, max_articles, interests)
+    job = response.json() if response.status_code == 200 else {}
+    if job.get("status") != "succeeded":
+        raise DigestError(response)
+    return job["result"]
+
+def render_digest(data: dict, max_articles: int):
+    # Display summary
+    st.success(f"📊 Found {data['article_count']} articles. Summarized {data['summarized_count']}.")
+    
+    # Display cost info
+    cost = data['cost_metrics']
+    st.info(f"💰 Cost: ${cost['daily_spent']} | Remaining: ${cost['remaining_budget']}")
+    
+    # Display articles
+    if data['articles']:
+        for i, article in enumerate(data['articles'][:max_articles]):
+            with st.expander(f"📰 {article['title']}", expanded=i==0):
+                col1, col2 = st.columns([3, 1])
+                
+                with col1:
+                    if article.get('ai_summary'):
+                        st.write(f"**{summary_label(article)}:**", article['ai_summary'])
+                    else:
+                        st.write("**Description:**", article.get('description') or 'No description available')
+                
+                with col2:
+                    st.write("**Source:**", article.get('source', 'Unknown'))
+                    if article.get('url'):
+                        st.markdown(f"[Read Full Article]({article['url']})")
+    else:
+        st.warning("No articles found or summarized. Try a different topic.")
+
+def stream_news_digest(topic: str, max_articles: int, interests: str) -> Optional[dict]:
+    """
+    Render a digest incrementally from the backend's NDJSON streaming
+    endpoint; returns it, in the /news/{topic} shape, once complete
+    """
+    status = st.empty()
+    status.info("🔄 Fetching articles...")
+    articles = {}
+    summary_slots = {}
+    
+    # The read timeout applies between lines, not to the whole digest
+    with api_session().get(
+        f"{API_BASE_URL}/news/{topic}/stream",
+        params=digest_params(max_articles, interests),
+        stream=True,
+        timeout=(5, 30)
+    ) as response:
+        st.write(f"**Response Status:** {response.status_code}")
+        if response.status_code != 200:
+            st.error(f"API returned error: {response.status_code}")
+            st.json(response.json())  # Show error details
+            return None
+        
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            index = event.get("index")
+            
+            if event["type"] == "meta":
+                if event["article_count"] == 0:
+                    status.warning("No articles found or summarized. Try a different topic.")
+                else:
+                    status.info(f"🧠 Picked the {event['article_count']} most relevant of {event['candidate_count']} articles. Summarizing...")
+            
+            elif event["type"] == "article" and index < max_articles:
+                article = articles[index] = event["article"]
+                with st.expander(f"📰 {article['title']}", expanded=index == 0):
+                    col1, col2 = st.columns([3, 1])
+                    
+                    with col1:
+                        summary_slots[index] = st.empty()
+                        summary_slots[index].write("⏳ Summarizing...")
+                    
+                    with col2:
+                        st.write("**Source:**", article.get('source', 'Unknown'))
+                        if article.get('url'):
+                            st.markdown(f"[Read Full Article]({article['url']})")
+            
+            elif event["type"] == "summary" and index in summary_slots:
+                summary_slots[index].markdown(f"**{summary_label(event)}:** {event['ai_summary']}")
+                articles[index]["ai_summary"] = event["ai_summary"]
+                articles[index]["summary_type"] = event["summary_type"]
+            
+            elif event["type"] == "skipped" and index in summary_slots:
+                description = articles[index].get('description') or 'No description available'
+                summary_slots[index].markdown(f"**Description:** {description}")
+            
+            elif event["type"] == "done":
+                status.success(f"📊 Found {event['summarized_count'] + event['skipped_count']} articles. Summarized {event['summarized_count']}.")
+                cost = event['cost_metrics']
+                st.info(f"💰 Cost: ${cost['daily_spent']} | Remaining: ${cost['remaining_budget']}")
+                return {
+                    "topic": topic,
+                    "article_count": event['summarized_count'] + event['skipped_count'],
+                    "summarized_count": event['summarized_count'],
+                    "cost_metrics": cost,
+                    "articles": [articles[i] for i in sorted(articles)]
+                }
+    return None
+
 # Debug information
 with st.expander("🔧 Debug Information", expanded=True):
     st.write(f"**API Base URL:** {API_BASE_URL}")
     
-    # Test backend connection
+    # Test backend connection - the result is reused below instead of asking twice
+    health = None
     try:
-        health_response = requests.get(f"{API_BASE_URL}/health", timeout=5)
-        if health_response.status_code == 200:
+        health = check_health()
+        if health is not None:
             st.success("✅ Backend API is running and accessible")
-            st.json(health_response.json())
+            st.json(health)
         else:
-            st.error(f"❌ Backend returned status: {health_response.status_code}")
+            st.error("❌ Backend is not healthy")
     except requests.exceptions.ConnectionError:
         st.error("❌ Cannot connect to backend API. Make sure it's running on port 8000")
     except Exception as e:
@@ -37,61 +209,43 @@ with st.sidebar:
     st.header("Settings")
     topic = st.text_input("Topic", value="artificial intelligence")
     max_articles = st.slider("Max Articles", 5, 20, 10)
+    interests = st.text_input("Interests (optional)", placeholder="e.g. startups, regulation")
+    stream_results = st.checkbox("Stream results as they are ready", value=True)
     
     if st.button("Get News Digest"):
-        st.session_state.get_news = True
+        st.session_state.digest_request = (topic, max_articles, interests)
 
-# Main content area
-if st.session_state.get('get_news', False):
+# Main content area - the last requested digest stays up across reruns,
+# served from the cache until it expires
+if st.session_state.get('digest_request'):
+    topic, max_articles, interests = st.session_state.digest_request
     with st.spinner("🔄 Fetching and summarizing news..."):
         try:
-            # Test connection first
-            health_check = requests.get(f"{API_BASE_URL}/health", timeout=5)
-            if health_check.status_code != 200:
+            if health is None:
                 st.error("Backend is not healthy. Please check if the API server is running.")
                 st.stop()
             
-            # Make the actual news request
-            response = requests.get(
-                f"{API_BASE_URL}/news/{topic}", 
-                timeout=30  # Longer timeout for news processing
-            )
-            
-            st.write(f"**Response Status:** {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Display summary
-                st.success(f"📊 Found {data['article_count']} articles. Summarized {data['summarized_count']}.")
-                
-                # Display cost info
-                cost = data['cost_metrics']
-                st.info(f"💰 Cost: ${cost['daily_spent']} | Remaining: ${cost['remaining_budget']}")
-                
-                # Display articles
-                if data['articles']:
-                    for i, article in enumerate(data['articles'][:max_articles]):
-                        with st.expander(f"📰 {article['title']}", expanded=i==0):
-                            col1, col2 = st.columns([3, 1])
-                            
-                            with col1:
-                                if article.get('ai_summary'):
-                                    st.write("**AI Summary:**", article['ai_summary'])
-                                else:
-                                    st.write("**Description:**", article.get('description', 'No description available'))
-                            
-                            with col2:
-                                st.write("**Source:**", article.get('source', 'Unknown'))
-                                if article.get('url'):
-                                    st.markdown(f"[Read Full Article]({article['url']})")
-                else:
-                    st.warning("No articles found or summarized. Try a different topic.")
-            
+            streamed = st.session_state.get('streamed_digest')
+            if streamed and streamed['request'] == st.session_state.digest_request and time.time() - streamed['at'] < DIGEST_CACHE_SECONDS:
+                render_digest(streamed['digest'], max_articles)
+            elif stream_results:
+                digest = stream_news_digest(topic, max_articles, interests)
+                if digest is not None:
+                    st.session_state.streamed_digest = {
+                        "request": st.session_state.digest_request,
+                        "digest": digest,
+                        "at": time.time()
+                    }
             else:
-                st.error(f"API returned error: {response.status_code}")
-                st.json(response.json())  # Show error details
-                
+                # Queued as a job, so a busy backend answers with 429 instead of timing out
+                render_digest(fetch_digest(topic, max_articles, interests), max_articles)
+        
+        except DigestError as e:
+            if e.response.status_code == 429:
+                st.warning(f"⏳ The server is busy. Try again in {e.response.headers.get('Retry-After', 'a few')} seconds.")
+            else:
+                st.error(str(e))
+                st.json(e.response.json())  # Show error details
         except requests.exceptions.ConnectionError:
             st.error("❌ Cannot connect to the backend server. Make sure:")
             st.error("1. The FastAPI server is running on port 8000")
@@ -100,9 +254,6 @@ if st.session_state.get('get_news', False):
             st.error("⏰ Request timed out. The backend might be processing slowly.")
         except Exception as e:
             st.error(f"💥 Unexpected error: {str(e)}")
-    
-    # Reset the button state
-    st.session_state.get_news = False
 
 else:
     # Welcome screen
@@ -117,7 +268,7 @@ else:
     
     **How to use:**
     1. Enter a topic in the sidebar
-    2. Adjust article count if needed  
+    2. Adjust article count if needed
     3. Click "Get News Digest"
     4. Read AI-generated summaries!
     
@@ -125,4 +276,4 @@ else:
     - Make sure the backend API is running on port 8000
     - Check that your OpenAI API key is valid
     - Verify your NewsAPI key is working
-    """)
\ No newline at end of file
+    """)
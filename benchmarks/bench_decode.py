@@ -0,0 +1,74 @@
+"""
+Microbenchmark: NewsAPI response body -> internal articles.
+
+Compares the path the fetchers used before (json.loads -> NewsAPIResponse ->
+ArticleRecord.from_newsapi, raw_data not captured) with the single-pass
+decoder that replaced it.
+
+    python -m benchmarks.bench_decode [--articles 100] [--repeat 200]
+"""
+import argparse
+import json
+import os
+import time
+from typing import Callable
+
+os.environ.setdefault("NEWSAPI_KEY", "benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from src.core.decode import JSON_BACKEND, decode_articles
+from src.core.models import ArticleRecord, NewsAPIResponse
+
+def make_payload(article_count: int) -> bytes:
+    articles = [
+        {
+            "source": {"id": None, "name": f"Source {i % 12}"},
+            "author": f"Reporter {i}",
+            "title": f"Headline number {i} about markets, policy and technology",
+            "description": "A short standfirst describing the story in a sentence or two. " * 2,
+            "url": f"https://www.example-news.com/2024/01/story-{i}?utm_source=feed",
+            "urlToImage": f"https://cdn.example-news.com/img/{i}.jpg",
+            "publishedAt": f"2024-01-{i % 28 + 1:02d}T{i % 24:02d}:15:00Z",
+            "content": "Body text of the article as truncated by NewsAPI. " * 4 + "[+3120 chars]"
+        }
+        for i in range(article_count)
+    ]
+    return json.dumps({"status": "ok", "totalResults": article_count, "articles": articles}).encode("utf-8")
+
+def pydantic_path(body: bytes):
+    """The fetchers' former _to_articles(response.json())"""
+    news_data = NewsAPIResponse(**json.loads(body))
+    return [ArticleRecord.from_newsapi(api_article) for api_article in news_data.articles]
+
+def decode_path(body: bytes):
+    return decode_articles(body)
+
+def measure(fn: Callable[[bytes], list], body: bytes, repeat: int) -> float:
+    """Best-of-5 mean seconds per call"""
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(body)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=100, help="articles per payload")
+    parser.add_argument("--repeat", type=int, default=200, help="decodes per timing run")
+    args = parser.parse_args()
+
+    body = make_payload(args.articles)
+    assert len(pydantic_path(body)) == len(decode_path(body)) == args.articles
+
+    baseline = measure(pydantic_path, body, args.repeat)
+    fast = measure(decode_path, body, args.repeat)
+
+    print(f"payload: {args.articles} articles, {len(body) / 1024:.1f} KiB (JSON backend: {JSON_BACKEND})")
+    print(f"json + pydantic models:      {baseline * 1e6:9.1f} us/page  {baseline * 1e6 / args.articles:7.2f} us/article")
+    print(f"single-pass decode:          {fast * 1e6:9.1f} us/page  {fast * 1e6 / args.articles:7.2f} us/article")
+    print(f"speedup: {baseline / fast:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Local stand-ins for NewsAPI and the OpenAI chat completions API, for load
+tests and offline development. Latency, 5xx errors and 429s are injected
+at configurable rates.
+
+    python -m benchmarks.fake_servers --newsapi-port 9100 --openai-port 9200 \\
+        --openai-latency 0.8 --error-rate 0.02 --rate-limit-rate 0.05
+
+then point the backend at them:
+
+    NEWSAPI_BASE_URL=http://127.0.0.1:9100/v2 OPENAI_BASE_URL=http://127.0.0.1:9200/v1
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+_WORDS = (
+    "government market energy climate election court technology company investors "
+    "researchers officials city police health school report policy trade prices "
+    "deal agreement talks vote budget study data launch network security storm"
+).split()
+
+_BATCH_ARTICLE = re.compile(r"ARTICLE (\d+):")
+
+@dataclass
+class FaultConfig:
+    latency: float = 0.1  # Mean seconds per request
+    jitter: float = 0.5  # Latency varies uniformly by +/- this fraction
+    error_rate: float = 0.0  # Share of requests answered with a 500
+    rate_limit_rate: float = 0.0  # Share of requests answered with a 429
+    retry_after_ms: int = 500
+
+    def delay(self) -> float:
+        return max(0.0, self.latency * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def fault(self) -> Optional[int]:
+        roll = random.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+class _Handler(BaseHTTPRequestHandler):
+    faults = FaultConfig()
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Optional[dict] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _inject(self) -> bool:
+        """Sleep for the configured latency; answer with an injected fault if one is rolled"""
+        time.sleep(self.faults.delay())
+        status = self.faults.fault()
+        if status == 429:
+            self._send_json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit"}},
+                            {"retry-after-ms": self.faults.retry_after_ms})
+            return True
+        if status == 500:
+            self._send_json(500, {"error": {"message": "Injected server error", "type": "server_error"}})
+            return True
+        return False
+
+class FakeNewsAPIHandler(_Handler):
+    page_size = 10
+    overlap = 0.3  # Share of articles that are syndicated copies of another article
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/everything"):
+            self._send_json(404, {"status": "error", "code": "notFound", "message": url.path})
+            return
+        if self._inject():
+            return
+
+        query = parse_qs(url.query)
+        topic = query.get("q", ["news"])[0]
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("pageSize", [str(self.page_size)])[0])
+        articles = [self._article(topic, page, index) for index in range(page_size)]
+        self._send_json(200, {"status": "ok", "totalResults": page_size * 5, "articles": articles})
+
+    def _article(self, topic: str, page: int, index: int) -> dict:
+        # Deterministic per (topic, page, index) so repeat fetches hit the caches
+        story = index
+        rng = random.Random(f"{topic}:{page}:{index}")
+        if rng.random() < self.overlap and index > 0:
+            story = rng.randrange(index)  # Same story, different outlet
+        story_rng = random.Random(f"{topic}:{page}:story{story}")
+        sentences = [
+            " ".join(story_rng.choice(_WORDS) for _ in range(story_rng.randint(10, 18))).capitalize() + "."
+            for _ in range(6)
+        ]
+        published = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(hours=page * 100 + index)
+        return {
+            "source": {"id": None, "name": f"Outlet {index % 7}"},
+            "author": f"Reporter {index}",
+            "title": f"{topic.title()}: {' '.join(sentences[0].split()[:8])}",
+            "description": sentences[0],
+            "url": f"https://outlet{index % 7}.example.com/{topic}/{page}/{index}?utm_source=feed",
+            "urlToImage": None,
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": " ".join(sentences[1:]) + f" [+{2000 + index} chars]"
+        }
+
+class FakeOpenAIHandler(_Handler):
+    requests_per_minute = 3500
+    tokens_per_minute = 90_000
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": self.path}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self._inject():
+            return
+
+        prompt = "\n".join(message.get("content") or "" for message in request.get("messages", []))
+        content = self._completion_text(prompt)
+        prompt_tokens = len(prompt) // 4 + 1
+        completion_tokens = len(content) // 4 + 1
+        self._send_json(200, {
+            "id": "chatcmpl-" + hashlib.md5(prompt.encode("utf-8")).hexdigest()[:12],
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }, {
+            "x-ratelimit-limit-requests": self.requests_per_minute,
+            "x-ratelimit-remaining-requests": self.requests_per_minute - 1,
+            "x-ratelimit-limit-tokens": self.tokens_per_minute,
+            "x-ratelimit-remaining-tokens": self.tokens_per_minute - prompt_tokens
+        })
+
+    def _completion_text(self, prompt: str) -> str:
+        numbers = _BATCH_ARTICLE.findall(prompt)
+        if numbers and "Respond with JSON" in prompt:
+            return json.dumps({"summaries": [
+                {"id": int(number), "summary": f"Summary of article {number}. It covers the main facts."}
+                for number in numbers
+            ]})
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        return f"A concise summary ({digest}) of the main event. It notes the key facts and why they matter."
+
+def start_server(handler: type, port: int = 0, faults: Optional[FaultConfig] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve `handler` on 127.0.0.1 in a daemon thread; returns (server, base URL)"""
+    handler = type(handler.__name__, (handler,), {"faults": faults or FaultConfig()})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def start_fake_newsapi(port: int = 0, faults: Optional[FaultConfig] = None) -> Tuple[ThreadingHTTPServer, str]:
+    server, url = start_server(FakeNewsAPIHandler, port, faults)
+    return server, f"{url}/v2"
+
+def start_fake_openai(port: int = 0, faults: Optional[FaultConfig] = None) -> Tuple[ThreadingHTTPServer, str]:
+    server, url = start_server(FakeOpenAIHandler, port, faults)
+    return server, f"{url}/v1"
+
+def add_fault_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--newsapi-latency", type=float, default=0.15, help="mean NewsAPI latency (s)")
+    parser.add_argument("--openai-latency", type=float, default=0.6, help="mean OpenAI latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of OpenAI 429 responses")
+
+def faults_from_args(args: argparse.Namespace) -> Tuple[FaultConfig, FaultConfig]:
+    """(NewsAPI faults, OpenAI faults) - 429s are only injected on the OpenAI side"""
+    return (
+        FaultConfig(latency=args.newsapi_latency, error_rate=args.error_rate),
+        FaultConfig(latency=args.openai_latency, error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--newsapi-port", type=int, default=9100)
+    parser.add_argument("--openai-port", type=int, default=9200)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    newsapi_faults, openai_faults = faults_from_args(args)
+    _, newsapi_url = start_fake_newsapi(args.newsapi_port, newsapi_faults)
+    _, openai_url = start_fake_openai(args.openai_port, openai_faults)
+    print(f"NEWSAPI_BASE_URL={newsapi_url}")
+    print(f"OPENAI_BASE_URL={openai_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
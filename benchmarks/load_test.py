@@ -0,0 +1,249 @@
+"""
+Load test for GET /news/{topic} against local NewsAPI/OpenAI stand-ins.
+
+Starts the fake upstreams, runs the backend under uvicorn pointed at them
+(fresh cache directory, dummy keys), drives it at a fixed concurrency and
+reports latency percentiles, throughput, cache hit rate and simulated LLM
+cost. Results are written as JSON so runs can be compared:
+
+    python -m benchmarks.load_test --requests 300 --concurrency 20
+    python -m benchmarks.load_test --compare benchmarks/results/<earlier>.json
+
+Use --target to drive an already running backend instead (its upstreams
+are then whatever it is configured with).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.fake_servers import add_fault_arguments, faults_from_args, start_fake_newsapi, start_fake_openai
+
+DEFAULT_TOPICS = [
+    "technology", "climate", "elections", "markets", "space", "health",
+    "sports", "energy", "ai", "security", "travel", "science"
+]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+def parse_metrics(text: str) -> Dict[str, float]:
+    """Flatten Prometheus text into {'name{labels}': value}"""
+    samples = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line.strip())
+        if match:
+            name, labels, value = match.groups()
+            samples[name + (labels or "")] = float(value)
+    return samples
+
+def metric_total(samples: Dict[str, float], name: str, **labels: str) -> float:
+    """Sum of a metric's samples whose labels include `labels`"""
+    wanted = [f'{key}="{value}"' for key, value in labels.items()]
+    return sum(
+        value for key, value in samples.items()
+        if (key == name or key.startswith(name + "{")) and all(label in key for label in wanted)
+    )
+
+def pick_topic(topics: List[str], skew: float) -> str:
+    """Zipf-like: a few hot topics get most of the traffic, as in production"""
+    weights = [1 / (rank + 1) ** skew for rank in range(len(topics))]
+    return random.choices(topics, weights=weights)[0]
+
+async def drive(base_url: str, total: int, concurrency: int, topics: List[str], skew: float, timeout: float) -> Dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    summarized = extractive = skipped = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(pick_topic(topics, skew))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker():
+            nonlocal summarized, extractive, skipped
+            while True:
+                try:
+                    topic = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                try:
+                    response = await client.get(f"/news/{topic}")
+                    status = str(response.status_code)
+                    if response.status_code == 200:
+                        body = response.json()
+                        summarized += body.get("summarized_count", 0)
+                        extractive += body.get("extractive_count", 0)
+                        skipped += body.get("skipped_count", 0)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        metrics_text = (await client.get("/metrics")).text
+        cost = (await client.get("/cost-metrics")).json()
+
+    samples = parse_metrics(metrics_text)
+    hits = metric_total(samples, "summary_cache_requests_total", result="hit") + \
+        metric_total(samples, "summary_cache_requests_total", result="near_duplicate")
+    lookups = metric_total(samples, "summary_cache_requests_total")
+    topic_hits = metric_total(samples, "topic_cache_requests_total", result="hit")
+    topic_lookups = metric_total(samples, "topic_cache_requests_total")
+
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies) * 1000, 1) if latencies else 0.0
+        },
+        "status_counts": statuses,
+        "summaries": {"summarized": summarized, "extractive": extractive, "skipped": skipped},
+        "summary_cache_hit_rate": round(hits / lookups, 4) if lookups else None,
+        "topic_cache_hit_rate": round(topic_hits / topic_lookups, 4) if topic_lookups else None,
+        "llm_calls": metric_total(samples, "upstream_request_seconds_count", upstream="openai"),
+        "llm_retries": metric_total(samples, "upstream_retries_total", upstream="openai"),
+        "simulated_cost_usd": cost.get("daily_spent")
+    }
+
+def start_backend(newsapi_url: str, openai_url: str, port: int, extra_env: Dict[str, str]) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "NEWSAPI_KEY": "load-test",
+        "OPENAI_API_KEY": "load-test",
+        "NEWSAPI_BASE_URL": newsapi_url,
+        "OPENAI_BASE_URL": openai_url,
+        "CACHE_DIR": tempfile.mkdtemp(prefix="news-digest-bench-"),
+        "DAILY_BUDGET": "1000",  # Measure cost, don't cap it
+        "PREWARM_ENABLED": "false",
+        **extra_env
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env
+    )
+
+def wait_for_health(base_url: str, process: Optional[subprocess.Popen], timeout: float = 30.0) -> float:
+    """Seconds until /health answered"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Backend exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError(f"Backend not healthy after {timeout}s")
+
+def print_report(result: Dict, baseline: Optional[Dict] = None) -> None:
+    def delta(path: List[str]) -> str:
+        if baseline is None:
+            return ""
+        old, new = baseline, result
+        for key in path:
+            old, new = (old or {}).get(key), (new or {}).get(key)
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or not old:
+            return ""
+        return f"  ({(new - old) / old * 100:+.1f}% vs baseline)"
+
+    latency = result["latency_ms"]
+    print(f"requests: {result['requests']} at concurrency {result['concurrency']} "
+          f"in {result['elapsed_seconds']}s, statuses {result['status_counts']}")
+    print(f"throughput: {result['throughput_rps']} req/s{delta(['throughput_rps'])}")
+    for pct in ("p50", "p95", "p99"):
+        print(f"latency {pct}: {latency[pct]} ms{delta(['latency_ms', pct])}")
+    print(f"summary cache hit rate: {result['summary_cache_hit_rate']}  "
+          f"topic cache hit rate: {result['topic_cache_hit_rate']}")
+    print(f"LLM calls: {int(result['llm_calls'])}, retries: {int(result['llm_retries'])}, "
+          f"simulated cost: ${result['simulated_cost_usd']}{delta(['simulated_cost_usd'])}")
+    print(f"summaries: {result['summaries']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--topics", type=int, default=len(DEFAULT_TOPICS), help="distinct topics to request")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of topic popularity")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request client timeout (s)")
+    parser.add_argument("--port", type=int, default=8765, help="port for the backend under test")
+    parser.add_argument("--target", help="base URL of an already running backend")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra backend setting, e.g. --env BATCH_SUMMARIZATION=true")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--seed", type=int, default=7)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    process = None
+    base_url = args.target
+    if base_url is None:
+        newsapi_faults, openai_faults = faults_from_args(args)
+        _, newsapi_url = start_fake_newsapi(faults=newsapi_faults)
+        _, openai_url = start_fake_openai(faults=openai_faults)
+        extra_env = dict(item.split("=", 1) for item in args.env)
+        process = start_backend(newsapi_url, openai_url, args.port, extra_env)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        ready_seconds = wait_for_health(base_url, process)
+        topics = DEFAULT_TOPICS[:max(1, args.topics)]
+        result = asyncio.run(drive(base_url, args.requests, args.concurrency, topics, args.skew, args.timeout))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    result = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "ready_seconds": round(ready_seconds, 3),
+        **result
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load_test_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"results saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Offline batch digests, without the API server:
+
+    python -m src.batch topics.jsonl digests.jsonl --concurrency 8
+
+Each input line is a topic to build a digest for, or a single article to
+summarize:
+
+    {"topic": "climate", "top_k": 5, "interests": ["energy"]}
+    {"id": "a-17", "title": "...", "url": "https://...", "description": "...", "content": "..."}
+
+Each item produces one output line as soon as it is done. The output file
+doubles as the checkpoint: rerunning with the same output skips every item
+whose latest line has status "ok", so a crashed run - or one halted because
+the daily LLM budget ran out - picks up where it stopped. Items that only
+got extractive fallback summaries ("partial") or failed ("error") are done
+again, so readers should take the last line per id. Items are identified by
+their "id", else by topic or article URL.
+
+Upstreams and budget come from the usual settings; point NEWSAPI_BASE_URL
+and OPENAI_BASE_URL at benchmarks/fake_servers.py for a run with no keys
+and no spend.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
+from src.config.settings import settings
+from src.core.keys import canonicalize_url
+from src.core.models import ArticleRecord, normalize_topic, parse_published_at
+from src.core.news_fetcher import AsyncNewsFetcher
+from src.core.ranking import ArticleRanker
+from src.core.summarizer import SmartSummarizer
+
+logger = logging.getLogger(__name__)
+
+EXIT_INCOMPLETE = 1  # Some items failed or only got extractive summaries - rerun to retry them
+EXIT_BUDGET = 2  # Halted when the daily budget ran out - rerun to resume
+PROGRESS_SECONDS = 10.0
+
+def item_id(item: Dict[str, Any]) -> str:
+    if item.get("id") is not None:
+        return str(item["id"])
+    if item.get("topic"):
+        return f"topic:{normalize_topic(item['topic'])}"
+    return f"url:{canonicalize_url(item['url'])}"
+
+def read_items(path: str) -> Iterator[Dict[str, Any]]:
+    """Input items, read lazily; malformed lines are logged and skipped"""
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+                if not isinstance(item, dict) or not (item.get("topic") or (item.get("url") and item.get("title"))):
+                    raise ValueError("needs a topic, or an article url and title")
+                item_id(item)  # Fail here, not in a worker, on an item that has no usable id
+            except ValueError as e:
+                logger.warning(f"{path}:{number}: skipping invalid line ({str(e)})")
+                continue
+            yield item
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Ids whose latest line in an earlier run's output has status ok"""
+    latest: Dict[str, bool] = {}
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Cut short when a run was killed mid-write
+            if not isinstance(record, dict) or not isinstance(record.get("id"), str):
+                continue  # Not one of our records
+            latest[record["id"]] = record.get("status") == "ok"
+    return {key for key, ok in latest.items() if ok}
+
+def _interest_list(interests: Union[str, List[str], None]) -> List[str]:
+    if isinstance(interests, str):
+        interests = interests.split(",")
+    return [interest.strip() for interest in interests or () if interest.strip()]
+
+class BatchRunner:
+    """
+    Streams input items through the fetcher, ranker and summarizer with
+    `concurrency` items in flight, appending each result to the output as
+    it completes. Stops taking new items once the LLM budget refuses a call;
+    items already in flight finish (with extractive fallbacks) first.
+    """
+
+    def __init__(
+        self,
+        news_fetcher: AsyncNewsFetcher,
+        summarizer: SmartSummarizer,
+        ranker: ArticleRanker,
+        output,
+        concurrency: int = 4,
+        top_k: int = 10
+    ):
+        self.news_fetcher = news_fetcher
+        self.summarizer = summarizer
+        self.ranker = ranker
+        self.output = output
+        self.concurrency = max(1, concurrency)
+        self.top_k = top_k
+        self.halted = False
+        self.counts = {"ok": 0, "partial": 0, "error": 0, "already_done": 0}
+        self._started = time.perf_counter()
+        self._last_progress = self._started
+
+    async def run(self, items: Iterator[Dict[str, Any]], done: Set[str]) -> Dict[str, int]:
+        await asyncio.gather(*(self._work(items, done) for _ in range(self.concurrency)))
+        return self.counts
+
+    async def _work(self, items: Iterator[Dict[str, Any]], done: Set[str]) -> None:
+        cost_controller = self.summarizer.cost_controller
+        for item in items:  # Shared by all workers - each item is taken once
+            key = item_id(item)
+            if key in done:
+                self.counts["already_done"] += 1
+                continue
+            done.add(key)  # Repeats further down the input are skipped too
+
+            refusals = cost_controller.budget_refusals
+            try:
+                record = await (self._digest(item) if item.get("topic") else self._summarize(item))
+            except Exception as e:
+                logger.error(f"Batch item {key} failed: {str(e)}")
+                record = {"status": "error", "error": str(e)}
+            self._write({"id": key, **record})
+
+            if cost_controller.budget_refusals > refusals or cost_controller.budget_exhausted:
+                if not self.halted:
+                    logger.warning("Daily budget exhausted - finishing items in flight, then stopping")
+                self.halted = True
+            if self.halted:
+                return
+
+    async def _digest(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        topic = item["topic"]
+        k = min(item.get("top_k") or self.top_k, settings.digest_max_top_k)
+        candidates = await self.news_fetcher.fetch_articles(topic)
+        if self.news_fetcher.is_stale(topic):
+            # NewsAPI failed - an "ok" line would stop a resumed run from retrying the topic
+            return {
+                "status": "error",
+                "topic": topic,
+                "error": "NewsAPI unavailable",
+                "candidate_count": len(candidates)
+            }
+        ranked = self.ranker.top_k(
+            candidates, k, topic, _interest_list(item.get("interests")),
+            eligible=self.summarizer.cost_controller.is_article_quality
+        )
+        summaries = await self.summarizer.summarize_articles([article for article, _ in ranked])
+
+        articles = []
+        for (article, relevance), summary in zip(ranked, summaries):
+            if summary:
+                articles.append({
+                    **article.to_dict(),
+                    "ai_summary": summary.text,
+                    "summary_type": summary.kind,
+                    "relevance": round(relevance, 4)
+                })
+        extractive_count = sum(1 for article in articles if article["summary_type"] == "extractive")
+        return {
+            "status": "partial" if extractive_count else "ok",
+            "topic": topic,
+            "candidate_count": len(candidates),
+            "article_count": len(ranked),
+            "summarized_count": len(articles),
+            "skipped_count": len(ranked) - len(articles),
+            "extractive_count": extractive_count,
+            "articles": articles
+        }
+
+    async def _summarize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        article = ArticleRecord(
+            title=item["title"],
+            url=item["url"],
+            source=item.get("source") or "",
+            description=item.get("description"),
+            content=item.get("content"),
+            published_at=parse_published_at(item.get("published_at"))
+        )
+        summary = await self.summarizer.summarize_article_async(article)
+        kind = summary.kind if summary else None  # None: skipped on quality
+        return {
+            "status": "partial" if kind == "extractive" else "ok",
+            **article.to_dict(),
+            "ai_summary": summary.text if summary else None,
+            "summary_type": kind
+        }
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self.output.write(json.dumps(record) + "\n")
+        self.output.flush()  # Each finished item is checkpointed right away
+        self.counts[record["status"]] += 1
+
+        now = time.perf_counter()
+        if now - self._last_progress >= PROGRESS_SECONDS:
+            self._last_progress = now
+            print(self.progress_line(), file=sys.stderr, flush=True)
+
+    def progress_line(self) -> str:
+        elapsed = time.perf_counter() - self._started
+        finished = self.counts["ok"] + self.counts["partial"] + self.counts["error"]
+        return (
+            f"{finished} items in {elapsed:.0f}s ({finished / max(elapsed, 1e-9):.1f}/s): "
+            f"{self.counts['ok']} ok, {self.counts['partial']} partial, {self.counts['error']} failed, "
+            f"{self.counts['already_done']} already done; "
+            f"spent ${self.summarizer.cost_controller.daily_spent:.4f}/{self.summarizer.cost_controller.daily_budget}"
+        )
+
+async def run_batch(
+    input_path: str, output_path: str, concurrency: int, top_k: int, restart: bool = False
+) -> BatchRunner:
+    done = set() if restart else load_checkpoint(output_path)
+    if done:
+        print(f"Resuming: {len(done)} items already done in {output_path}", file=sys.stderr)
+
+    news_fetcher = AsyncNewsFetcher()
+    runner = None
+    try:
+        with open(output_path, "w" if restart else "a+", encoding="utf-8") as output:
+            if output.tell() > 0:
+                output.seek(output.tell() - 1)
+                if output.read(1) != "\n":
+                    output.write("\n")  # Don't append to a line a killed run left unfinished
+            runner = BatchRunner(
+                news_fetcher,
+                SmartSummarizer(),
+                ArticleRanker(
+                    title_weight=settings.ranking_title_weight,
+                    interest_weight=settings.ranking_interest_weight
+                ),
+                output,
+                concurrency=concurrency,
+                top_k=top_k
+            )
+            await runner.run(read_items(input_path), done)
+    finally:
+        await news_fetcher.aclose()
+    return runner
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of topics and/or articles")
+    parser.add_argument("output", help="JSONL results file - also the checkpoint to resume from")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="items processed at once (default: the batch_concurrency setting)")
+    parser.add_argument("--top-k", type=int, default=None,
+                        help="articles summarized per topic unless the item says (default: the digest_top_k setting)")
+    parser.add_argument("--restart", action="store_true", help="ignore earlier results and start over")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+
+    runner = asyncio.run(run_batch(
+        args.input,
+        args.output,
+        concurrency=args.concurrency or settings.batch_concurrency,
+        top_k=args.top_k or settings.digest_top_k,
+        restart=args.restart
+    ))
+    print(runner.progress_line(), file=sys.stderr)
+    if runner.halted:
+        print("Stopped: daily budget exhausted. Rerun the same command to resume.", file=sys.stderr)
+        return EXIT_BUDGET
+    if runner.counts["partial"] or runner.counts["error"]:
+        return EXIT_INCOMPLETE
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
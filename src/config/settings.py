@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -9,16 +10,123 @@ class Settings(BaseSettings):
     # Application Settings
     debug: bool = False
     log_level: str = "INFO"
+    capture_raw_data: bool = False  # Keep the raw NewsAPI payload on each article (debugging)
     
     # NewsAPI Settings
     newsapi_base_url: str = "https://newsapi.org/v2"
+    newsapi_page_size: int = 50  # Fetch wide - ranking picks the few worth summarizing
+    newsapi_pages: int = 1  # Pages fetched per topic
+    newsapi_timeout: float = 10.0
+    newsapi_max_connections: int = 20  # Pooled keep-alive connections
+    fetch_concurrency: int = 8  # Max concurrent NewsAPI requests
+    news_cache_ttl_seconds: float = 300.0  # Serve repeat topic fetches from memory
+    news_cache_max_topics: int = 500
     
     # OpenAI Settings
+    openai_base_url: Optional[str] = None  # e.g. a local stand-in (benchmarks/fake_servers.py)
+    openai_timeout: float = 30.0  # Per attempt - keep well under inflight_claim_ttl
     openai_model: str = "gpt-3.5-turbo"
     #openai_model: str = "GPT-4o"
     max_tokens: int = 150
+    max_content_tokens: int = 600  # Article body budget per summary prompt
+    openai_rate_limiter: bool = True  # Throttle client-side before OpenAI returns 429s
+    openai_rpm_limit: int = 3500  # Starting limits - updated from x-ratelimit-* headers
+    openai_tpm_limit: int = 90_000
+    openai_max_concurrency: int = 16  # Upper bound of the adaptive concurrency window
+    
+    # Circuit Breaker Settings (one breaker each for NewsAPI and OpenAI)
+    circuit_failure_rate: float = 0.5  # Trip when this share of recent calls failed...
+    circuit_window_seconds: float = 60.0  # ...within this window...
+    circuit_min_calls: int = 5  # ...and there were at least this many calls
+    circuit_open_seconds: float = 30.0  # Cool-down before probing again
+    circuit_half_open_probes: int = 2  # Successful probes needed to close
+    
+    # Summarization Settings
+    daily_budget: float = 1.0  # USD per day across all LLM calls
+    summarize_concurrency: int = 5  # Max concurrent LLM calls per digest
+    batch_summarization: bool = False  # Pack several articles into one LLM call
+    batch_max_articles: int = 5
+    batch_max_input_tokens: int = 3000  # Article content per batched request
+    near_duplicate_detection: bool = True  # Reuse summaries across syndicated copies
+    near_duplicate_threshold: float = 0.7  # Estimated Jaccard similarity
+    near_duplicate_max_entries: int = 20_000
+    extractive_fallback: bool = True  # Local summaries when the LLM is unavailable or over budget
+    extractive_max_sentences: int = 2
+    
+    # Ranking Settings - only the most relevant candidates are summarized
+    digest_top_k: int = 10  # Default for ?top_k=
+    digest_max_top_k: int = 50
+    ranking_title_weight: float = 2.0  # Title words count this much more than description words
+    ranking_interest_weight: float = 1.0  # Weight of reader interests relative to the topic
+    
+    # Personal Digest Settings - per-user digests materialized from shared topic snapshots
+    digest_refresh_enabled: bool = True
+    digest_refresh_seconds: float = 600.0  # Re-fetch subscribed topics this often
+    digest_refresh_concurrency: int = 2  # Topics refreshed at once
+    profile_max_topics: int = 20
+    profiles_persistent: bool = True  # Keep profiles in SQLite under cache_dir
+    
+    # Job Queue Settings - POST /jobs runs digests on a bounded worker pool
+    job_workers: int = 4
+    job_max_queued: int = 100  # New jobs get 429 beyond this
+    job_background_share: float = 0.5  # Pre-warm and batch jobs may fill at most this share of the queue
+    job_result_ttl_seconds: float = 900.0  # How long finished jobs can be fetched
+    job_max_wait_seconds: float = 25.0  # Cap on GET /jobs/{id}?wait= (below client timeouts)
+    
+    # Cache Settings
+    cache_dir: str = "cache"  # Mounted as a volume in docker-compose
+    summary_cache_ttl: int = 7 * 24 * 60 * 60  # 7 days
+    cache_max_entries: int = 10_000  # In-memory LRU bound
+    cache_max_bytes: int = 50 * 1024 * 1024  # In-memory LRU bound (50 MB)
+    cache_persistent: bool = True  # Back the memory tier with SQLite on disk
+    cache_persistent_max_entries: int = 200_000
+    cache_maintenance_interval: float = 600.0  # Seconds between expiring/pruning the on-disk tier
+    cache_warm_start_entries: int = 5_000  # Entries loaded into memory at startup
+    
+    # Pre-warm Settings - refresh the most requested topics in the background
+    prewarm_enabled: bool = False
+    prewarm_interval_seconds: float = 900.0
+    prewarm_top_topics: int = 5
+    prewarm_budget_share: float = 0.3  # Stop pre-warming once this share of the daily budget is spent
+    prewarm_half_life_seconds: float = 3600.0  # Decay of topic popularity
+    prewarm_concurrency: int = 2
+    metrics_topic_labels: int = 50  # Topics outside the N hottest are counted as "other" in news_topic_requests_total
+    
+    # Shared State Settings - use "sqlite" when running several workers so
+    # they share one budget and never summarize the same article twice
+    state_backend: str = "memory"  # "memory" or "sqlite"
+    inflight_claim_ttl: float = 120.0  # Seconds before an abandoned claim expires
+    state_lock_timeout: float = 0.1  # Max wait for another worker's write lock - runs on the event loop
+    inflight_wait_timeout: float = 30.0  # Max wait for another worker's summary
+    
+    # Batch Settings (python -m src.batch)
+    batch_concurrency: int = 4  # Input items processed at once
+    
+    # HTTP Caching Settings
+    http_cache_max_age_seconds: int = 0  # Clients revalidate every time - cheap with ETags
+    
+    # Startup Settings
+    warm_up_components: bool = True  # Build components in the background right after startup
     
     class Config:
         env_file = ".env"
 
-settings = Settings()
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """The application settings, read from the environment (and .env) on first use"""
+    return Settings()
+
+class _LazySettings:
+    """
+    Stands in for the Settings instance until an attribute is first read, so
+    importing the app neither reads .env nor fails without the API keys -
+    only building a component that needs them does.
+    """
+    
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+    
+    def __repr__(self) -> str:
+        return repr(get_settings())
+
+settings: Settings = _LazySettings()  # type: ignore[assignment]
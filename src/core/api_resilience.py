@@ -1,83 +1,275 @@
+import asyncio
 import logging
 import time
-from typing import Optional, Callable, Any
+import httpx
+from typing import TYPE_CHECKING, Optional, Callable, Any, Awaitable
 from functools import wraps
-from openai import RateLimitError, APIError
+from src.core.rate_limiter import AdaptiveRateLimiter
+from src.core.circuit_breaker import CircuitBreaker
+from src.core import metrics
+
+if TYPE_CHECKING:
+    from openai import APIError
 
 logger = logging.getLogger(__name__)
 
+UPSTREAM_LATENCY = metrics.histogram(
+    "upstream_request_seconds", "Latency of each upstream API attempt", ["upstream", "outcome"]
+)
+UPSTREAM_IN_FLIGHT = metrics.gauge(
+    "upstream_requests_in_flight", "Upstream API calls currently in flight", ["upstream"]
+)
+UPSTREAM_RETRIES = metrics.counter(
+    "upstream_retries_total", "Upstream API attempts that will be retried", ["upstream", "reason"]
+)
+CIRCUIT_REJECTIONS = metrics.counter(
+    "circuit_breaker_rejections_total", "Calls skipped because the circuit was open", ["upstream"]
+)
+RATE_LIMIT_WAIT = metrics.histogram(
+    "rate_limiter_wait_seconds", "Time spent waiting for a rate limiter slot and budget", ["upstream"]
+)
+
 class ResilienceManager:
     """
     Handles API rate limits, retries, and circuit breaking
     """
-    
-    def __init__(self, max_retries: int = 3, base_delay: float = 1.0):
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         self.max_retries = max_retries
         self.base_delay = base_delay
-        self.circuit_open = False
-        self.circuit_last_failure_time = 0
-        self.circuit_timeout = 60  # 60 seconds circuit breaker
-    
+        self.rate_limiter = rate_limiter  # Proactive throttling for the async path
+        self.breaker = breaker or CircuitBreaker("openai")
+
     def execute_with_retry(self, api_call: Callable) -> Any:
         """
         Execute an API call with retry logic and circuit breaker
         """
+        from openai import RateLimitError, APIError  # Deferred: the SDK is slow to import
+
         last_exception = None
-        
+
         for attempt in range(self.max_retries + 1):
             try:
                 # Check circuit breaker first
-                if self.circuit_open:
-                    if time.time() - self.circuit_last_failure_time < self.circuit_timeout:
-                        logger.warning("Circuit breaker open - skipping request")
-                        return None
-                    else:
-                        logger.info("Circuit breaker reset - trying again")
-                        self.circuit_open = False
-                
+                if not self._circuit_allows_request():
+                    return None
+
                 # Try the actual API call
-                result = api_call()
-                
-                # If successful, reset circuit breaker
-                if self.circuit_open:
-                    logger.info("Circuit breaker closed - requests succeeding again")
-                    self.circuit_open = False
-                
+                result = self._timed_call_sync(api_call)
+
+                self._record_success()
                 return result
-                
+
             except RateLimitError as e:
                 last_exception = e
-                wait_time = self.base_delay * (2 ** attempt)  # Exponential backoff
+                self._record_failure(e)
+                self._count_retry(attempt, "rate_limited")
+                wait_time = self._backoff(attempt)
                 logger.warning(f"Rate limit hit, attempt {attempt + 1}/{self.max_retries + 1}. Waiting {wait_time}s")
                 time.sleep(wait_time)
-                
+
             except APIError as e:
                 last_exception = e
-                if e.status_code >= 500:  # Server errors - retry
-                    wait_time = self.base_delay * (2 ** attempt)
-                    logger.warning(f"API server error {e.status_code}, retrying in {wait_time}s")
+                self._record_failure(e)
+                if self._is_retryable(e):  # Server errors, timeouts, dropped connections - retry
+                    wait_time = self._backoff(attempt)
+                    self._log_retry(e, attempt, wait_time)
                     time.sleep(wait_time)
                 else:  # Client errors - don't retry
-                    logger.error(f"API client error {e.status_code}: {e.message}")
+                    logger.error(f"API client error {getattr(e, 'status_code', None)}: {e.message}")
                     break
-                    
+
             except Exception as e:
                 last_exception = e
-                logger.error(f"Unexpected error on attempt {attempt + 1}: {str(e)}")
-                break
-        
-        # If we exhausted all retries, open circuit breaker
-        if attempt == self.max_retries and last_exception:
-            logger.error(f"All {self.max_retries} retries failed. Opening circuit breaker.")
-            self.circuit_open = True
-            self.circuit_last_failure_time = time.time()
+                self._record_failure(e)
+                if not self._is_retryable(e):
+                    logger.error(f"Unexpected error on attempt {attempt + 1}: {str(e)}")
+                    break
+                wait_time = self._backoff(attempt)
+                self._log_retry(e, attempt, wait_time)
+                time.sleep(wait_time)
+
+        self._record_exhausted(attempt, last_exception)
+        return None
+
+    async def execute_with_retry_async(self, api_call: Callable[[], Awaitable[Any]], tokens: int = 0) -> Any:
+        """
+        Async variant of execute_with_retry - backs off with asyncio.sleep so
+        the event loop keeps serving other requests while we wait.
         
+        With a rate limiter, each attempt first waits for a concurrency slot
+        and for one request plus `tokens` of per-minute budget.
+        """
+        from openai import RateLimitError, APIError
+
+        last_exception = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                if not self._circuit_allows_request():
+                    return None
+
+                result = await self._call_limited(api_call, tokens)
+
+                self._record_success()
+                return result
+
+            except RateLimitError as e:
+                last_exception = e
+                self._record_failure(e)
+                self._count_retry(attempt, "rate_limited")
+                wait_time = self._backoff(attempt)
+                if self.rate_limiter is not None:
+                    # Pause every caller sharing the limiter; the next attempt waits in slot()
+                    wait_time = self.rate_limiter.retry_after(getattr(e.response, "headers", None)) or wait_time
+                    self.rate_limiter.record_rate_limited(wait_time)
+                    logger.warning(f"Rate limit hit, attempt {attempt + 1}/{self.max_retries + 1}. Pausing requests for {wait_time}s")
+                else:
+                    logger.warning(f"Rate limit hit, attempt {attempt + 1}/{self.max_retries + 1}. Waiting {wait_time}s")
+                    await asyncio.sleep(wait_time)
+
+            except APIError as e:
+                last_exception = e
+                self._record_failure(e)
+                if self._is_retryable(e):
+                    wait_time = self._backoff(attempt)
+                    self._log_retry(e, attempt, wait_time)
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error(f"API client error {getattr(e, 'status_code', None)}: {e.message}")
+                    break
+
+            except Exception as e:
+                last_exception = e
+                self._record_failure(e)
+                if not self._is_retryable(e):
+                    logger.error(f"Unexpected error on attempt {attempt + 1}: {str(e)}")
+                    break
+                wait_time = self._backoff(attempt)
+                self._log_retry(e, attempt, wait_time)
+                await asyncio.sleep(wait_time)
+
+        self._record_exhausted(attempt, last_exception)
         return None
-    
+
+    async def _call_limited(self, api_call: Callable[[], Awaitable[Any]], tokens: int) -> Any:
+        if self.rate_limiter is None:
+            return await self._timed_call(api_call)
+        waiting_since = time.perf_counter()
+        async with self.rate_limiter.slot(tokens):
+            RATE_LIMIT_WAIT.labels(upstream=self.breaker.name).observe(time.perf_counter() - waiting_since)
+            result = await self._timed_call(api_call)
+        self.rate_limiter.record_success()
+        return result
+
+    async def _timed_call(self, api_call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one attempt, recording its latency by outcome"""
+        upstream = self.breaker.name
+        outcome = "ok"
+        started = time.perf_counter()
+        try:
+            with UPSTREAM_IN_FLIGHT.labels(upstream=upstream).track_inprogress():
+                return await api_call()
+        except Exception as e:
+            outcome = self._outcome(e)
+            raise
+        finally:
+            UPSTREAM_LATENCY.labels(upstream=upstream, outcome=outcome).observe(time.perf_counter() - started)
+
+    def _timed_call_sync(self, api_call: Callable) -> Any:
+        upstream = self.breaker.name
+        outcome = "ok"
+        started = time.perf_counter()
+        try:
+            with UPSTREAM_IN_FLIGHT.labels(upstream=upstream).track_inprogress():
+                return api_call()
+        except Exception as e:
+            outcome = self._outcome(e)
+            raise
+        finally:
+            UPSTREAM_LATENCY.labels(upstream=upstream, outcome=outcome).observe(time.perf_counter() - started)
+
+    def _outcome(self, error: Exception) -> str:
+        from openai import RateLimitError, APIError
+
+        if isinstance(error, RateLimitError):
+            return "rate_limited"
+        if isinstance(error, APIError):
+            if getattr(error, "status_code", None) is None:
+                return "connection_error"
+            return "server_error" if self._is_retryable(error) else "client_error"
+        return "error"
+
+    def _count_retry(self, attempt: int, reason: str):
+        if attempt < self.max_retries:
+            UPSTREAM_RETRIES.labels(upstream=self.breaker.name, reason=reason).inc()
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff delay for the given attempt"""
+        return self.base_delay * (2 ** attempt)
+
+    def _log_retry(self, error: Exception, attempt: int, wait_time: float):
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None:
+            self._count_retry(attempt, "server_error")
+            logger.warning(f"API server error {status_code}, retrying in {wait_time}s")
+        else:
+            self._count_retry(attempt, "connection_error")
+            logger.warning(f"API connection failed ({type(error).__name__}: {str(error)}), retrying in {wait_time}s")
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Server errors, timeouts and connection failures are worth retrying, client errors are not"""
+        from openai import APIConnectionError  # Includes APITimeoutError
+
+        if isinstance(error, (APIConnectionError, httpx.TransportError)):
+            return True
+        status_code = getattr(error, "status_code", None)
+        return status_code is not None and status_code >= 500
+
+    def _circuit_allows_request(self) -> bool:
+        """Ask the circuit breaker whether this attempt may go ahead"""
+        if self.breaker.allow_request():
+            return True
+        CIRCUIT_REJECTIONS.labels(upstream=self.breaker.name).inc()
+        logger.warning(f"Circuit breaker '{self.breaker.name}' open - skipping request")
+        return False
+
+    def _record_success(self):
+        self.breaker.record_success()
+
+    def _record_failure(self, error: Exception):
+        """
+        Count the failure towards the circuit breaker - unless it's a client
+        error (bad request, auth, ...), which says nothing about the
+        endpoint's health. Rate limits are the rate limiter's business,
+        except that they fail a half-open probe.
+        """
+        from openai import RateLimitError
+
+        if isinstance(error, RateLimitError):
+            self.breaker.record_rate_limited()
+            return
+        status_code = getattr(error, "status_code", None)
+        if status_code is not None and 400 <= status_code < 500 and status_code != 408:
+            # Still report the attempt, so a half-open probe doesn't hang
+            self.breaker.record_success()
+            return
+        self.breaker.record_failure()
+
+    def _record_exhausted(self, attempt: int, last_exception: Optional[Exception]):
+        if attempt == self.max_retries and last_exception:
+            logger.error(f"All {self.max_retries} retries failed: {str(last_exception)}")
+
     def get_circuit_status(self) -> dict:
         """Get current circuit breaker status"""
+        status = self.breaker.get_status()
         return {
-            "circuit_open": self.circuit_open,
-            "last_failure_time": self.circuit_last_failure_time,
-            "time_since_last_failure": time.time() - self.circuit_last_failure_time if self.circuit_last_failure_time else None
-        }
\ No newline at end of file
+            "circuit_open": self.breaker.is_open,
+            **status
+        }
@@ -1,8 +1,34 @@
+import logging
+import os
+import sqlite3
 import threading
 import time
-from typing import Optional, Dict, Tuple
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
 
-class TTLCache:
+logger = logging.getLogger(__name__)
+
+class CacheBackend(ABC):
+    """
+    Interface every summary cache implements. In-memory caches are private
+    to a process; SQLite-backed caches are shared by every process that
+    points at the same file.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store a value"""
+
+    @abstractmethod
+    def clear_expired(self) -> None:
+        """Drop expired entries"""
+
+class TTLCache(CacheBackend):
     def __init__(self, ttl_seconds: int = 24 * 60 * 60):  # default 24 hours
         self.ttl_seconds = ttl_seconds
         self._cache: Dict[str, Tuple[float, str]] = {}
@@ -27,4 +53,288 @@ class TTLCache:
             current_time = time.time()
             expired_keys = [key for key, (ts, _) in self._cache.items() if current_time - ts >= self.ttl_seconds]
             for key in expired_keys:
-                del self._cache[key]
\ No newline at end of file
+                del self._cache[key]
+
+class LRUCache(CacheBackend):
+    """
+    Size-bounded in-memory cache with TTL and least-recently-used eviction.
+    Bounded both by entry count and by the UTF-8 size of the stored values.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = 24 * 60 * 60,
+        max_entries: int = 10_000,
+        max_bytes: Optional[int] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._cache: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            timestamp, value, size = entry
+            if time.time() - timestamp >= self.ttl_seconds:
+                self._remove(key)
+                return None
+            self._cache.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, timestamp: Optional[float] = None) -> None:
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            self._cache[key] = (timestamp or time.time(), value, size)
+            self._bytes += size
+            self._evict()
+
+    def clear_expired(self) -> None:
+        with self._lock:
+            current_time = time.time()
+            expired_keys = [key for key, (ts, _, _) in self._cache.items() if current_time - ts >= self.ttl_seconds]
+            for key in expired_keys:
+                self._remove(key)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until we are within budget"""
+        while self._cache and (
+            len(self._cache) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, _ = next(iter(self._cache.items()))
+            self._remove(key)
+            self.evictions += 1
+
+class SQLiteCache(CacheBackend):
+    """
+    Persistent key/value cache stored in a single SQLite file. Survives
+    restarts and is safe to share between processes (WAL journal mode).
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 24 * 60 * 60):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            now = time.time()
+            if now - created_at >= self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def get_with_timestamp(self, key: str) -> Optional[Tuple[float, str]]:
+        """Like get, but also returns the entry's creation time. Read-only - callers record the access with touch"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, value FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[0] >= self.ttl_seconds:
+            return None
+        return row[0], row[1]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._conn.commit()
+
+    def touch(self, accessed: Dict[str, float]) -> None:
+        """Record when entries were last used, as key -> accessed_at, in one transaction"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in accessed.items()]
+            )
+            self._conn.commit()
+
+    def load_recent(self, limit: int) -> List[Tuple[str, str, float]]:
+        """Most recently used, unexpired entries as (key, value, created_at)"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            return self._conn.execute(
+                "SELECT key, value, created_at FROM cache WHERE created_at > ?"
+                " ORDER BY accessed_at DESC LIMIT ?",
+                (cutoff, limit)
+            ).fetchall()
+
+    def clear_expired(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE created_at <= ?", (cutoff,))
+            self._conn.commit()
+
+    def prune(self, max_entries: int) -> None:
+        """Keep only the max_entries most recently used rows"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key NOT IN ("
+                " SELECT key FROM cache ORDER BY accessed_at DESC LIMIT ?)",
+                (max_entries,)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class TieredCache(CacheBackend):
+    """
+    Bounded LRU memory tier in front of a persistent SQLite tier.
+    Reads fall through to disk and promote hits into memory; writes go to both.
+
+    Hits in either tier count as uses of the disk entry: access times are
+    collected in memory and written in batches of touch_batch, and every
+    maintenance_interval seconds the disk tier drops expired entries and
+    is pruned back to its max_persistent_entries most recently used.
+    """
+
+    def __init__(
+        self,
+        memory: LRUCache,
+        persistent: SQLiteCache,
+        max_persistent_entries: Optional[int] = None,
+        maintenance_interval: float = 600.0,
+        touch_batch: int = 256
+    ):
+        self.memory = memory
+        self.persistent = persistent
+        self.max_persistent_entries = max_persistent_entries
+        self.maintenance_interval = maintenance_interval
+        self.touch_batch = touch_batch
+        self._touched: Dict[str, float] = {}  # key -> last access not yet written to disk
+        self._last_maintenance = time.time()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None:
+            entry = self.persistent.get_with_timestamp(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            self.memory.set(key, value, timestamp=created_at)
+        self._record_access(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        try:
+            self.persistent.set(key, value)
+        except sqlite3.Error as e:
+            logger.error(f"Persistent cache write failed: {str(e)}")
+        self._maybe_maintain()
+
+    def flush_access_times(self) -> None:
+        """Write the collected access times to the disk tier"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        try:
+            self.persistent.touch(touched)
+        except sqlite3.Error as e:
+            logger.error(f"Persistent cache access update failed: {str(e)}")
+
+    def maintain(self) -> None:
+        """Flush access times, then drop expired and least-recently-used disk entries"""
+        self.flush_access_times()
+        try:
+            self.persistent.clear_expired()
+            if self.max_persistent_entries is not None:
+                self.persistent.prune(self.max_persistent_entries)
+        except sqlite3.Error as e:
+            logger.error(f"Persistent cache maintenance failed: {str(e)}")
+
+    def warm_start(self, limit: int) -> int:
+        """
+        Load the most recently used persisted entries into memory, so a
+        restart doesn't send every article back to the LLM
+        """
+        try:
+            self.persistent.clear_expired()
+            rows = self.persistent.load_recent(limit)
+        except sqlite3.Error as e:
+            logger.error(f"Cache warm start failed: {str(e)}")
+            return 0
+        # Oldest first, so the most recently used end up at the LRU head
+        for key, value, created_at in reversed(rows):
+            self.memory.set(key, value, timestamp=created_at)
+        logger.info(f"Warm-started summary cache with {len(rows)} entries")
+        return len(rows)
+
+    def clear_expired(self) -> None:
+        self.memory.clear_expired()
+        self.persistent.clear_expired()
+
+    def _record_access(self, key: str) -> None:
+        with self._lock:
+            self._touched[key] = time.time()
+            flush = len(self._touched) >= self.touch_batch
+        if flush:
+            self.flush_access_times()
+        self._maybe_maintain()
+
+    def _maybe_maintain(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_maintenance < self.maintenance_interval:
+                return
+            self._last_maintenance = now
+        self.maintain()
+
+    def stats(self) -> Dict:
+        return self.memory.stats()
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, Optional, Tuple
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"  # Requests flow; outcomes are tracked
+    OPEN = "open"  # Requests are rejected until the cool-down passes
+    HALF_OPEN = "half_open"  # A few probe requests decide whether to close again
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one upstream endpoint.
+
+    Trips when the failure rate over a sliding time window reaches the
+    threshold (once there are enough calls to judge). After open_seconds it
+    lets through up to half_open_probes requests: if they all succeed the
+    circuit closes, and any failure re-opens it for another cool-down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        window_seconds: float = 60.0,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 2
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.window_seconds = window_seconds
+        self.min_calls = max(1, min_calls)
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.state = CircuitState.CLOSED
+        self.opened_at = 0.0
+        self.last_state_change: Optional[float] = None
+        self.transitions: Dict[str, int] = {}  # "closed->open" -> count
+        self.rejected = 0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()  # (time, succeeded)
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Whether a request may go ahead now; callers must then record its outcome"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == CircuitState.OPEN:
+                if now - self.opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self._transition(CircuitState.HALF_OPEN)
+
+            if self.state == CircuitState.HALF_OPEN:
+                # A probe that never reported back (e.g. cancelled) mustn't wedge the circuit
+                if self._probes_started >= self.half_open_probes and now - self.opened_at >= 2 * self.open_seconds:
+                    self._probes_started = self._probes_succeeded
+                if self._probes_started >= self.half_open_probes:
+                    self.rejected += 1
+                    return False
+                self._probes_started += 1
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_probes:
+                    self._transition(CircuitState.CLOSED)
+                return
+            self._record(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._transition(CircuitState.OPEN)
+                return
+            self._record(False)
+            if self.state == CircuitState.CLOSED and self._should_trip():
+                self._transition(CircuitState.OPEN)
+
+    def record_rate_limited(self) -> None:
+        """
+        A 429 says nothing about the endpoint's health while closed, but a
+        half-open probe that is told to back off fails: the circuit re-opens
+        """
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._transition(CircuitState.OPEN)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != CircuitState.CLOSED
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            self._expire(time.monotonic())
+            calls = len(self._outcomes)
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            return {
+                "state": self.state.value,
+                "calls_in_window": calls,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "rejected": self.rejected,
+                "transitions": dict(self.transitions),
+                "seconds_since_state_change": (
+                    round(time.monotonic() - self.last_state_change, 1)
+                    if self.last_state_change is not None else None
+                )
+            }
+
+    def _record(self, succeeded: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, succeeded))
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _should_trip(self) -> bool:
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return False
+        failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+        return failures / calls >= self.failure_rate_threshold
+
+    def _transition(self, state: CircuitState) -> None:
+        """Must be called with the lock held"""
+        previous = self.state
+        self.state = state
+        now = time.monotonic()
+        self.last_state_change = now
+        transition = f"{previous.value}->{state.value}"
+        self.transitions[transition] = self.transitions.get(transition, 0) + 1
+
+        if state == CircuitState.OPEN:
+            self.opened_at = now
+            logger.error(f"Circuit breaker '{self.name}' opened ({transition}) - pausing requests for {self.open_seconds}s")
+        elif state == CircuitState.HALF_OPEN:
+            self._probes_started = 0
+            self._probes_succeeded = 0
+            logger.info(f"Circuit breaker '{self.name}' half-open - probing with up to {self.half_open_probes} request(s)")
+        else:
+            self._outcomes.clear()
+            logger.info(f"Circuit breaker '{self.name}' closed - requests succeeding again")
+
+def create_breaker(name: str) -> CircuitBreaker:
+    """Circuit breaker for an upstream endpoint, configured from settings"""
+    return CircuitBreaker(
+        name,
+        failure_rate_threshold=settings.circuit_failure_rate,
+        window_seconds=settings.circuit_window_seconds,
+        min_calls=settings.circuit_min_calls,
+        open_seconds=settings.circuit_open_seconds,
+        half_open_probes=settings.circuit_half_open_probes
+    )
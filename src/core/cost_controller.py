@@ -1,50 +1,129 @@
 import logging
+import os
+import threading
+import uuid
 from typing import Dict, Optional
 from datetime import datetime, timedelta
-from src.core.models import Article
+from src.core.models import ArticleRecord
+from src.core.state import StateStore, InMemoryStateStore
+from src.core.keys import canonicalize_url
+from src.core import metrics
 
 logger = logging.getLogger(__name__)
 
+# Reasons CostController.skip_reason gives for not summarizing an article
+SKIP_DUPLICATE = "duplicate"
+SKIP_BUDGET = "budget_exhausted"
+SKIP_LOW_QUALITY = "low_quality"
+# Not a skip: another caller or worker holds the claim and is summarizing it.
+# Callers wait for that summary, so it isn't counted in articles_skipped_total.
+SKIP_IN_FLIGHT = "in_flight"
+
+ARTICLES_SKIPPED = metrics.counter(
+    "articles_skipped_total", "Articles not sent to the LLM, by CostController reason", ["reason"]
+)
+
 class CostController:
     """
     Prevents budget overruns and optimizes API usage
     """
     
-    def __init__(self, daily_budget: float = 1.0):  # $1.00 daily budget
+    def __init__(
+        self,
+        daily_budget: float = 1.0,  # $1.00 daily budget
+        state: Optional[StateStore] = None,
+        claim_ttl: float = 120.0
+    ):
         self.daily_budget = daily_budget
-        self.daily_spent: float = 0.0
         self.reset_time = datetime.now()
-        self.processed_urls: set = set()  # Track already processed articles
+        # Spend, processed articles and in-flight claims - shared across
+        # workers when backed by a cross-process store
+        self.state = state or InMemoryStateStore()
+        self.claim_ttl = claim_ttl
+        self.owner_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()  # Concurrent summaries share this controller
+        self.budget_refusals = 0  # Calls refused for lack of budget, by this process
         
         # Cost per 1K tokens for gpt-3.5-turbo (approx)
         self.input_cost_per_1k = 0.0015  # $0.0015 per 1K input tokens
         self.output_cost_per_1k = 0.0020  # $0.0020 per 1K output tokens
     
-    def should_process_article(self, article: Article) -> bool:
+    def should_process_article(self, article: ArticleRecord, key: Optional[str] = None) -> bool:
         """
         Decision engine: Should we spend money summarizing this article?
+        
+        `key` identifies the work for duplicate detection - the summarizer
+        passes its content key; it defaults to the canonical article URL.
         """
-        # Check 1: Have we already processed this URL?
-        if article.url in self.processed_urls:
+        return self.skip_reason(article, key) is None
+    
+    def skip_reason(self, article: ArticleRecord, key: Optional[str] = None) -> Optional[str]:
+        """Why an article shouldn't be summarized now (a SKIP_* constant), or None to go ahead"""
+        key = key or self.article_key(article)
+        
+        # Check 1: Have we already processed this article, or is it in flight?
+        if self.state.is_processed(self._today(), key):
             logger.info(f"Skipping duplicate article: {article.title[:50]}...")
-            return False
+            ARTICLES_SKIPPED.labels(reason=SKIP_DUPLICATE).inc()
+            return SKIP_DUPLICATE
+        if self.state.is_claimed(key):
+            logger.debug(f"Article already being summarized elsewhere: {article.title[:50]}...")
+            return SKIP_IN_FLIGHT
         
         # Check 2: Are we over daily budget?
-        if self.daily_spent >= self.daily_budget:
+        if self.budget_exhausted:
             logger.warning(f"Daily budget exceeded: ${self.daily_spent:.4f}/{self.daily_budget}")
-            return False
+            ARTICLES_SKIPPED.labels(reason=SKIP_BUDGET).inc()
+            return SKIP_BUDGET
         
         # Check 3: Is this article worth summarizing?
-        if not self._is_article_quality(article):
+        if not self.is_article_quality(article):
             logger.info(f"Skipping low-quality article: {article.title[:50]}...")
-            return False
+            ARTICLES_SKIPPED.labels(reason=SKIP_LOW_QUALITY).inc()
+            return SKIP_LOW_QUALITY
         
         # Check 4: Reset daily spending if it's a new day
         self._reset_if_new_day()
         
-        return True
+        return None
+    
+    def reserve_article(self, article: ArticleRecord, key: Optional[str] = None) -> bool:
+        """
+        Atomically decide whether to process an article and claim it, so
+        concurrent callers (in this or any other worker sharing the state
+        store) never summarize the same article twice
+        """
+        key = key or self.article_key(article)
+        with self._lock:
+            if not self.should_process_article(article, key):
+                return False
+            return self.state.try_claim(key, self.owner_id, self.claim_ttl)
+    
+    def release_article(self, article: ArticleRecord, key: Optional[str] = None):
+        """Release an in-flight claim taken by reserve_article"""
+        self.state.release_claim(key or self.article_key(article), self.owner_id)
+    
+    def is_in_flight(self, article: ArticleRecord, key: Optional[str] = None) -> bool:
+        """Is some caller - possibly another worker - summarizing this article?"""
+        return self.state.is_claimed(key or self.article_key(article))
+    
+    def mark_processed(self, article: ArticleRecord, key: Optional[str] = None):
+        """Remember that an article has been summarized"""
+        self.state.mark_processed(self._today(), key or self.article_key(article))
     
-    def _is_article_quality(self, article: Article) -> bool:
+    def article_key(self, article: ArticleRecord) -> str:
+        """Default identity of an article - tracking/AMP variants share one key"""
+        return canonicalize_url(article.url)
+    
+    @property
+    def daily_spent(self) -> float:
+        return self.state.get_spend(self._today())
+    
+    @property
+    def budget_exhausted(self) -> bool:
+        return self.daily_spent >= self.daily_budget
+    
+    def is_article_quality(self, article: ArticleRecord) -> bool:
         """
         Basic quality checks to avoid wasting money on junk
         """
@@ -64,16 +143,50 @@ class CostController:
             
         return True
     
-    def record_usage(self, prompt_tokens: int, completion_tokens: int):
-        """
-        Track token usage and calculate cost
-        """
+    def estimate_cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Dollar cost of a call with the given token counts"""
         prompt_cost = (prompt_tokens / 1000) * self.input_cost_per_1k
         completion_cost = (completion_tokens / 1000) * self.output_cost_per_1k
-        total_cost = prompt_cost + completion_cost
+        return prompt_cost + completion_cost
+    
+    def reserve_budget(self, prompt_tokens: int, max_completion_tokens: int) -> Optional[float]:
+        """
+        Reserve the worst-case cost of a call before making it. The estimate
+        is added to the day's spend up front, so concurrent callers (and
+        other workers sharing the state store) can't jointly overshoot the
+        budget. Returns the reserved amount, or None if the call would
+        exceed the remaining budget.
+        """
+        estimate = self.estimate_cost(prompt_tokens, max_completion_tokens)
+        self._reset_if_new_day()
+        
+        today = self._today()
+        total = self.state.add_spend(today, estimate)
+        if total > self.daily_budget:
+            self.state.add_spend(today, -estimate)
+            ARTICLES_SKIPPED.labels(reason=SKIP_BUDGET).inc()
+            self.budget_refusals += 1
+            logger.warning(
+                f"Refusing call: estimated ${estimate:.6f} would exceed daily budget "
+                f"(${total - estimate:.4f}/{self.daily_budget})"
+            )
+            return None
+        return estimate
+    
+    def release_budget(self, reserved: float):
+        """Give back a reservation for a call that never completed"""
+        if reserved:
+            self.state.add_spend(self._today(), -reserved)
+    
+    def record_usage(self, prompt_tokens: int, completion_tokens: int, reserved: float = 0.0):
+        """
+        Track token usage and calculate cost. If the call was reserved with
+        reserve_budget, only the difference to the reservation is added.
+        """
+        total_cost = self.estimate_cost(prompt_tokens, completion_tokens)
         
-        self.daily_spent += total_cost
         self._reset_if_new_day()
+        self.state.add_spend(self._today(), total_cost - reserved)
         
         logger.info(f"API Cost: ${total_cost:.6f} (Prompt: {prompt_tokens}, Completion: {completion_tokens})")
         logger.info(f"Daily total: ${self.daily_spent:.4f}/{self.daily_budget}")
@@ -82,11 +195,15 @@ class CostController:
         """Reset daily spending at midnight"""
         now = datetime.now()
         if now.date() > self.reset_time.date():
-            self.daily_spent = 0.0
+            # Spend and processed articles are keyed by day, so a new day
+            # starts from zero; just drop the old bookkeeping
             self.reset_time = now
-            self.processed_urls.clear()  # Clear cache daily
+            self.state.prune(self._today())
             logger.info("Daily budget reset")
     
+    def _today(self) -> str:
+        return datetime.now().date().isoformat()
+    
     def get_cost_metrics(self) -> Dict:
         """Get current cost metrics for monitoring"""
         return {
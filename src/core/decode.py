@@ -0,0 +1,79 @@
+import json
+import logging
+from typing import Any, List, Optional, Union
+from src.core.models import ArticleRecord, parse_published_at
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    _loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    orjson = None
+    _loads = json.loads
+    JSON_BACKEND = "json"
+
+class NewsAPIDecodeError(ValueError):
+    """The response body is not a usable NewsAPI payload"""
+
+def decode_articles(body: Union[bytes, str], capture_raw: bool = False) -> List[ArticleRecord]:
+    """
+    Decode a NewsAPI /everything response body straight into ArticleRecords.
+
+    Single pass: parse the JSON once and check only the fields we rely on
+    (title, url, source name), instead of building NewsAPIResponse /
+    NewsAPIArticle models and then converting those. Malformed articles are
+    skipped rather than failing the whole page.
+    """
+    try:
+        payload = _loads(body)
+    except ValueError as e:  # orjson.JSONDecodeError and json.JSONDecodeError are both ValueErrors
+        raise NewsAPIDecodeError(f"Invalid JSON from NewsAPI: {str(e)}") from e
+
+    if not isinstance(payload, dict):
+        raise NewsAPIDecodeError("NewsAPI payload is not an object")
+    if payload.get("status") == "error":
+        raise NewsAPIDecodeError(f"NewsAPI error: {payload.get('code')} - {payload.get('message')}")
+
+    items = payload.get("articles")
+    if not isinstance(items, list):
+        raise NewsAPIDecodeError("NewsAPI payload has no articles list")
+
+    articles = []
+    skipped = 0
+    for item in items:
+        article = _decode_article(item, capture_raw)
+        if article is None:
+            skipped += 1
+        else:
+            articles.append(article)
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} malformed NewsAPI article(s)")
+    return articles
+
+def _decode_article(item: Any, capture_raw: bool) -> Optional[ArticleRecord]:
+    if not isinstance(item, dict):
+        return None
+
+    title = item.get("title")
+    url = item.get("url")
+    source = item.get("source")
+    source_name = source.get("name") if isinstance(source, dict) else None
+    if not isinstance(title, str) or not isinstance(url, str) or not isinstance(source_name, str):
+        return None
+
+    published_at = item.get("publishedAt")
+    return ArticleRecord(
+        title=title,
+        url=url,
+        source=source_name,
+        description=_optional_str(item.get("description")),
+        content=_optional_str(item.get("content")),
+        published_at=parse_published_at(published_at) if isinstance(published_at, str) else None,
+        raw_data=item if capture_raw else None
+    )
+
+def _optional_str(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
@@ -0,0 +1,131 @@
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from src.core.models import ArticleRecord
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+_TRUNCATION_MARKER = re.compile(r"\[\+\d+ chars\]")  # NewsAPI's "... [+1234 chars]"
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles. The estimated Jaccard similarity
+    of two texts is the fraction of signature slots that match.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)  # Fixed seed - signatures are comparable across runs
+        self._permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        hashes = [zlib.crc32(shingle.encode("utf-8")) & _MAX_HASH for shingle in shingles]
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+
+    def _shingles(self, text: str) -> Set[str]:
+        words = _WORD.findall(text.lower())
+        if len(words) < self.shingle_size:
+            return {" ".join(words)} if words else set()
+        return {
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+class NearDuplicateIndex:
+    """
+    In-memory LSH index of article signatures. Maps a new article to the
+    cluster of an already-summarized near-duplicate (e.g. the same wire
+    story syndicated by many outlets), identified by that article's key.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        max_entries: int = 20_000
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.matches = 0
+        self._signatures: "OrderedDict[str, Tuple[int, ...]]" = OrderedDict()
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def find(self, article: ArticleRecord) -> Optional[str]:
+        """Key of the most similar indexed article above the threshold, if any"""
+        signature = self.hasher.signature(self._text(article))
+        if signature is None:
+            return None
+
+        with self._lock:
+            candidates: Set[str] = set()
+            for band, bucket in zip(self._bands(signature), self._buckets):
+                candidates.update(bucket.get(band, ()))
+
+            best_key, best_score = None, self.threshold
+            for key in candidates:
+                score = similarity(signature, self._signatures[key])
+                if score >= best_score:
+                    best_key, best_score = key, score
+
+        if best_key is not None:
+            self.matches += 1
+        return best_key
+
+    def add(self, article: ArticleRecord, key: Optional[str] = None) -> None:
+        key = key or article.url
+        signature = self.hasher.signature(self._text(article))
+        if signature is None:
+            return
+
+        with self._lock:
+            if key in self._signatures:
+                self._remove(key)
+            self._signatures[key] = signature
+            for band, bucket in zip(self._bands(signature), self._buckets):
+                bucket.setdefault(band, set()).add(key)
+            while len(self._signatures) > self.max_entries:
+                self._remove(next(iter(self._signatures)))
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _remove(self, key: str) -> None:
+        signature = self._signatures.pop(key)
+        for band, bucket in zip(self._bands(signature), self._buckets):
+            keys = bucket.get(band)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band]
+
+    def _bands(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+
+    def _text(self, article: ArticleRecord) -> str:
+        parts = [article.title, article.description or "", article.content or ""]
+        return _TRUNCATION_MARKER.sub(" ", " ".join(parts))
@@ -0,0 +1,382 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from src.core.models import ArticleRecord, Summary, UserProfile
+from src.core.single_flight import SingleFlight
+from src.core import metrics
+
+logger = logging.getLogger(__name__)
+
+DIGEST_MATERIALIZATIONS = metrics.counter(
+    "digest_materializations_total", "Personal digests rebuilt from topic snapshots, by cause", ["cause"]
+)
+DIGEST_TOPIC_REFRESHES = metrics.counter(
+    "digest_topic_refreshes_total", "Topic snapshot refreshes for personal digests, by outcome", ["outcome"]
+)
+
+class ProfileStore:
+    """
+    User profiles, held in memory and optionally persisted to a SQLite file
+    so subscriptions survive restarts
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._profiles: Dict[str, UserProfile] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                " user_id TEXT PRIMARY KEY,"
+                " profile TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            for user_id, profile in self._conn.execute("SELECT user_id, profile FROM profiles").fetchall():
+                try:
+                    self._profiles[user_id] = UserProfile.model_validate_json(profile)
+                except ValueError as e:
+                    logger.warning(f"Ignoring unreadable profile for '{user_id}': {str(e)}")
+            logger.info(f"Loaded {len(self._profiles)} user profiles")
+
+    def get(self, user_id: str) -> Optional[UserProfile]:
+        return self._profiles.get(user_id)
+
+    def put(self, user_id: str, profile: UserProfile) -> None:
+        with self._lock:
+            self._profiles[user_id] = profile
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO profiles (user_id, profile, updated_at) VALUES (?, ?, ?)",
+                    (user_id, profile.model_dump_json(), time.time())
+                )
+                self._conn.commit()
+
+    def delete(self, user_id: str) -> bool:
+        with self._lock:
+            existed = self._profiles.pop(user_id, None) is not None
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+                self._conn.commit()
+            return existed
+
+    def all(self) -> Dict[str, UserProfile]:
+        with self._lock:
+            return dict(self._profiles)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+
+@dataclass
+class TopicEntry:
+    article: ArticleRecord
+    relevance: float
+    summary: Optional[Summary] = None  # None until summarized (or if it was skipped)
+
+@dataclass
+class TopicSnapshot:
+    """A topic's current top-ranked articles and their summaries, shared by all its subscribers"""
+    topic: str
+    entries: Dict[str, TopicEntry] = field(default_factory=dict)  # URL -> entry, best first
+    refreshed_at: Optional[float] = None
+
+class DigestMaterializer:
+    """
+    Precomputed personal digests.
+
+    Each subscribed topic is fetched, ranked and summarized once however
+    many users follow it (its snapshot). A user's digest merges the
+    snapshots of their topics by profile weight and interests, and is
+    serialized once, so a read is a dictionary lookup. When a snapshot
+    changes - new articles rank in, or a summary arrives - only that
+    topic's subscribers are re-merged; nothing is fetched, ranked or
+    summarized on the read path.
+    """
+
+    def __init__(
+        self,
+        news_fetcher,
+        summarizer,
+        ranker,
+        profiles: ProfileStore,
+        top_k: int = 10,
+        refresh_seconds: float = 600.0,
+        max_concurrency: int = 2
+    ):
+        self.news_fetcher = news_fetcher
+        self.summarizer = summarizer
+        self.ranker = ranker
+        self.profiles = profiles
+        self.top_k = top_k  # Articles kept per topic snapshot
+        self.refresh_seconds = refresh_seconds
+        self.max_concurrency = max_concurrency
+        self.runs = 0
+        self.last_run_time: Optional[float] = None
+        self._topics: Dict[str, TopicSnapshot] = {}
+        self._subscribers: Dict[str, Set[str]] = {}  # topic -> user ids
+        self._digests: Dict[str, bytes] = {}  # user id -> serialized digest
+        self._flights = SingleFlight("topic-refresh")
+        self._background: Set["asyncio.Future"] = set()
+        self._articles_ready: Dict[str, "asyncio.Future"] = {}  # topic -> resolved once its first articles are in
+        self._task: Optional[asyncio.Task] = None
+        for user_id, profile in profiles.all().items():
+            self._subscribe(user_id, profile)
+
+    def set_profile(self, user_id: str, profile: UserProfile) -> None:
+        """Store a profile, re-materialize from the snapshots we have and fetch any new topics"""
+        previous = self.profiles.get(user_id)
+        self.profiles.put(user_id, profile)
+        self._subscribe(user_id, profile)
+        if previous is not None:
+            # Topics the user keeps stay subscribed, snapshots and all
+            self._unsubscribe(user_id, set(previous.topics) - set(profile.topics))
+        self._materialize(user_id, "profile")
+
+        for topic in self._missing_topics(profile):
+            self._refresh_in_background(topic)
+
+    def remove_profile(self, user_id: str) -> bool:
+        profile = self.profiles.get(user_id)
+        if profile is None:
+            return False
+        self._unsubscribe(user_id, profile.topics)
+        self._digests.pop(user_id, None)
+        return self.profiles.delete(user_id)
+
+    def get_digest(self, user_id: str) -> Optional[bytes]:
+        """The materialized digest as JSON, or None if the user has no profile"""
+        return self._digests.get(user_id)
+
+    async def ensure_digest(self, user_id: str) -> Optional[bytes]:
+        """
+        The materialized digest. Only waits if one of the user's topics has
+        never been fetched (a brand-new subscription), and then only for its
+        articles - summaries fill in on later reads as they arrive.
+        """
+        profile = self.profiles.get(user_id)
+        if profile is None:
+            return None
+        missing = self._missing_topics(profile)
+        if missing:
+            loop = asyncio.get_running_loop()
+            waiters = [self._articles_ready.setdefault(topic, loop.create_future()) for topic in missing]
+            for topic in missing:
+                self._refresh_in_background(topic)
+            results = await asyncio.gather(*(asyncio.shield(waiter) for waiter in waiters), return_exceptions=True)
+            for topic, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    # Serve the other topics; this one stays in pending_topics
+                    logger.error(f"Digest refresh failed for '{topic}': {str(result)}")
+        if user_id not in self._digests:
+            self._materialize(user_id, "read")
+        return self._digests.get(user_id)
+
+    async def refresh_topic(self, topic: str) -> None:
+        """Refresh one topic's snapshot; concurrent refreshes of a topic share one run"""
+        await self._flights.do(topic, lambda: self._refresh(topic))
+
+    def _refresh_in_background(self, topic: str) -> None:
+        refresh = asyncio.ensure_future(self.refresh_topic(topic))
+        self._background.add(refresh)
+        refresh.add_done_callback(self._background.discard)
+        # Failures are logged by _refresh; don't warn about an unretrieved exception
+        refresh.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def refresh_all(self) -> int:
+        """Refresh every subscribed topic, a few at a time; returns the number refreshed"""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def refresh_bounded(topic: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.refresh_topic(topic)
+                    return True
+                except Exception as e:
+                    logger.error(f"Digest refresh failed for '{topic}': {str(e)}")
+                    return False
+
+        topics = [topic for topic, users in self._subscribers.items() if users]
+        results = await asyncio.gather(*(refresh_bounded(topic) for topic in topics))
+        self.runs += 1
+        self.last_run_time = time.time()
+        return sum(results)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run_forever())
+            logger.info(f"Digest refresher started (every {self.refresh_seconds}s)")
+
+    async def stop(self) -> None:
+        for future in list(self._background):
+            future.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_status(self) -> Dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "refresh_seconds": self.refresh_seconds,
+            "users": len(self.profiles.all()),
+            "materialized_digests": len(self._digests),
+            "topics": len([topic for topic, users in self._subscribers.items() if users]),
+            "runs": self.runs,
+            "last_run_time": self.last_run_time
+        }
+
+    async def _refresh(self, topic: str) -> None:
+        snapshot = self._topics.setdefault(topic, TopicSnapshot(topic))
+        try:
+            candidates = await self.news_fetcher.fetch_articles(topic)
+            ranked = self.ranker.top_k(
+                candidates, self.top_k, topic,
+                eligible=self.summarizer.cost_controller.is_article_quality
+            )
+        except Exception as e:
+            DIGEST_TOPIC_REFRESHES.labels(outcome="error").inc()
+            self._signal_articles_ready(topic, e)
+            raise
+        if self.news_fetcher.is_stale(topic):
+            # NewsAPI failed - keep the snapshot we have, and its age, rather
+            # than re-ranking leftovers as if they had just been fetched
+            DIGEST_TOPIC_REFRESHES.labels(outcome="unavailable").inc()
+            self._signal_articles_ready(topic)
+            logger.warning(f"Digest topic '{topic}' not refreshed: NewsAPI unavailable")
+            return
+
+        entries: Dict[str, TopicEntry] = {}
+        to_summarize: List[TopicEntry] = []
+        for article, relevance in ranked:
+            previous = snapshot.entries.get(article.url)
+            entry = TopicEntry(article, relevance, previous.summary if previous else None)
+            entries[article.url] = entry
+            # Extractive fallbacks get another shot at the LLM on the next refresh
+            if entry.summary is None or entry.summary.kind == "extractive":
+                to_summarize.append(entry)
+
+        first_refresh = snapshot.refreshed_at is None
+        changed = list(entries) != list(snapshot.entries)
+        snapshot.entries = entries
+        snapshot.refreshed_at = time.time()
+        if changed or first_refresh:
+            self._publish(topic, "articles")
+        self._signal_articles_ready(topic)
+
+        # Summaries land in the snapshot - and subscribers' digests - one by one
+        summarized = 0
+        async for index, summary in self.summarizer.iter_summaries([entry.article for entry in to_summarize]):
+            if summary and summary != to_summarize[index].summary:
+                to_summarize[index].summary = summary
+                summarized += 1
+                self._publish(topic, "summary")
+
+        DIGEST_TOPIC_REFRESHES.labels(outcome="changed" if changed or summarized else "unchanged").inc()
+        logger.info(
+            f"Refreshed digest topic '{topic}': {len(entries)} articles, "
+            f"{summarized} new summaries, {len(self._subscribers.get(topic, ()))} subscribers"
+        )
+
+    def _signal_articles_ready(self, topic: str, error: Optional[Exception] = None) -> None:
+        waiter = self._articles_ready.pop(topic, None)
+        if waiter is not None and not waiter.done():
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(None)
+
+    def _publish(self, topic: str, cause: str) -> None:
+        for user_id in list(self._subscribers.get(topic, ())):
+            self._materialize(user_id, cause)
+
+    def _materialize(self, user_id: str, cause: str) -> None:
+        profile = self.profiles.get(user_id)
+        if profile is None:
+            return
+
+        # An article syndicated under several topics appears once, at its best score
+        best: Dict[str, Tuple[float, str, TopicEntry]] = {}
+        for topic, weight in profile.topics.items():
+            snapshot = self._topics.get(topic)
+            if snapshot is None:
+                continue
+            for url, entry in snapshot.entries.items():
+                score = weight * entry.relevance
+                if url not in best or score > best[url][0]:
+                    best[url] = (score, topic, entry)
+
+        candidates = list(best.values())
+        if profile.interests and candidates:
+            interest_scores = self.ranker.score([entry.article for _, _, entry in candidates], "", profile.interests)
+            candidates = [
+                (score + float(interest_score), topic, entry)
+                for (score, topic, entry), interest_score in zip(candidates, interest_scores)
+            ]
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        articles = []
+        for score, topic, entry in candidates[:profile.max_articles]:
+            article_dict = entry.article.to_dict()
+            article_dict["topic"] = topic
+            article_dict["ai_summary"] = entry.summary.text if entry.summary else None
+            article_dict["summary_type"] = entry.summary.kind if entry.summary else None
+            article_dict["relevance"] = round(score, 4)
+            articles.append(article_dict)
+
+        self._digests[user_id] = json.dumps({
+            "user_id": user_id,
+            "updated_at": datetime.now().isoformat(),
+            "topics": profile.topics,
+            "pending_topics": self._missing_topics(profile),
+            "article_count": len(articles),
+            "summarized_count": sum(1 for article in articles if article["ai_summary"]),
+            "articles": articles
+        }).encode("utf-8")
+        DIGEST_MATERIALIZATIONS.labels(cause=cause).inc()
+
+    def _missing_topics(self, profile: UserProfile) -> List[str]:
+        """The profile's topics that have never been fetched"""
+        return [
+            topic for topic in profile.topics
+            if topic not in self._topics or self._topics[topic].refreshed_at is None
+        ]
+
+    def _subscribe(self, user_id: str, profile: UserProfile) -> None:
+        for topic in profile.topics:
+            self._subscribers.setdefault(topic, set()).add(user_id)
+
+    def _unsubscribe(self, user_id: str, topics: Iterable[str]) -> None:
+        for topic in topics:
+            users = self._subscribers.get(topic)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    # Nobody follows it any more - stop refreshing and keeping it
+                    del self._subscribers[topic]
+                    self._topics.pop(topic, None)
+
+    async def _run_forever(self) -> None:
+        # Refresh right away, so profiles loaded at startup have digests ready
+        while True:
+            try:
+                await self.refresh_all()
+            except Exception as e:
+                logger.error(f"Digest refresh run failed: {str(e)}")
+            await asyncio.sleep(self.refresh_seconds)
@@ -0,0 +1,117 @@
+import math
+import re
+from collections import Counter
+from typing import List, Optional
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_TRUNCATION_MARKER = re.compile(r"\s*(?:…|\.\.\.)?\s*\[\+\d+ chars\]\s*$")  # NewsAPI's "... [+1234 chars]"
+
+STOPWORDS = frozenset("""
+a about after all also an and any are as at be been but by can could did do does for from had has
+have he her his how i if in into is it its just more most new no not of on one or our out over
+said says she so than that the their them there these they this to up was we were what when which
+who will with would you your
+""".split())
+
+class ExtractiveSummarizer:
+    """
+    Local, zero-cost fallback summarizer: TextRank over TF-IDF sentence
+    vectors, nudged towards sentences that share words with the title and
+    appear early (news leads carry the story). Pure Python - a few
+    milliseconds for a NewsAPI-sized article.
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = 2,
+        max_chars: int = 500,
+        damping: float = 0.85,
+        iterations: int = 30
+    ):
+        self.max_sentences = max_sentences
+        self.max_chars = max_chars
+        self.damping = damping
+        self.iterations = iterations
+
+    def summarize(self, title: str, text: str) -> Optional[str]:
+        sentences = self._sentences(text)
+        if not sentences:
+            return None
+        if len(sentences) <= self.max_sentences:
+            return self._join(sentences)
+
+        tokens = [self._words(sentence) for sentence in sentences]
+        vectors = self._tfidf(tokens)
+        ranks = self._textrank(vectors)
+        title_words = set(self._words(title or ""))
+
+        scores = []
+        for index, (rank, words) in enumerate(zip(ranks, tokens)):
+            overlap = len(title_words.intersection(words)) / len(title_words) if title_words else 0.0
+            position = 1.0 / (index + 1)
+            scores.append(rank * len(sentences) + 0.5 * overlap + 0.3 * position)
+
+        best = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)[:self.max_sentences]
+        return self._join([sentences[i] for i in sorted(best)])
+
+    def _sentences(self, text: str) -> List[str]:
+        text = _TRUNCATION_MARKER.sub("", text or "").strip()
+        parts = [part.strip() for part in _SENTENCE_BOUNDARY.split(text) if part.strip()]
+        # NewsAPI truncates content mid-sentence - drop the fragment if we have whole ones
+        if len(parts) > 1 and parts[-1][-1] not in ".!?\"'":
+            parts.pop()
+
+        seen = set()
+        sentences = []
+        for part in parts:
+            key = part.lower()
+            if len(self._words(part)) >= 4 and key not in seen:
+                seen.add(key)
+                sentences.append(part)
+        return sentences
+
+    def _words(self, text: str) -> List[str]:
+        return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+    def _tfidf(self, tokens: List[List[str]]) -> List[dict]:
+        document_frequency = Counter(word for words in tokens for word in set(words))
+        count = len(tokens)
+        vectors = []
+        for words in tokens:
+            term_frequency = Counter(words)
+            vector = {
+                word: (frequency / len(words)) * (math.log(count / document_frequency[word]) + 1.0)
+                for word, frequency in term_frequency.items()
+            }
+            norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+            vectors.append({word: weight / norm for word, weight in vector.items()})
+        return vectors
+
+    def _textrank(self, vectors: List[dict]) -> List[float]:
+        count = len(vectors)
+        similarity = [[0.0] * count for _ in range(count)]
+        for i in range(count):
+            for j in range(i + 1, count):
+                a, b = vectors[i], vectors[j]
+                if len(a) > len(b):
+                    a, b = b, a
+                score = sum(weight * b.get(word, 0.0) for word, weight in a.items())
+                similarity[i][j] = similarity[j][i] = score
+
+        out_weight = [sum(row) or 1.0 for row in similarity]
+        ranks = [1.0 / count] * count
+        for _ in range(self.iterations):
+            ranks = [
+                (1 - self.damping) / count + self.damping * sum(
+                    similarity[j][i] / out_weight[j] * ranks[j] for j in range(count)
+                )
+                for i in range(count)
+            ]
+        return ranks
+
+    def _join(self, sentences: List[str]) -> str:
+        summary = " ".join(sentences)
+        if len(summary) > self.max_chars:
+            summary = summary[:self.max_chars].rsplit(" ", 1)[0].rstrip(",;:") + "..."
+        return summary
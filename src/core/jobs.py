@@ -0,0 +1,222 @@
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from src.core import metrics
+from src.core.models import JobPriority
+
+logger = logging.getLogger(__name__)
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+JOBS = metrics.counter("jobs_total", "Jobs by priority and what happened to them", ["priority", "outcome"])
+JOBS_QUEUED = metrics.gauge("jobs_queued", "Jobs waiting for a worker", ["priority"])
+JOBS_RUNNING = metrics.gauge("jobs_running", "Jobs currently running")
+JOB_QUEUE_WAIT = metrics.histogram(
+    "job_queue_wait_seconds", "Time from submission until a worker picks the job up", ["priority"]
+)
+JOB_RUN_TIME = metrics.histogram("job_run_seconds", "Time spent running a job", ["priority"])
+
+class QueueFullError(Exception):
+    """Raised when a job can't be admitted; the caller should retry later"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+@dataclass
+class Job:
+    id: str
+    key: str  # Identical pending jobs share one key
+    priority: JobPriority
+    params: Dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job to finish; False if the timeout passed first"""
+        try:
+            await asyncio.wait_for(self.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status.value,
+            "priority": self.priority.value,
+            "params": self.params,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+class JobQueue:
+    """
+    Bounded in-process job queue with a fixed pool of async workers.
+
+    Jobs are picked strictly by priority class, then in submission order.
+    Submitting a job identical to one still queued or running returns the
+    existing job instead (raising its priority if the new caller is more
+    urgent). When the queue is full new jobs are refused with
+    QueueFullError; background classes may only fill part of it, so a
+    burst of pre-warm or batch work never locks out interactive users.
+    Finished jobs are kept for result_ttl seconds so clients can collect
+    their results.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[Job], Awaitable[Any]],
+        workers: int = 4,
+        max_queued: int = 100,
+        background_share: float = 0.5,
+        result_ttl: float = 900.0
+    ):
+        self.runner = runner
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self.background_share = background_share
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._pending: Dict[str, Job] = {}  # key -> queued or running job
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._queued = {priority: 0 for priority in JobPriority}
+        self._workers: List["asyncio.Future"] = []
+        self._run_times: Deque[float] = deque(maxlen=50)  # Recent run times, for Retry-After estimates
+
+    def start(self) -> None:
+        if not self._workers:
+            self._queue = self._queue or asyncio.PriorityQueue()
+            self._workers = [asyncio.ensure_future(self._work(index)) for index in range(self.workers)]
+            logger.info(f"Job queue started with {self.workers} workers (max {self.max_queued} queued)")
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        for worker in self._workers:
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+
+    def submit(self, key: str, params: Dict[str, Any], priority: JobPriority) -> Tuple[Job, bool]:
+        """Queue a job; returns (job, created) - created is False for a deduplicated submission"""
+        self.start()
+        self._prune()
+        existing = self._pending.get(key)
+        if existing is not None:
+            JOBS.labels(priority=priority.value, outcome="deduplicated").inc()
+            if existing.status == JobStatus.QUEUED and priority.rank < existing.priority.rank:
+                # Re-queue at the higher priority; the old entry is skipped when popped
+                self._set_queued(existing.priority, -1)
+                existing.priority = priority
+                self._set_queued(priority, 1)
+                self._enqueue(existing)
+            return existing, False
+
+        queued = sum(self._queued.values())
+        limit = self.max_queued if priority == JobPriority.INTERACTIVE else int(self.max_queued * self.background_share)
+        if queued >= limit:
+            JOBS.labels(priority=priority.value, outcome="rejected").inc()
+            raise QueueFullError(f"Job queue full ({queued} queued)", self._retry_after(queued))
+
+        job = Job(id=uuid.uuid4().hex, key=key, priority=priority, params=params)
+        self._jobs[job.id] = job
+        self._pending[key] = job
+        self._set_queued(priority, 1)
+        self._enqueue(job)
+        JOBS.labels(priority=priority.value, outcome="submitted").inc()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def get_status(self) -> Dict:
+        return {
+            "workers": len(self._workers),
+            "queued": {priority.value: count for priority, count in self._queued.items()},
+            "running": sum(1 for job in self._pending.values() if job.status == JobStatus.RUNNING),
+            "max_queued": self.max_queued,
+            "retained_jobs": len(self._jobs)
+        }
+
+    def _enqueue(self, job: Job) -> None:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        self._queue.put_nowait((job.priority.rank, next(self._sequence), job))
+
+    def _set_queued(self, priority: JobPriority, delta: int) -> None:
+        self._queued[priority] += delta
+        JOBS_QUEUED.labels(priority=priority.value).set(self._queued[priority])
+
+    async def _work(self, index: int) -> None:
+        while True:
+            rank, _, job = await self._queue.get()
+            if job.status != JobStatus.QUEUED or rank != job.priority.rank:
+                continue  # Stale entry of a job that was re-prioritized
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        self._set_queued(job.priority, -1)
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        JOB_QUEUE_WAIT.labels(priority=job.priority.value).observe(job.started_at - job.created_at)
+        started = time.perf_counter()
+        try:
+            with JOBS_RUNNING.track_inprogress():
+                job.result = await self.runner(job)
+            job.status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = JobStatus.FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.key}) failed: {str(e)}")
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+        finally:
+            elapsed = time.perf_counter() - started
+            self._run_times.append(elapsed)
+            JOB_RUN_TIME.labels(priority=job.priority.value).observe(elapsed)
+            JOBS.labels(priority=job.priority.value, outcome=job.status.value).inc()
+            job.finished_at = time.time()
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+            job.done.set()
+
+    def _retry_after(self, queued: int) -> float:
+        """Rough time until a slot frees up: the queue ahead drained at the recent run rate"""
+        average = sum(self._run_times) / len(self._run_times) if self._run_times else 5.0
+        return max(1.0, round(average * queued / self.workers, 1))
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
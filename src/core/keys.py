@@ -0,0 +1,55 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only identify an ad click, campaign or share - never
+# the article. Generic names like "source", "ref" or "id" are kept: some
+# sites use them to select the content.
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid",
+    "igshid", "_ga", "_gl", "__twitter_impression", "ref_src", "smid", "smtyp"
+}
+TRACKING_PREFIXES = ("utm_", "mc_", "pk_", "hsa_")
+
+_AMP_PATH = re.compile(r"/amp/?$|\.amp(?=\.html?$|$)")
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize an article URL so that tracking parameters, AMP variants,
+    http/https, "www." and trailing slashes all map to the same key
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "amp.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    try:
+        port = parts.port
+    except ValueError:
+        return url.strip()  # Invalid port - the raw URL is still a usable key
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = _AMP_PATH.sub("", parts.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+
+    # Scheme is deliberately dropped - http and https serve the same article
+    return urlunsplit(("", host, path, urlencode(query), "")).lstrip("/")
+
+def content_key(content: str, model: str, prompt_version: str) -> str:
+    """
+    Cache key for a summary: the exact content sent to the LLM, plus the
+    model and prompt that produced it. Editing the article, switching
+    models or changing the prompts all produce a new key.
+    """
+    digest = hashlib.sha256(
+        "\x1f".join((model, prompt_version, content)).encode("utf-8")
+    ).hexdigest()
+    return f"summary:{digest}"
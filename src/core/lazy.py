@@ -0,0 +1,45 @@
+import logging
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class LazyComponent(Generic[T]):
+    """
+    A component built on first use instead of at import time.
+
+    Thread-safe: FastAPI runs sync dependency providers in its threadpool,
+    and the startup warm-up builds components on a worker thread while
+    requests may already be arriving - whoever comes first builds it, the
+    rest wait for that one instance. A failed build is retried on next use.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+        self.init_seconds: Optional[float] = None
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    started = time.perf_counter()
+                    self._instance = self._factory()
+                    self.init_seconds = time.perf_counter() - started
+                    logger.info(f"Initialized {self.name} in {self.init_seconds * 1000:.0f}ms")
+                instance = self._instance
+        return instance
+
+    def peek(self) -> Optional[T]:
+        """The instance if it has been built, without building it"""
+        return self._instance
+
+    @property
+    def ready(self) -> bool:
+        return self._instance is not None
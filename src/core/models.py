@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Dict, Any, NamedTuple, Sequence
 from datetime import datetime
+from enum import Enum
 
 # First, model what the API actually returns
 class NewsAPISource(BaseModel):
@@ -30,10 +31,10 @@ class Article(BaseModel):
     url: str
     source: str  # We'll extract just the source name
     published_at: Optional[datetime] = None
-    raw_data: Optional[Dict[str, Any]] = None  # Keep original for debugging
+    raw_data: Optional[Dict[str, Any]] = None  # Original payload, only kept when capture_raw is set
 
     @classmethod
-    def from_newsapi(cls, api_article: NewsAPIArticle) -> 'Article':
+    def from_newsapi(cls, api_article: NewsAPIArticle, capture_raw: bool = False) -> 'Article':
         """Transform NewsAPI response to our clean internal format"""
         return cls(
             title=api_article.title,
@@ -42,5 +43,153 @@ class Article(BaseModel):
             url=api_article.url,
             source=api_article.source.name,  # Extract just the name
             published_at=api_article.publishedAt,
-            raw_data=api_article.dict()  # Keep original for reference
-        )
\ No newline at end of file
+            raw_data=api_article.dict() if capture_raw else None
+        )
+
+# Fields a client can select from each article in a digest response
+ARTICLE_FIELDS = ("title", "description", "content", "url", "source", "published_at")
+
+def parse_published_at(value: Optional[str]) -> Optional[datetime]:
+    """NewsAPI timestamps are ISO 8601 with a trailing Z"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+class ArticleRecord:
+    """
+    Lightweight article used on the hot path (fetch -> cache -> summarize ->
+    respond). Same attributes as Article, without per-instance Pydantic
+    validation or a __dict__; raw_data is None unless capture was requested.
+    """
+
+    __slots__ = ("title", "description", "content", "url", "source", "published_at", "raw_data")
+
+    def __init__(
+        self,
+        title: str,
+        url: str,
+        source: str,
+        description: Optional[str] = None,
+        content: Optional[str] = None,
+        published_at: Optional[datetime] = None,
+        raw_data: Optional[Dict[str, Any]] = None
+    ):
+        self.title = title
+        self.description = description
+        self.content = content
+        self.url = url
+        self.source = source
+        self.published_at = published_at
+        self.raw_data = raw_data
+
+    @classmethod
+    def from_newsapi(cls, api_article: NewsAPIArticle, capture_raw: bool = False) -> 'ArticleRecord':
+        return cls(
+            title=api_article.title,
+            description=api_article.description,
+            content=api_article.content,
+            url=api_article.url,
+            source=api_article.source.name,
+            published_at=parse_published_at(api_article.publishedAt),
+            raw_data=api_article.dict() if capture_raw else None
+        )
+
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        JSON-ready dict of the selected fields (all of them by default).
+        raw_data is only included when it was captured.
+        """
+        data = {}
+        for name in ARTICLE_FIELDS if fields is None else fields:
+            value = getattr(self, name)
+            data[name] = value.isoformat() if isinstance(value, datetime) else value
+        if fields is None and self.raw_data is not None:
+            data["raw_data"] = self.raw_data
+        return data
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ArticleRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(title={self.title!r}, url={self.url!r}, source={self.source!r})"
+
+class Summary(NamedTuple):
+    """
+    An article summary and how it was made - "abstractive" (written by the
+    LLM) or "extractive" (key sentences picked locally when the LLM can't
+    be used). Only abstractive summaries are cached.
+    """
+    text: str
+    kind: str = "abstractive"
+
+# Response models - documentation of the digest payload. Articles only carry
+# the fields the client selected, so everything is optional.
+class DigestArticle(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    content: Optional[str] = None
+    url: Optional[str] = None
+    source: Optional[str] = None
+    published_at: Optional[datetime] = None
+    ai_summary: Optional[str] = None
+    summary_type: Optional[str] = None  # "abstractive" (LLM) or "extractive" (degraded-mode fallback)
+    relevance: Optional[float] = None  # Ranking score against the topic and interests
+    raw_data: Optional[Dict[str, Any]] = None
+
+class NewsDigestResponse(BaseModel):
+    topic: str
+    candidate_count: int = 0  # Articles fetched and ranked
+    article_count: int  # Top-ranked articles selected for the digest
+    summarized_count: int
+    skipped_count: int
+    extractive_count: int = 0
+    cost_metrics: Dict[str, Any]
+    articles: List[DigestArticle]
+
+def normalize_topic(topic: str) -> str:
+    """Case- and whitespace-insensitive topic name, so "AI " and "ai" share one digest"""
+    return " ".join(topic.lower().split())
+
+class UserProfile(BaseModel):
+    """What a reader follows: topics with relative weights, plus optional interests to rank by"""
+    topics: Dict[str, float] = Field(..., description="Topic -> weight, e.g. {\"ai\": 1.0, \"climate\": 0.5}")
+    interests: List[str] = Field(default_factory=list)
+    max_articles: int = Field(10, ge=1, le=50)
+
+    @field_validator("topics")
+    @classmethod
+    def normalize_topics(cls, topics: Dict[str, float]) -> Dict[str, float]:
+        normalized = {}
+        for topic, weight in topics.items():
+            name = normalize_topic(topic)
+            if not name:
+                raise ValueError("topic names must not be empty")
+            if weight <= 0:
+                raise ValueError(f"weight for topic '{topic}' must be positive")
+            normalized[name] = weight
+        if not normalized:
+            raise ValueError("at least one topic is required")
+        return normalized
+
+class JobPriority(str, Enum):
+    INTERACTIVE = "interactive"  # A user is waiting on it
+    PREWARM = "prewarm"  # Background cache warming
+    BATCH = "batch"  # Bulk work - runs when nothing else is queued
+
+    @property
+    def rank(self) -> int:
+        return _PRIORITY_RANK[self]
+
+_PRIORITY_RANK = {JobPriority.INTERACTIVE: 0, JobPriority.PREWARM: 1, JobPriority.BATCH: 2}
+
+class DigestJobRequest(BaseModel):
+    """A digest to build in the background - the same options as /news/{topic}"""
+    topic: str = Field(..., min_length=1)
+    top_k: Optional[int] = Field(None, ge=1)
+    interests: List[str] = Field(default_factory=list)
+    priority: JobPriority = JobPriority.INTERACTIVE
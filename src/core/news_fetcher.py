@@ -1,17 +1,112 @@
+import asyncio
 import requests
+import httpx
 import logging
-from typing import List
-from src.core.models import NewsAPIResponse, Article
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+from src.core.models import ArticleRecord
+from src.core.decode import NewsAPIDecodeError, decode_articles
 from src.config.settings import settings
+from src.core.single_flight import SingleFlight
+from src.core.keys import canonicalize_url
+from src.core.circuit_breaker import create_breaker
+from src.core import metrics
 
 logger = logging.getLogger(__name__)
 
+NEWSAPI_LATENCY = metrics.histogram(
+    "newsapi_request_seconds", "NewsAPI request latency, by outcome", ["outcome"]
+)
+NEWSAPI_IN_FLIGHT = metrics.gauge("newsapi_requests_in_flight", "NewsAPI requests currently in flight")
+TOPIC_CACHE_REQUESTS = metrics.counter(
+    "topic_cache_requests_total", "Topic fetches served from / missing the topic cache", ["result"]
+)
+
+@dataclass
+class TopicEntry:
+    articles: List[ArticleRecord]
+    fetched_at: float
+    newest_published: Optional[datetime]
+
+class TopicCache:
+    """
+    Recent NewsAPI results per topic. Entries younger than the TTL are served
+    as-is; older ones are kept around so a refresh only has to ask NewsAPI
+    for articles newer than the newest one we already have.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_topics: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.max_topics = max_topics
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, TopicEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[TopicEntry]:
+        """Latest entry for a topic, fresh or not"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get_fresh(self, key: str) -> Optional[List[ArticleRecord]]:
+        """Cached articles if the entry is still within its TTL"""
+        entry = self.get(key)
+        if entry is not None and time.time() - entry.fetched_at < self.ttl_seconds:
+            self.hits += 1
+            TOPIC_CACHE_REQUESTS.labels(result="hit").inc()
+            return entry.articles
+        self.misses += 1
+        TOPIC_CACHE_REQUESTS.labels(result="miss").inc()
+        return None
+
+    def store(self, key: str, articles: List[ArticleRecord]) -> TopicEntry:
+        published = [article.published_at for article in articles if article.published_at]
+        entry = TopicEntry(
+            articles=articles,
+            fetched_at=time.time(),
+            newest_published=max(published) if published else None
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_topics:
+                self._entries.popitem(last=False)
+        return entry
+
+def _merge_articles(new: List[ArticleRecord], old: List[ArticleRecord], limit: int) -> List[ArticleRecord]:
+    """Newest first, de-duplicated by canonical URL (new copies win), capped at limit"""
+    merged: Dict[str, ArticleRecord] = {}
+    for article in list(new) + list(old):
+        merged.setdefault(canonicalize_url(article.url), article)
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    ordered = sorted(
+        merged.values(),
+        key=lambda article: _as_utc(article.published_at) or oldest,
+        reverse=True
+    )
+    return ordered[:limit]
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
 class NewsFetcher:
     def __init__(self):
         self.api_key = settings.newsapi_key
         self.base_url = settings.newsapi_base_url
-        
-    def fetch_articles(self, topic: str) -> List[Article]:
+        self.session = requests.Session()  # Reuse connections across fetches
+
+    def fetch_articles(self, topic: str) -> List[ArticleRecord]:
         """
         Fetch articles from NewsAPI and transform to our internal format
         """
@@ -20,28 +115,25 @@ class NewsFetcher:
             params = {
                 "q": topic,
                 "apiKey": self.api_key,
-                "pageSize": 10,
+                "pageSize": settings.newsapi_page_size,
                 "sortBy": "publishedAt",
                 "language": "en"  # Added for consistency
             }
-            
+
             logger.info(f"Fetching news for topic: {topic}")
-            
-            response = requests.get(url, params=params, timeout=10.0)
+
+            started = time.perf_counter()
+            with NEWSAPI_IN_FLIGHT.track_inprogress():
+                response = self.session.get(url, params=params, timeout=settings.newsapi_timeout)
+            outcome = "ok" if response.status_code < 400 else f"http_{response.status_code}"
+            NEWSAPI_LATENCY.labels(outcome=outcome).observe(time.perf_counter() - started)
             response.raise_for_status()
-            
-            # Parse using the correct API model
-            news_data = NewsAPIResponse(**response.json())
-            
-            # Transform to our clean internal format
-            articles = [
-                Article.from_newsapi(api_article) 
-                for api_article in news_data.articles
-            ]
-            
+
+            articles = decode_articles(response.content, capture_raw=settings.capture_raw_data)
+
             logger.info(f"Successfully fetched and transformed {len(articles)} articles")
             return articles
-            
+
         except requests.exceptions.Timeout:
             logger.error(f"NewsAPI request timed out for topic: {topic}")
             return []
@@ -51,6 +143,193 @@ class NewsFetcher:
         except requests.exceptions.RequestException as e:
             logger.error(f"NewsAPI request failed: {str(e)}")
             return []
+        except NewsAPIDecodeError as e:
+            logger.error(f"Unusable NewsAPI response for topic {topic}: {str(e)}")
+            return []
         except Exception as e:
             logger.error(f"Unexpected error in NewsFetcher: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+class AsyncNewsFetcher:
+    """
+    Non-blocking NewsAPI client backed by a pooled, keep-alive HTTP client.
+    Fetches several topics and pages concurrently with bounded parallelism.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.api_key = settings.newsapi_key
+        self.base_url = settings.newsapi_base_url
+        self.max_concurrency = max_concurrency or settings.fetch_concurrency
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=settings.newsapi_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.newsapi_max_connections,
+                max_keepalive_connections=settings.newsapi_max_connections
+            )
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._flights = SingleFlight("topic-fetch")
+        self.breaker = create_breaker("newsapi")
+        self.topic_cache = TopicCache(
+            ttl_seconds=settings.news_cache_ttl_seconds,
+            max_topics=settings.news_cache_max_topics
+        )
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        return self._semaphore
+
+    async def fetch_articles(self, topic: str, pages: Optional[int] = None) -> List[ArticleRecord]:
+        """
+        Fetch one or more pages for a topic concurrently, de-duplicated by URL.
+        Concurrent requests for the same topic share a single NewsAPI call.
+        """
+        page_count = max(1, pages or settings.newsapi_pages)
+        key = self._cache_key(topic, page_count)
+
+        cached = self.topic_cache.get_fresh(key)
+        if cached is not None:
+            return list(cached)
+
+        articles = await self._flights.do(key, lambda: self._fetch_topic(key, topic, page_count))
+        return list(articles)  # Each caller gets its own list
+
+    def is_stale(self, topic: str, pages: Optional[int] = None) -> bool:
+        """
+        True if the topic has no successful fetch within the cache TTL - after
+        fetch_articles, that means NewsAPI failed and any articles returned
+        are left over from an earlier fetch
+        """
+        entry = self.topic_cache.get(self._cache_key(topic, max(1, pages or settings.newsapi_pages)))
+        return entry is None or time.time() - entry.fetched_at >= self.topic_cache.ttl_seconds
+
+    def _cache_key(self, topic: str, page_count: int) -> str:
+        return f"{topic.strip().lower()}:{page_count}"
+
+    async def _fetch_topic(self, key: str, topic: str, page_count: int) -> List[ArticleRecord]:
+        previous = self.topic_cache.get(key)
+        since = previous.newest_published if previous else None
+
+        if since is None:
+            logger.info(f"Fetching news for topic: {topic} ({page_count} page(s))")
+            results = await asyncio.gather(
+                *(self.fetch_page(topic, page) for page in range(1, page_count + 1))
+            )
+        else:
+            # Incremental refresh - only ask for articles newer than what we have.
+            # Further pages are only needed if the first one came back full.
+            logger.info(f"Refreshing news for topic: {topic} (since {since.isoformat()})")
+            first_page = await self.fetch_page(topic, 1, since)
+            results = [first_page]
+            if first_page is not None and len(first_page) >= settings.newsapi_page_size and page_count > 1:
+                results += await asyncio.gather(
+                    *(self.fetch_page(topic, page, since) for page in range(2, page_count + 1))
+                )
+
+        succeeded = [page_articles for page_articles in results if page_articles is not None]
+        if not succeeded:
+            # Keep the old entry's fetch time, so the next request retries
+            # instead of the outage being cached as a fresh (empty) result
+            kept = previous.articles if previous else []
+            logger.warning(f"All NewsAPI requests failed for topic: {topic} - serving {len(kept)} earlier articles")
+            return kept
+
+        fetched = [article for page_articles in succeeded for article in page_articles]
+        articles = _merge_articles(
+            fetched,
+            previous.articles if previous else [],
+            limit=settings.newsapi_page_size * page_count
+        )
+        self.topic_cache.store(key, articles)
+
+        logger.info(f"Successfully fetched and transformed {len(fetched)} articles ({len(articles)} cached for topic)")
+        return articles
+
+    async def fetch_many(
+        self, topics: Sequence[str], pages: Optional[int] = None
+    ) -> Dict[str, List[ArticleRecord]]:
+        """
+        Fan out across several topics at once. All pages of all topics share
+        the same concurrency limit, so total fetch time tracks the slowest
+        request rather than the number of topics.
+        """
+        unique_topics = list(dict.fromkeys(topics))
+        results = await asyncio.gather(
+            *(self.fetch_articles(topic, pages) for topic in unique_topics)
+        )
+        return dict(zip(unique_topics, results))
+
+    async def fetch_page(
+        self, topic: str, page: int = 1, since: Optional[datetime] = None
+    ) -> Optional[List[ArticleRecord]]:
+        """
+        Fetch a single page of results for a topic, optionally only articles
+        published since a time. None if the request failed (or the circuit is
+        open), as opposed to an empty page.
+        """
+        params = {
+            "q": topic,
+            "apiKey": self.api_key,
+            "pageSize": settings.newsapi_page_size,
+            "page": page,
+            "sortBy": "publishedAt",
+            "language": "en"
+        }
+        if since is not None:
+            params["from"] = _as_utc(since).strftime("%Y-%m-%dT%H:%M:%S")
+
+        if not self.breaker.allow_request():
+            logger.warning(f"NewsAPI circuit breaker open - skipping fetch for topic: {topic} (page {page})")
+            return None
+
+        outcome = "error"
+        started = None
+        try:
+            async with self.semaphore:
+                started = time.perf_counter()
+                with NEWSAPI_IN_FLIGHT.track_inprogress():
+                    response = await self.client.get("/everything", params=params)
+            response.raise_for_status()
+            self.breaker.record_success()
+            outcome = "ok"
+            return decode_articles(response.content, capture_raw=settings.capture_raw_data)
+
+        except httpx.TimeoutException:
+            outcome = "timeout"
+            self.breaker.record_failure()
+            logger.error(f"NewsAPI request timed out for topic: {topic} (page {page})")
+            return None
+        except httpx.HTTPStatusError as e:
+            outcome = f"http_{e.response.status_code}"
+            # Server errors and rate limiting (quota exhausted) mean back off;
+            # other client errors are about this request only
+            if e.response.status_code >= 500 or e.response.status_code == 429:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            logger.error(f"NewsAPI HTTP error: {e.response.status_code}")
+            return None
+        except httpx.HTTPError as e:
+            outcome = "connection_error"
+            self.breaker.record_failure()
+            logger.error(f"NewsAPI request failed: {str(e)}")
+            return None
+        except NewsAPIDecodeError as e:
+            outcome = "invalid_response"
+            logger.error(f"Unusable NewsAPI response for topic {topic} (page {page}): {str(e)}")
+            return None
+        except Exception as e:
+            outcome = "error"
+            logger.error(f"Unexpected error in AsyncNewsFetcher: {str(e)}")
+            return None
+        finally:
+            if started is not None:
+                NEWSAPI_LATENCY.labels(outcome=outcome).observe(time.perf_counter() - started)
+
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.aclose()
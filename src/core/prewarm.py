@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from src.core.jobs import Job, JobStatus, QueueFullError
+from src.core.models import normalize_topic
+
+logger = logging.getLogger(__name__)
+
+class TopicTracker:
+    """
+    Tracks how often each topic is requested, with exponential decay so
+    yesterday's breaking news doesn't stay "hot" forever
+    """
+
+    def __init__(self, half_life_seconds: float = 3600.0, max_topics: int = 1000, hot_refresh_seconds: float = 10.0):
+        self.half_life_seconds = half_life_seconds
+        self.max_topics = max_topics
+        self.hot_refresh_seconds = hot_refresh_seconds
+        self._scores: Dict[str, Tuple[float, float]] = {}  # topic -> (score, updated_at)
+        self._hot: Dict[int, Tuple[float, frozenset]] = {}  # n -> (computed_at, n hottest topics)
+        self._lock = threading.Lock()
+
+    def record(self, topic: str) -> None:
+        key = self._normalize(topic)
+        now = time.time()
+        with self._lock:
+            score, updated_at = self._scores.get(key, (0.0, now))
+            self._scores[key] = (self._decay(score, now - updated_at) + 1.0, now)
+            if len(self._scores) > self.max_topics:
+                self._drop_coldest(now)
+
+    def hottest(self, n: int, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """Top n topics by decayed request count, as (topic, score)"""
+        now = time.time()
+        with self._lock:
+            scored = [
+                (topic, self._decay(score, now - updated_at))
+                for topic, (score, updated_at) in self._scores.items()
+            ]
+        scored = [(topic, score) for topic, score in scored if score >= min_score]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:n]
+
+    def is_hot(self, topic: str, n: int) -> bool:
+        """
+        Whether the topic is among the n hottest. The ranking is recomputed
+        at most every hot_refresh_seconds, so this is cheap per request.
+        """
+        now = time.time()
+        computed_at, hot = self._hot.get(n, (0.0, frozenset()))
+        if now - computed_at >= self.hot_refresh_seconds or (len(hot) < n and self._normalize(topic) not in hot):
+            hot = frozenset(topic for topic, _ in self.hottest(n))
+            self._hot[n] = (now, hot)
+        return self._normalize(topic) in hot
+
+    def _decay(self, score: float, elapsed: float) -> float:
+        return score * math.pow(0.5, elapsed / self.half_life_seconds)
+
+    def _drop_coldest(self, now: float) -> None:
+        coldest = min(
+            self._scores,
+            key=lambda topic: self._decay(self._scores[topic][0], now - self._scores[topic][1])
+        )
+        del self._scores[coldest]
+
+    def _normalize(self, topic: str) -> str:
+        return normalize_topic(topic)
+
+class PrewarmScheduler:
+    """
+    Periodically refreshes the hottest topics in the background so that
+    requests for them are served from the summary cache.
+
+    Pre-warming is capped at a share of the daily budget: once the day's
+    spend reaches budget_share * daily_budget it stops, leaving the rest
+    for interactive requests. With a ranker, only each topic's top_k
+    articles are summarized, as for a digest. With submit_job, each topic
+    runs as a pre-warm priority job, behind any interactive jobs, with at
+    most max_concurrency of them queued or running at a time.
+    """
+
+    def __init__(
+        self,
+        news_fetcher,
+        summarizer,
+        tracker: TopicTracker,
+        interval_seconds: float = 900.0,
+        top_topics: int = 5,
+        budget_share: float = 0.3,
+        min_score: float = 1.0,
+        max_concurrency: int = 2,
+        ranker=None,
+        top_k: int = 10,
+        submit_job: Optional[Callable[[str], Job]] = None
+    ):
+        self.news_fetcher = news_fetcher
+        self.summarizer = summarizer
+        self.tracker = tracker
+        self.interval_seconds = interval_seconds
+        self.top_topics = top_topics
+        self.budget_share = budget_share
+        self.min_score = min_score
+        self.max_concurrency = max_concurrency
+        self.ranker = ranker
+        self.top_k = top_k
+        self.submit_job = submit_job
+        self.runs = 0
+        self.topics_refreshed = 0
+        self.last_run_time: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run_forever())
+            logger.info(f"Pre-warm scheduler started (every {self.interval_seconds}s, top {self.top_topics} topics)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> List[str]:
+        """Refresh the current hottest topics; returns the topics refreshed"""
+        if self.submit_job is not None:
+            refreshed = await self._run_jobs()
+        else:
+            refreshed = []
+            for topic, score in self.tracker.hottest(self.top_topics, self.min_score):
+                if not self._budget_allows():
+                    logger.info("Pre-warm budget share used up - skipping remaining topics")
+                    break
+                articles = await self.news_fetcher.fetch_articles(topic)
+                if self.ranker is not None:
+                    ranked = self.ranker.top_k(
+                        articles, self.top_k, topic,
+                        eligible=self.summarizer.cost_controller.is_article_quality
+                    )
+                    articles = [article for article, _ in ranked]
+                summaries = await self.summarizer.summarize_articles(articles, max_concurrency=self.max_concurrency)
+                refreshed.append(topic)
+                self._log_warmed(topic, score, len(articles), [summary.kind for summary in summaries if summary])
+
+        self.runs += 1
+        self.topics_refreshed += len(refreshed)
+        self.last_run_time = time.time()
+        return refreshed
+
+    async def _run_jobs(self) -> List[str]:
+        """
+        Run the hot topics as jobs, max_concurrency at a time. A new job is
+        only submitted once the budget check passes with the spend of the
+        jobs finished so far, so the budget share still bounds the run.
+        """
+        refreshed: List[str] = []
+        running: Dict[asyncio.Task, Tuple[str, float, Job]] = {}
+        try:
+            for topic, score in self.tracker.hottest(self.top_topics, self.min_score):
+                while len(running) >= max(1, self.max_concurrency):
+                    await self._collect_jobs(running, refreshed)
+                if not self._budget_allows():
+                    logger.info("Pre-warm budget share used up - skipping remaining topics")
+                    break
+                try:
+                    job = self.submit_job(topic)
+                except QueueFullError:
+                    logger.info("Job queue busy - leaving remaining topics to the next pre-warm run")
+                    break
+                running[asyncio.ensure_future(job.wait())] = (topic, score, job)
+            while running:
+                await self._collect_jobs(running, refreshed)
+        finally:
+            for task in running:
+                task.cancel()  # Only the waits - the jobs themselves carry on
+        return refreshed
+
+    async def _collect_jobs(self, running: Dict[asyncio.Task, Tuple[str, float, Job]], refreshed: List[str]) -> None:
+        """Wait for at least one running job to finish and record the outcome"""
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            topic, score, job = running.pop(task)
+            if job.status != JobStatus.SUCCEEDED:
+                logger.warning(f"Pre-warm job for '{topic}' failed: {job.error}")
+                continue
+            refreshed.append(topic)
+            self._log_warmed(
+                topic, score, job.result["article_count"],
+                [article.get("summary_type") for article in job.result["articles"]]
+            )
+
+    def _log_warmed(self, topic: str, score: float, total: int, summary_types: List[Optional[str]]) -> None:
+        # Extractive fallbacks aren't cached - only LLM summaries count as warmed
+        warmed = summary_types.count("abstractive")
+        logger.info(f"Pre-warmed '{topic}' (score {score:.1f}): {warmed}/{total} summaries cached")
+
+    def get_status(self) -> Dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            "budget_share": self.budget_share,
+            "runs": self.runs,
+            "topics_refreshed": self.topics_refreshed,
+            "last_run_time": self.last_run_time,
+            "hot_topics": [
+                {"topic": topic, "score": round(score, 2)}
+                for topic, score in self.tracker.hottest(self.top_topics)
+            ]
+        }
+
+    def _budget_allows(self) -> bool:
+        cost_controller = self.summarizer.cost_controller
+        return cost_controller.daily_spent < cost_controller.daily_budget * self.budget_share
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Pre-warm run failed: {str(e)}")
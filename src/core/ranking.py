@@ -0,0 +1,123 @@
+import re
+import zlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple
+from src.core.extractive import STOPWORDS
+from src.core.models import ArticleRecord
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_WORD = re.compile(r"[a-z0-9]+")
+FEATURE_BITS = 20  # Hash space - collisions are negligible at a few thousand distinct words
+
+def terms(text: Optional[str]) -> List[str]:
+    """Lower-cased content words, with plural "s" folded so "elections" matches "election\""""
+    words = []
+    for word in _WORD.findall((text or "").lower()):
+        if len(word) < 2 or word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words
+
+@lru_cache(maxsize=65536)
+def feature(word: str) -> int:
+    return zlib.crc32(word.encode("utf-8")) & ((1 << FEATURE_BITS) - 1)
+
+class ArticleRanker:
+    """
+    Ranks candidate articles by relevance to the topic and the reader's
+    interests: cosine similarity of hashed TF-IDF vectors over titles and
+    descriptions, computed for the whole batch at once with NumPy. No
+    model and no network - about a millisecond for 100 candidates - so we
+    can fetch wide and only send the best few to the LLM.
+    """
+
+    def __init__(
+        self,
+        title_weight: float = 2.0,
+        interest_weight: float = 1.0,
+        position_weight: float = 0.05
+    ):
+        self.title_weight = title_weight
+        self.interest_weight = interest_weight
+        self.position_weight = position_weight  # Small prior for NewsAPI's own order
+
+    def score(
+        self, articles: Sequence[ArticleRecord], topic: str, interests: Sequence[str] = ()
+    ) -> "np.ndarray":
+        """Relevance of each article, in input order"""
+        import numpy as np  # Deferred: ~0.1s to import, and only digests need it
+
+        count = len(articles)
+        prior = self.position_weight * (1.0 - np.arange(count, dtype=np.float32) / max(count, 1))
+
+        rows: List[int] = []
+        features: List[int] = []
+        weights: List[float] = []
+        for row, article in enumerate(articles):
+            for text, weight in ((article.title, self.title_weight), (article.description, 1.0)):
+                for word in terms(text):
+                    rows.append(row)
+                    features.append(feature(word))
+                    weights.append(weight)
+
+        query = [(feature(word), 1.0) for word in terms(topic)]
+        for interest in interests:
+            query.extend((feature(word), self.interest_weight) for word in terms(interest))
+        if not features or not query:
+            return prior
+
+        # Compact the hashed features down to the columns this batch uses
+        columns, inverse = np.unique(np.asarray(features, dtype=np.int64), return_inverse=True)
+        term_frequency = np.zeros((count, len(columns)), dtype=np.float32)
+        np.add.at(term_frequency, (np.asarray(rows), inverse), np.asarray(weights, dtype=np.float32))
+        term_frequency = np.log1p(term_frequency)  # Repeating a word shouldn't make an article twice as relevant
+
+        document_frequency = np.count_nonzero(term_frequency, axis=0)
+        idf = (np.log((1.0 + count) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        vectors = term_frequency * idf
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        query_features = np.asarray([f for f, _ in query], dtype=np.int64)
+        query_weights = np.asarray([w for _, w in query], dtype=np.float32)
+        positions = np.minimum(np.searchsorted(columns, query_features), len(columns) - 1)
+        known = columns[positions] == query_features  # Query words no candidate mentions can't score
+        query_vector = np.zeros(len(columns), dtype=np.float32)
+        np.add.at(query_vector, positions[known], query_weights[known])
+        query_vector = np.log1p(query_vector) * idf
+        norm = np.linalg.norm(query_vector)
+        if norm == 0:
+            return prior
+
+        return vectors @ (query_vector / norm) + prior
+
+    def top_k(
+        self,
+        articles: Sequence[ArticleRecord],
+        k: int,
+        topic: str,
+        interests: Sequence[str] = (),
+        eligible: Optional[Callable[[ArticleRecord], bool]] = None
+    ) -> List[Tuple[ArticleRecord, float]]:
+        """
+        The k most relevant articles with their scores, best first. Articles
+        failing `eligible` (e.g. the cost controller's quality check) don't
+        take up one of the k places.
+        """
+        import numpy as np
+
+        if k <= 0 or not articles:
+            return []
+        scores = self.score(articles, topic, interests)
+        selected = []
+        for index in np.argsort(-scores, kind="stable"):
+            article = articles[index]
+            if eligible is not None and not eligible(article):
+                continue
+            selected.append((article, float(scores[index])))
+            if len(selected) >= k:
+                break
+        return selected
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds from OpenAI's reset format ("20ms", "1s", "6m0s") or a plain number"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+class TokenBucket:
+    """Classic token bucket: holds up to `capacity`, refills continuously over a minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (after refill)"""
+        amount = min(amount, self.capacity)  # Oversized requests just need a full bucket
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate if self.rate > 0 else float("inf")
+
+    def consume(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def resize(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.level = min(self.level, self.capacity)
+
+class AdaptiveRateLimiter:
+    """
+    Client-side limiter for the OpenAI API, applied before each request:
+
+    - requests-per-minute and tokens-per-minute token buckets, kept in step
+      with the x-ratelimit-* response headers when OpenAI sends them
+    - an AIMD concurrency window: +1 slot per window of successes, halved
+      on a 429 (at most once per second, so one wave of 429s counts once)
+    - a shared pause after a 429 honouring retry-after, so every caller
+      backs off together instead of retrying in waves
+
+    All waiting is done with asyncio.sleep / asyncio.Condition.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 3500,
+        tokens_per_minute: int = 90_000,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        initial_concurrency: Optional[int] = None
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.window = float(initial_concurrency or self.max_concurrency)
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.throttled = 0  # Acquisitions that had to wait for budget
+        self.wait_seconds = 0.0
+        self.rate_limited = 0  # 429s reported by callers
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Hold a concurrency slot plus one request and `tokens` of budget for the duration of a call"""
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.window))
+            self.in_flight += 1
+        try:
+            await self._wait_for_budget(tokens)
+            yield
+        finally:
+            async with self.condition:
+                self.in_flight -= 1
+                self.condition.notify_all()
+
+    async def _wait_for_budget(self, tokens: int) -> None:
+        while True:
+            wait = self._try_consume(tokens)
+            if wait <= 0:
+                return
+            with self._lock:
+                self.throttled += 1
+                self.wait_seconds += wait
+            await asyncio.sleep(wait)
+
+    def _try_consume(self, tokens: int) -> float:
+        """Take one request and `tokens` if both are available now, else return the wait"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self.paused_until:
+                return self.paused_until - now
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait <= 0:
+                self.requests.consume(1)
+                self.tokens.consume(tokens)
+            return wait
+
+    def record_success(self) -> None:
+        """Additive increase: roughly one extra slot per window's worth of successes"""
+        with self._lock:
+            self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+
+    def record_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease, and pause everyone until retry-after has passed"""
+        now = time.monotonic()
+        with self._lock:
+            self.rate_limited += 1
+            if now - self._last_decrease >= 1.0:
+                self.window = max(float(self.min_concurrency), self.window / 2)
+                self._last_decrease = now
+                logger.warning(f"Rate limited - concurrency window reduced to {int(self.window)}")
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Sync the buckets with OpenAI's view: limits resize them, and the
+        remaining counts cap their level (they never raise it, since other
+        clients sharing the key may be spending too)
+        """
+        now = time.monotonic()
+        with self._lock:
+            for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+                limit = _header_number(headers, f"x-ratelimit-limit-{kind}")
+                if limit and limit != bucket.capacity:
+                    bucket.refill(now)
+                    bucket.resize(limit)
+                remaining = _header_number(headers, f"x-ratelimit-remaining-{kind}")
+                if remaining is not None:
+                    bucket.refill(now)
+                    bucket.level = min(bucket.level, remaining)
+
+    def retry_after(self, headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        """Seconds to wait after a 429, from the retry-after headers if present"""
+        if not headers:
+            return None
+        milliseconds = parse_duration(headers.get("retry-after-ms"))
+        if milliseconds is not None:
+            return milliseconds / 1000
+        return parse_duration(headers.get("retry-after"))
+
+    def get_status(self) -> Dict:
+        now = time.monotonic()
+        with self._lock:
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            return {
+                "concurrency_window": int(self.window),
+                "in_flight": self.in_flight,
+                "requests_available": int(self.requests.level),
+                "requests_per_minute": int(self.requests.capacity),
+                "tokens_available": int(self.tokens.level),
+                "tokens_per_minute": int(self.tokens.capacity),
+                "paused_for": round(max(0.0, self.paused_until - now), 3),
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "rate_limited": self.rate_limited
+            }
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    Request coalescing for async work: while a call for a key is in flight,
+    identical calls wait for it and receive the same result (or exception)
+    instead of doing the work again.
+    """
+
+    def __init__(self, name: str = "single-flight"):
+        self.name = name
+        self.shared_calls = 0  # Calls that joined an existing flight
+        self._flights: Dict[str, "asyncio.Future"] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.shared_calls += 1
+            logger.debug(f"{self.name}: joining in-flight call for {key}")
+        else:
+            flight = asyncio.ensure_future(fn())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._forget(key, done))
+
+        # Shield so one cancelled waiter doesn't cancel the work for the others
+        return await asyncio.shield(flight)
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: str, flight: "asyncio.Future"):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Retrieve the exception so a flight nobody awaits doesn't log a warning
+        if not flight.cancelled():
+            flight.exception()
@@ -0,0 +1,258 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class StateBusyError(Exception):
+    """Another process held the state store's write lock for longer than we wait"""
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+class StateStore(ABC):
+    """
+    Bookkeeping shared by everything that spends money on an article:
+    daily spend, already-processed articles and in-flight claims.
+
+    The in-memory store is per process. The SQLite store shares one file
+    between processes, so `uvicorn --workers N` keeps a single budget and
+    never summarizes the same article in two workers at once.
+    """
+
+    @abstractmethod
+    def add_spend(self, day: str, amount: float) -> float:
+        """Add to a day's spend and return the new total"""
+
+    @abstractmethod
+    def get_spend(self, day: str) -> float:
+        """Total spend recorded for a day"""
+
+    @abstractmethod
+    def mark_processed(self, day: str, key: str) -> None:
+        """Remember that an article was processed on a given day"""
+
+    @abstractmethod
+    def is_processed(self, day: str, key: str) -> bool:
+        """Was this article already processed on the given day?"""
+
+    @abstractmethod
+    def try_claim(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        """
+        Atomically claim a key for ttl_seconds. Fails if another owner holds
+        an unexpired claim; expired claims are taken over.
+        """
+
+    @abstractmethod
+    def release_claim(self, key: str, owner: str) -> None:
+        """Release a claim, if it is still held by owner"""
+
+    @abstractmethod
+    def is_claimed(self, key: str) -> bool:
+        """Is there an unexpired claim on this key?"""
+
+    def prune(self, today: str) -> None:
+        """Drop bookkeeping from previous days and expired claims"""
+
+class InMemoryStateStore(StateStore):
+    """Process-local state store - the default for a single worker"""
+
+    def __init__(self):
+        self._spend: Dict[str, float] = {}
+        self._processed: Dict[str, str] = {}  # key -> day
+        self._claims: Dict[str, Tuple[str, float]] = {}  # key -> (owner, expires_at)
+        self._lock = threading.Lock()
+
+    def add_spend(self, day: str, amount: float) -> float:
+        with self._lock:
+            # Only today's total matters - drop older days as we go
+            total = self._spend.get(day, 0.0) + amount
+            self._spend = {day: total}
+            return total
+
+    def get_spend(self, day: str) -> float:
+        with self._lock:
+            return self._spend.get(day, 0.0)
+
+    def mark_processed(self, day: str, key: str) -> None:
+        with self._lock:
+            self._processed[key] = day
+
+    def is_processed(self, day: str, key: str) -> bool:
+        with self._lock:
+            if self._processed.get(key) == day:
+                return True
+            if key in self._processed:
+                del self._processed[key]  # Processed on an earlier day
+            return False
+
+    def try_claim(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            holder = self._claims.get(key)
+            if holder is not None and holder[0] != owner and holder[1] > now:
+                return False
+            self._claims[key] = (owner, now + ttl_seconds)
+            return True
+
+    def release_claim(self, key: str, owner: str) -> None:
+        with self._lock:
+            holder = self._claims.get(key)
+            if holder is not None and holder[0] == owner:
+                del self._claims[key]
+
+    def is_claimed(self, key: str) -> bool:
+        with self._lock:
+            holder = self._claims.get(key)
+            return holder is not None and holder[1] > time.time()
+
+    def prune(self, today: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._processed = {key: day for key, day in self._processed.items() if day == today}
+            self._claims = {key: claim for key, claim in self._claims.items() if claim[1] > now}
+
+class SQLiteStateStore(StateStore):
+    """
+    Cross-process state store in a shared SQLite file (WAL mode). Claims use
+    an IMMEDIATE transaction so only one process can take a key at a time.
+
+    It is called straight from the event loop, so it never waits long for
+    another process's write lock: after lock_timeout a contended claim
+    counts as taken elsewhere, spend is kept here and added with the next
+    write that gets through, and other bookkeeping writes are skipped
+    (they are hints - claims expire, and summaries are cached anyway).
+    """
+
+    def __init__(self, path: str, lock_timeout: float = 0.1):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._unflushed_spend: Dict[str, float] = {}  # day -> spend not yet written (file was locked)
+        # Autocommit mode - transactions are opened explicitly where needed.
+        # Schema setup may wait longer; it only runs at startup.
+        self._conn = sqlite3.connect(path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS spend (day TEXT PRIMARY KEY, amount REAL NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed (key TEXT PRIMARY KEY, day TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS claims (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"PRAGMA busy_timeout = {int(lock_timeout * 1000)}")
+
+    def add_spend(self, day: str, amount: float) -> float:
+        with self._lock:
+            pending = self._unflushed_spend.pop(day, 0.0) + amount
+
+            def write() -> float:
+                self._conn.execute(
+                    "INSERT INTO spend (day, amount) VALUES (?, ?)"
+                    " ON CONFLICT(day) DO UPDATE SET amount = amount + excluded.amount",
+                    (day, pending)
+                )
+                return self._conn.execute("SELECT amount FROM spend WHERE day = ?", (day,)).fetchone()[0]
+
+            try:
+                return self._immediate(write)
+            except StateBusyError:
+                self._unflushed_spend = {day: pending}  # Earlier days no longer matter
+                logger.warning(f"State store busy - ${pending:.6f} of spend will be recorded with the next write")
+                return self._read_spend(day) + pending
+
+    def get_spend(self, day: str) -> float:
+        with self._lock:
+            return self._read_spend(day) + self._unflushed_spend.get(day, 0.0)
+
+    def mark_processed(self, day: str, key: str) -> None:
+        with self._lock:
+            self._write_if_free("INSERT OR REPLACE INTO processed (key, day) VALUES (?, ?)", (key, day))
+
+    def is_processed(self, day: str, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT day FROM processed WHERE key = ?", (key,)).fetchone()
+            return row is not None and row[0] == day
+
+    def try_claim(self, key: str, owner: str, ttl_seconds: float) -> bool:
+        now = time.time()
+
+        def claim() -> bool:
+            row = self._conn.execute(
+                "SELECT owner, expires_at FROM claims WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO claims (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, owner, now + ttl_seconds)
+            )
+            return True
+
+        with self._lock:
+            try:
+                return self._immediate(claim)
+            except StateBusyError:
+                return False  # Another process is busy writing - most likely claiming this very key
+
+    def release_claim(self, key: str, owner: str) -> None:
+        with self._lock:
+            self._write_if_free("DELETE FROM claims WHERE key = ? AND owner = ?", (key, owner))
+
+    def is_claimed(self, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT expires_at FROM claims WHERE key = ?", (key,)).fetchone()
+            return row is not None and row[0] > time.time()
+
+    def prune(self, today: str) -> None:
+        with self._lock:
+            self._write_if_free("DELETE FROM processed WHERE day != ?", (today,))
+            self._write_if_free("DELETE FROM spend WHERE day != ?", (today,))
+            self._write_if_free("DELETE FROM claims WHERE expires_at <= ?", (time.time(),))
+
+    def _read_spend(self, day: str) -> float:
+        row = self._conn.execute("SELECT amount FROM spend WHERE day = ?", (day,)).fetchone()
+        return row[0] if row else 0.0
+
+    def _immediate(self, work: Callable[[], T]) -> T:
+        """Run work in a write transaction; StateBusyError if the write lock can't be had in time"""
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if _is_busy(e):
+                raise StateBusyError(str(e)) from e
+            raise
+        try:
+            result = work()
+            self._conn.execute("COMMIT")
+            return result
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _write_if_free(self, sql: str, params: Tuple) -> None:
+        """A single autocommit write that is skipped, not waited for, while the file is locked"""
+        try:
+            self._conn.execute(sql, params)
+        except sqlite3.OperationalError as e:
+            if not _is_busy(e):
+                raise
+            logger.debug(f"State store busy - skipped: {sql}")
+
+def create_state_store(backend: str, path: str, lock_timeout: float = 0.1) -> StateStore:
+    """Build the configured state store ("memory" or "sqlite")"""
+    if backend == "memory":
+        return InMemoryStateStore()
+    if backend == "sqlite":
+        return SQLiteStateStore(path, lock_timeout=lock_timeout)
+    raise ValueError(f"Unknown state backend: {backend}")
@@ -1,90 +1,585 @@
+import asyncio
+import hashlib
+import json
 import logging
-from typing import Optional
-from openai import OpenAI
-from src.core.models import Article
+import os
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
+from src.core.models import ArticleRecord, Summary
 from src.config.settings import settings
-from src.core.cost_controller import CostController
+from src.core.cost_controller import CostController, SKIP_BUDGET
 from src.core.api_resilience import ResilienceManager
-from src.core.cache import TTLCache
+from src.core.rate_limiter import AdaptiveRateLimiter
+from src.core.circuit_breaker import create_breaker
+from src.core.cache import CacheBackend, LRUCache, SQLiteCache, TieredCache
+from src.core.state import create_state_store
+from src.core.single_flight import SingleFlight
+from src.core.tokens import TokenBudgeter
+from src.core.dedup import NearDuplicateIndex
+from src.core.keys import content_key
+from src.core.extractive import ExtractiveSummarizer
+from src.core import metrics
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_CACHE_REQUESTS = metrics.counter(
+    "summary_cache_requests_total", "Summary cache lookups by result", ["result"]
+)
+SUMMARIES_GENERATED = metrics.counter(
+    "summaries_generated_total", "Summaries produced, by how", ["source"]
+)
+SUMMARIZE_LATENCY = metrics.histogram(
+    "summarize_article_seconds", "Time to produce one article's summary, by result", ["result"]
+)
+
 class SmartSummarizer:
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        # OpenAI clients are created on first use - importing the SDK takes a
+        # few hundred milliseconds, and cached or extractive summaries never need it
+        self._client: Optional["OpenAI"] = None
+        self._async_client: Optional["AsyncOpenAI"] = None
         self.model = settings.openai_model
         self.max_tokens = settings.max_tokens
-        self.cost_controller = CostController()
-        self.resilience = ResilienceManager()
-        self.cache = TTLCache(ttl_seconds=604800)  # 7 days
+        self.tokens = TokenBudgeter(self.model)
+        # Changes whenever the prompts change, invalidating cached summaries
+        self.prompt_version = hashlib.sha256(
+            (self._get_system_prompt() + self._build_summarization_prompt("")).encode("utf-8")
+        ).hexdigest()[:12]
+        self.state = create_state_store(
+            settings.state_backend,
+            os.path.join(settings.cache_dir, "state.sqlite3"),
+            lock_timeout=settings.state_lock_timeout
+        )
+        self.cost_controller = CostController(
+            daily_budget=settings.daily_budget,
+            state=self.state,
+            claim_ttl=settings.inflight_claim_ttl
+        )
+        self.rate_limiter = AdaptiveRateLimiter(
+            requests_per_minute=settings.openai_rpm_limit,
+            tokens_per_minute=settings.openai_tpm_limit,
+            max_concurrency=settings.openai_max_concurrency
+        ) if settings.openai_rate_limiter else None
+        self.resilience = ResilienceManager(
+            rate_limiter=self.rate_limiter,
+            breaker=create_breaker("openai")
+        )
+        self.cache = self._build_cache()
+        self._flights = SingleFlight("summary")
+        self.near_duplicates = NearDuplicateIndex(
+            threshold=settings.near_duplicate_threshold,
+            max_entries=settings.near_duplicate_max_entries
+        ) if settings.near_duplicate_detection else None
+        self.extractive = ExtractiveSummarizer(
+            max_sentences=settings.extractive_max_sentences
+        ) if settings.extractive_fallback else None
+        self.extractive_count = 0
+    
+    @property
+    def client(self) -> "OpenAI":
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(**self._client_options())
+        return self._client
+    
+    @client.setter
+    def client(self, client: "OpenAI"):
+        self._client = client
+    
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(**self._client_options())
+        return self._async_client
+    
+    @async_client.setter
+    def async_client(self, client: "AsyncOpenAI"):
+        self._async_client = client
+    
+    def _client_options(self) -> dict:
+        # No SDK retries: 429s and 5xx must reach the ResilienceManager, the
+        # rate limiter and the breaker, instead of being slept on in the SDK
+        return {
+            "api_key": settings.openai_api_key,
+            "base_url": settings.openai_base_url,
+            "max_retries": 0,
+            "timeout": settings.openai_timeout
+        }
         
-    def summarize_article(self, article: Article) -> Optional[str]:
+    def summarize_article(self, article: ArticleRecord) -> Optional[Summary]:
+        """
+        Enhanced summarization with cost control, quality checks, AND resilience.
+        Falls back to an extractive summary when the LLM can't be used.
+        """
+        key = self.summary_key(article)
+        text = self._summarize_article_sync(article, key)
+        if text is None:
+            return self._fallback_summary(article)
+        return Summary(text)
+    
+    def _summarize_article_sync(self, article: ArticleRecord, key: str) -> Optional[str]:        
         # First, check the cache
-        cached_summary = self.cache.get(article.url)
+        cached_summary = self._get_cached_summary(article, key)
         if cached_summary is not None:
-            logger.info(f"Cache hit for article: {article.title[:50]}...")
             return cached_summary
-
-        """
-        Enhanced summarization with cost control, quality checks, AND resilience
-        """
+        
         # Cost control decision
-        if not self.cost_controller.should_process_article(article):
+        if not self.cost_controller.reserve_article(article, key):
             return None
             
+        reserved = 0.0
         try:
-            content = self._prepare_content(article)
-            prompt = self._build_summarization_prompt(content)
-            
             logger.info(f"Summarizing article: {article.title[:50]}...")
+            request = self._build_completion_request(article)
+            
+            # Refuse up front if this call could push us over budget
+            reserved = self._reserve_request_budget(request)
+            if reserved is None:
+                return None
             
             # Use the resilience manager to execute with retry logic
             def make_api_call():
-                return self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {
-                            "role": "system", 
-                            "content": self._get_system_prompt()
-                        },
-                        {
-                            "role": "user", 
-                            "content": prompt
-                        }
-                    ],
-                    max_tokens=self.max_tokens,
-                    temperature=0.3
-                )
+                return self.client.chat.completions.create(**request)
             
             response = self.resilience.execute_with_retry(make_api_call)
+            return self._handle_response(article, key, response, reserved)
+            
+        except Exception as e:
+            logger.error(f"Summarization failed for '{article.title}': {str(e)}")
+            self.cost_controller.release_budget(reserved or 0.0)
+            return None
+        finally:
+            self.cost_controller.release_article(article, key)
+    
+    async def summarize_article_async(self, article: ArticleRecord) -> Optional[Summary]:
+        """
+        Non-blocking variant of summarize_article for use inside async handlers.
+        Concurrent calls for the same article share one LLM request.
+        """
+        started = time.perf_counter()
+        key = self.summary_key(article)
+        cached_summary = self._get_cached_summary(article, key)
+        if cached_summary is not None:
+            SUMMARIZE_LATENCY.labels(result="cached").observe(time.perf_counter() - started)
+            return Summary(cached_summary)
+        
+        text = await self._flights.do(key, lambda: self._summarize_uncached(article, key))
+        if text is not None:
+            summary = Summary(text)
+            result = "generated"
+        else:
+            summary = self._fallback_summary(article)
+            result = "extractive" if summary else "skipped"
+        SUMMARIZE_LATENCY.labels(result=result).observe(time.perf_counter() - started)
+        return summary
+    
+    async def _summarize_uncached(self, article: ArticleRecord, key: str) -> Optional[str]:
+        cached_summary = self._get_cached_summary(article, key, count=False)
+        if cached_summary is not None:
+            return cached_summary
+        
+        if not self.cost_controller.reserve_article(article, key):
+            if self.cost_controller.is_in_flight(article, key):
+                # Another request or worker is already paying for this one
+                return await self._wait_for_peer_summary(article, key)
+            return None
+        
+        try:
+            return await self._summarize_reserved(article, key)
+        finally:
+            self.cost_controller.release_article(article, key)
+    
+    async def _summarize_reserved(self, article: ArticleRecord, key: str) -> Optional[str]:
+        """Single-article LLM call for an article we already hold a claim on"""
+        reserved = 0.0
+        try:
+            logger.info(f"Summarizing article: {article.title[:50]}...")
+            request = self._build_completion_request(article)
             
-            if response is None:  # All retries failed
+            reserved = self._reserve_request_budget(request)
+            if reserved is None:
                 return None
-                
-            summary = response.choices[0].message.content.strip()
-
-
-
-            if summary is not None:
-                self.cache.set(article.url, summary)
-
-
             
-            # Record cost for this request
+            response = await self.resilience.execute_with_retry_async(
+                lambda: self._create_completion(request),
+                tokens=self._request_tokens(request)
+            )
+            return self._handle_response(article, key, response, reserved)
+            
+        except Exception as e:
+            logger.error(f"Summarization failed for '{article.title}': {str(e)}")
+            self.cost_controller.release_budget(reserved or 0.0)
+            return None
+    
+    async def summarize_articles(
+        self, articles: List[ArticleRecord], max_concurrency: Optional[int] = None
+    ) -> List[Optional[Summary]]:
+        """
+        Summarize a batch of articles concurrently, bounded by max_concurrency.
+        Results are returned in the same order as the input articles.
+        """
+        limit = max_concurrency or settings.summarize_concurrency
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        if settings.batch_summarization and len(articles) > 1:
+            return await self._summarize_articles_batched(articles, semaphore)
+        
+        async def summarize_bounded(article: ArticleRecord) -> Optional[Summary]:
+            async with semaphore:
+                return await self.summarize_article_async(article)
+        
+        return list(await asyncio.gather(*(summarize_bounded(a) for a in articles)))
+    
+    async def iter_summaries(
+        self, articles: List[ArticleRecord], max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, Optional[Summary]]]:
+        """
+        Yield (index, summary) pairs as soon as each summary is ready, for
+        streaming responses. Always summarizes article by article, so the
+        first result doesn't wait on a whole batch.
+        """
+        limit = max_concurrency or settings.summarize_concurrency
+        semaphore = asyncio.Semaphore(max(1, limit))
+        
+        async def summarize_indexed(index: int, article: ArticleRecord) -> Tuple[int, Optional[Summary]]:
+            async with semaphore:
+                return index, await self.summarize_article_async(article)
+        
+        tasks = [
+            asyncio.ensure_future(summarize_indexed(index, article))
+            for index, article in enumerate(articles)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client went away - stop waiting (shared in-flight work carries on)
+            for task in tasks:
+                task.cancel()
+    
+    async def _summarize_articles_batched(
+        self, articles: List[ArticleRecord], semaphore: asyncio.Semaphore
+    ) -> List[Optional[Summary]]:
+        """
+        Batch mode: pack the articles we have to pay for into as few chat
+        completions as the token budget allows, sharing one copy of the
+        system prompt and instructions per request
+        """
+        results: List[Optional[str]] = [None] * len(articles)
+        keys = [self.summary_key(article) for article in articles]
+        pending: List[int] = []  # Indexes we reserved and must summarize
+        waiting: List[int] = []  # Indexes someone else is summarizing
+        duplicates: Dict[int, int] = {}  # Repeated article index -> first index
+        first_index_by_key: Dict[str, int] = {}
+        
+        for index, (article, key) in enumerate(zip(articles, keys)):
+            if key in first_index_by_key:
+                duplicates[index] = first_index_by_key[key]
+                continue
+            first_index_by_key[key] = index
+            
+            cached_summary = self._get_cached_summary(article, key)
+            if cached_summary is not None:
+                results[index] = cached_summary
+            elif self.cost_controller.reserve_article(article, key):
+                pending.append(index)
+            elif self.cost_controller.is_in_flight(article, key):
+                waiting.append(index)
+        
+        async def run_batch(indexes: List[int]):
+            async with semaphore:
+                summaries = await self._summarize_batch(
+                    [articles[i] for i in indexes],
+                    [keys[i] for i in indexes]
+                )
+            for i, summary in zip(indexes, summaries):
+                results[i] = summary
+        
+        try:
+            batches = self._pack_batches([articles[i] for i in pending])
+            await asyncio.gather(*(
+                run_batch([pending[position] for position in batch])
+                for batch in batches
+            ))
+        finally:
+            for i in pending:
+                self.cost_controller.release_article(articles[i], keys[i])
+        
+        async def wait_for(index: int):
+            results[index] = await self._wait_for_peer_summary(articles[index], keys[index])
+        
+        await asyncio.gather(*(wait_for(i) for i in waiting))
+        
+        summaries: List[Optional[Summary]] = [None] * len(articles)
+        for index, text in enumerate(results):
+            if text is not None:
+                summaries[index] = Summary(text)
+            elif index not in duplicates:
+                summaries[index] = self._fallback_summary(articles[index])
+        
+        for index, first_index in duplicates.items():
+            summaries[index] = summaries[first_index]
+        return summaries
+    
+    async def _summarize_batch(self, articles: List[ArticleRecord], keys: List[str]) -> List[Optional[str]]:
+        """
+        Summarize reserved articles in one request. Articles whose summary
+        can't be parsed back out fall back to single-article calls.
+        """
+        if len(articles) == 1:
+            return [await self._summarize_reserved(articles[0], keys[0])]
+        
+        summaries: List[Optional[str]] = [None] * len(articles)
+        reserved = 0.0
+        try:
+            logger.info(f"Summarizing batch of {len(articles)} articles")
+            request = self._build_batch_request(articles)
+            
+            reserved = self._reserve_request_budget(request)
+            if reserved is None:
+                return summaries
+            
+            response = await self.resilience.execute_with_retry_async(
+                lambda: self._create_completion(request),
+                tokens=self._request_tokens(request)
+            )
+            if response is None:  # All retries failed - single calls would too
+                self.cost_controller.release_budget(reserved)
+                return summaries
+            
+            content = response.choices[0].message.content or ""
             if response.usage:
                 self.cost_controller.record_usage(
                     response.usage.prompt_tokens,
-                    response.usage.completion_tokens
+                    response.usage.completion_tokens,
+                    reserved
                 )
-            
-            # Mark as processed
-            self.cost_controller.processed_urls.add(article.url)
-            
-            return summary
+            reserved = 0.0  # Settled - the estimate stands if usage was missing
+            summaries = self._parse_batch_summaries(content, len(articles))
             
         except Exception as e:
-            logger.error(f"Summarization failed for '{article.title}': {str(e)}")
+            logger.error(f"Batch summarization failed, falling back to single calls: {str(e)}")
+            self.cost_controller.release_budget(reserved)
+        
+        fallbacks = []
+        for index, (article, key, summary) in enumerate(zip(articles, keys, summaries)):
+            if summary:
+                self._store_summary(article, key, summary)
+                self.cost_controller.mark_processed(article, key)
+                SUMMARIES_GENERATED.labels(source="llm_batch").inc()
+            else:
+                fallbacks.append(index)
+        
+        if fallbacks:
+            logger.warning(f"{len(fallbacks)}/{len(articles)} batch summaries unusable - retrying individually")
+            retried = await asyncio.gather(*(self._summarize_reserved(articles[i], keys[i]) for i in fallbacks))
+            for index, summary in zip(fallbacks, retried):
+                summaries[index] = summary
+        
+        return summaries
+    
+    def _pack_batches(self, articles: List[ArticleRecord]) -> List[List[int]]:
+        """
+        Greedily pack articles into batches within the article and token
+        limits. Returns lists of positions into `articles`.
+        """
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        
+        for position, article in enumerate(articles):
+            tokens = self.tokens.count(self._prepare_content(article))
+            if current and (
+                len(current) >= settings.batch_max_articles
+                or current_tokens + tokens > settings.batch_max_input_tokens
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(position)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _create_completion(self, request: dict):
+        """Async chat completion; feeds the rate-limit headers to the limiter"""
+        if self.rate_limiter is None:
+            return await self.async_client.chat.completions.create(**request)
+        
+        raw_response = await self.async_client.chat.completions.with_raw_response.create(**request)
+        self.rate_limiter.update_from_headers(raw_response.headers)
+        return raw_response.parse()
+    
+    def _request_tokens(self, request: dict) -> int:
+        """What a request counts against the tokens-per-minute limit: prompt plus max completion"""
+        return self.tokens.count_messages(request["messages"]) + request["max_tokens"]
+    
+    def _reserve_request_budget(self, request: dict) -> Optional[float]:
+        """Reserve the worst-case cost of a completion request with the CostController"""
+        prompt_tokens = self.tokens.count_messages(request["messages"])
+        return self.cost_controller.reserve_budget(prompt_tokens, request["max_tokens"])
+    
+    async def _wait_for_peer_summary(
+        self, article: ArticleRecord, key: str, poll_interval: float = 0.25
+    ) -> Optional[str]:
+        """
+        Poll the (shared) cache until whoever holds the in-flight claim
+        publishes the summary, the claim goes away, or we time out
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.inflight_wait_timeout
+        
+        while loop.time() < deadline:
+            await asyncio.sleep(poll_interval)
+            summary = self.cache.get(key)
+            if summary is not None:
+                return summary
+            if not self.cost_controller.is_in_flight(article, key):
+                return self.cache.get(key)  # Finished - or failed
+        
+        logger.warning(f"Timed out waiting for in-flight summary: {article.title[:50]}...")
+        return None
+    
+    def _fallback_summary(self, article: ArticleRecord) -> Optional[Summary]:
+        """
+        Degraded mode: an article worth summarizing got no LLM summary (budget
+        exhausted, circuit open, call failed), so pick its key sentences
+        locally instead of dropping it from the digest. Not cached, so the
+        LLM summary replaces it once the LLM is usable again.
+        """
+        if self.extractive is None or not self.cost_controller.is_article_quality(article):
             return None
+        
+        text = " ".join(part for part in (article.description, article.content) if part)
+        summary = self.extractive.summarize(article.title, text)
+        if not summary:
+            return None
+        self.extractive_count += 1
+        SUMMARIES_GENERATED.labels(source="extractive").inc()
+        logger.info(f"Extractive fallback ({self._degraded_reason()}) for article: {article.title[:50]}...")
+        return Summary(summary, "extractive")
+    
+    def _degraded_reason(self) -> str:
+        if self.resilience.breaker.is_open:
+            return "circuit_open"
+        if self.cost_controller.budget_exhausted:
+            return SKIP_BUDGET
+        return "llm_unavailable"
+    
+    def _build_cache(self) -> CacheBackend:
+        """Bounded LRU in memory, warm-started from the on-disk tier if enabled"""
+        memory = LRUCache(
+            ttl_seconds=settings.summary_cache_ttl,
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes
+        )
+        if not settings.cache_persistent:
+            return memory
+        
+        try:
+            persistent = SQLiteCache(
+                os.path.join(settings.cache_dir, "summaries.sqlite3"),
+                ttl_seconds=settings.summary_cache_ttl
+            )
+            persistent.prune(settings.cache_persistent_max_entries)
+        except Exception as e:
+            logger.error(f"Persistent summary cache unavailable, using memory only: {str(e)}")
+            return memory
+        
+        cache = TieredCache(
+            memory,
+            persistent,
+            max_persistent_entries=settings.cache_persistent_max_entries,
+            maintenance_interval=settings.cache_maintenance_interval
+        )
+        cache.warm_start(min(settings.cache_warm_start_entries, settings.cache_max_entries))
+        return cache
+    
+    def summary_key(self, article: ArticleRecord) -> str:
+        """
+        Cache/claim key for an article's summary: a hash of exactly what we
+        send to the LLM plus the model and prompt version. Tracking-parameter
+        and AMP variants of a URL share it; an edited article doesn't.
+        """
+        return content_key(self._prepare_content(article), self.model, self.prompt_version)
+    
+    def _get_cached_summary(self, article: ArticleRecord, key: str, count: bool = True) -> Optional[str]:
+        """Cached summary for the article or a near-duplicate of it; `count` records the lookup in metrics"""
+        cached_summary = self.cache.get(key)
+        if cached_summary is not None:
+            logger.info(f"Cache hit for article: {article.title[:50]}...")
+            if count:
+                SUMMARY_CACHE_REQUESTS.labels(result="hit").inc()
+            return cached_summary
+        
+        # Syndicated copies of a story we've already summarized reuse its summary
+        if self.near_duplicates is not None:
+            cluster_key = self.near_duplicates.find(article)
+            if cluster_key is not None:
+                cached_summary = self.cache.get(cluster_key)
+                if cached_summary is not None:
+                    logger.info(f"Near-duplicate hit for article: {article.title[:50]}...")
+                    self.cache.set(key, cached_summary)
+        if count:
+            SUMMARY_CACHE_REQUESTS.labels(result="near_duplicate" if cached_summary else "miss").inc()
+        return cached_summary
+    
+    def _store_summary(self, article: ArticleRecord, key: str, summary: str):
+        """Cache a fresh summary and index the article for near-duplicate reuse"""
+        self.cache.set(key, summary)
+        if self.near_duplicates is not None:
+            self.near_duplicates.add(article, key)
+    
+    def _build_completion_request(self, article: ArticleRecord) -> dict:
+        """Chat completion arguments shared by the sync and async paths"""
+        content = self._prepare_content(article)
+        prompt = self._build_summarization_prompt(content)
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system", 
+                    "content": self._get_system_prompt()
+                },
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": 0.3
+        }
+    
+    def _handle_response(self, article: ArticleRecord, key: str, response, reserved: float = 0.0) -> Optional[str]:
+        """Cache the summary, record its cost and mark the article processed"""
+        if response is None:  # All retries failed
+            self.cost_controller.release_budget(reserved)
+            return None
+            
+        summary = response.choices[0].message.content.strip()
+        
+        if summary is not None:
+            self._store_summary(article, key, summary)
+            SUMMARIES_GENERATED.labels(source="llm").inc()
+        
+        # Record cost for this request - without usage data the reservation stands
+        if response.usage:
+            self.cost_controller.record_usage(
+                response.usage.prompt_tokens,
+                response.usage.completion_tokens,
+                reserved
+            )
+        
+        # Mark as processed
+        self.cost_controller.mark_processed(article, key)
+        
+        return summary
     
     def _get_system_prompt(self) -> str:
         """More sophisticated system prompt"""
@@ -95,7 +590,7 @@ class SmartSummarizer:
         - Avoid editorializing or adding opinions
         - Use clear, accessible language"""
     
-    def _prepare_content(self, article: Article) -> str:
+    def _prepare_content(self, article: ArticleRecord) -> str:
         """Smarter content preparation"""
         content_parts = []
         
@@ -104,29 +599,98 @@ class SmartSummarizer:
         if article.description:
             content_parts.append(f"DESCRIPTION: {article.description}")
         if article.content:
-            # Smarter truncation - preserve sentences
-            content = self._truncate_preserving_sentences(article.content, 2500)
+            # Token-accurate truncation - preserve sentences
+            content = self.tokens.truncate(article.content, settings.max_content_tokens)
             content_parts.append(f"CONTENT: {content}")
         
         return "\n\n".join(content_parts)
     
-    def _truncate_preserving_sentences(self, text: str, max_chars: int) -> str:
-        """Truncate text while preserving sentence boundaries"""
-        if len(text) <= max_chars:
-            return text
-            
-        # Find the last sentence end before max_chars
-        truncated = text[:max_chars]
-        last_period = truncated.rfind('.')
-        last_question = truncated.rfind('?')
-        last_exclamation = truncated.rfind('!')
+    def _build_batch_request(self, articles: List[ArticleRecord]) -> dict:
+        """One chat completion covering several articles"""
+        contents = [self._prepare_content(article) for article in articles]
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self._get_system_prompt()
+                },
+                {
+                    "role": "user",
+                    "content": self._build_batch_prompt(contents)
+                }
+            ],
+            "max_tokens": self.max_tokens * len(articles),
+            "temperature": 0.3
+        }
+    
+    def _build_batch_prompt(self, contents: List[str]) -> str:
+        """Instructions are sent once; each article is numbered so summaries can be matched back"""
+        articles_block = "\n\n".join(
+            f"ARTICLE {number}:\n{content}"
+            for number, content in enumerate(contents, start=1)
+        )
+        return f"""
+        Please analyze each of the following {len(contents)} news articles and provide a concise 2-3 sentence summary of each.
+        
+        Focus on:
+        - The main event or discovery
+        - Key facts and figures  
+        - Potential impact or significance
+        - Any notable quotes or statements
         
-        sentence_end = max(last_period, last_question, last_exclamation)
+        Write in clear, neutral journalistic style. Summarize every article independently.
         
-        if sentence_end > 0:
-            return text[:sentence_end + 1] + ".."
-        else:
-            return truncated + "..."
+        Respond with JSON only, in exactly this format:
+        {{"summaries": [{{"id": 1, "summary": "..."}}, {{"id": 2, "summary": "..."}}]}}
+        
+        {articles_block}
+        """
+    
+    def _parse_batch_summaries(self, text: str, count: int) -> List[Optional[str]]:
+        """
+        Pull per-article summaries out of a batch response. Anything missing,
+        duplicated or malformed comes back as None - an id answered twice is
+        ambiguous, so that article goes to the single-article fallback.
+        """
+        summaries: List[Optional[str]] = [None] * count
+        
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            logger.warning("Batch response contained no JSON object")
+            return summaries
+        
+        try:
+            payload = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as e:
+            logger.warning(f"Batch response was not valid JSON: {str(e)}")
+            return summaries
+        
+        items = payload.get("summaries") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            return summaries
+        
+        seen = set()
+        duplicated = set()
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            number, summary = item.get("id"), item.get("summary")
+            if isinstance(number, str) and number.isdigit():
+                number = int(number)
+            if not isinstance(number, int) or isinstance(number, bool) or not 1 <= number <= count:
+                continue
+            if number in seen:
+                duplicated.add(number)
+                continue
+            seen.add(number)
+            if isinstance(summary, str) and summary.strip():
+                summaries[number - 1] = summary.strip()
+        
+        for number in duplicated:
+            summaries[number - 1] = None
+        return summaries
     
     def _build_summarization_prompt(self, content: str) -> str:
         """More sophisticated prompt engineering"""
@@ -149,8 +713,14 @@ class SmartSummarizer:
     
     def get_cost_metrics(self):
         """Expose cost metrics for monitoring"""
-        return self.cost_controller.get_cost_metrics()
+        return {
+            **self.cost_controller.get_cost_metrics(),
+            "extractive_summaries": self.extractive_count
+        }
     
     def get_resilience_metrics(self):
         """Get resilience metrics for monitoring"""
-        return self.resilience.get_circuit_status()
\ No newline at end of file
+        metrics = self.resilience.get_circuit_status()
+        if self.rate_limiter is not None:
+            metrics["rate_limiter"] = self.rate_limiter.get_status()
+        return metrics
\ No newline at end of file
@@ -0,0 +1,90 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fixed overhead the chat format adds per message and per reply (OpenAI cookbook)
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)")
+
+@lru_cache(maxsize=8)
+def get_encoder(model: str):
+    """
+    Load (once per model) the tiktoken encoder. Returns None when tiktoken
+    or its BPE files are unavailable, e.g. offline - callers then fall back
+    to a character-based estimate.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed - using approximate token counts")
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoder for {model}, using approximate token counts: {str(e)}")
+        return None
+
+class TokenBudgeter:
+    """
+    Measures and trims text in model tokens rather than characters.
+    The encoder is shared per model and counts are memoized, since the same
+    system prompt and instructions are measured on every request.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.encoder = get_encoder(model)
+        self._count = lru_cache(maxsize=4096)(self._count_uncached)
+
+    @property
+    def exact(self) -> bool:
+        return self.encoder is not None
+
+    def count(self, text: str) -> int:
+        return self._count(text)
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Prompt tokens for a chat completion request"""
+        return sum(
+            TOKENS_PER_MESSAGE + self.count(message.get("content") or "")
+            for message in messages
+        ) + TOKENS_PER_REPLY
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Trim text to at most max_tokens, cutting back to the last sentence
+        boundary when there is one
+        """
+        if self.count(text) <= max_tokens:
+            return text
+
+        if self.encoder is not None:
+            truncated = self.encoder.decode(self.encoder.encode(text)[:max_tokens])
+        else:
+            truncated = text[:max_tokens * 4]
+
+        sentence_end = self._last_sentence_end(truncated)
+        if sentence_end is not None:
+            return truncated[:sentence_end + 1] + ".."
+        return truncated.rstrip() + "..."
+
+    def _count_uncached(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoder is not None:
+            return len(self.encoder.encode(text))
+        return len(text) // 4 + 1  # ~4 characters per token for English
+
+    def _last_sentence_end(self, text: str) -> Optional[int]:
+        last = None
+        for match in _SENTENCE_END.finditer(text):
+            last = match.start()
+        return last if last else None
@@ -1,55 +1,678 @@
-from fastapi import FastAPI
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Path, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Match
 from datetime import datetime
-from src.core.news_fetcher import NewsFetcher
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.core.models import (
+    ARTICLE_FIELDS, ArticleRecord, DigestJobRequest, JobPriority, NewsDigestResponse, UserProfile, normalize_topic
+)
+from src.core.news_fetcher import AsyncNewsFetcher
 from src.core.summarizer import SmartSummarizer
+from src.core.prewarm import PrewarmScheduler, TopicTracker
+from src.core.ranking import ArticleRanker
+from src.core.digests import DigestMaterializer, ProfileStore
+from src.core.jobs import Job, JobQueue, JobStatus, QueueFullError
+from src.core.lazy import LazyComponent
+from src.config.settings import settings
+from src.core import metrics
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Personalized News Digest")
+# Components are built on first use (or by the startup warm-up), not at
+# import: the app starts serving /health immediately, and importing it
+# doesn't need the API keys
+_news_fetcher = LazyComponent("news_fetcher", AsyncNewsFetcher)
+_summarizer = LazyComponent("summarizer", SmartSummarizer)
+_ranker = LazyComponent(
+    "ranker",
+    lambda: ArticleRanker(
+        title_weight=settings.ranking_title_weight,
+        interest_weight=settings.ranking_interest_weight
+    )
+)
+_topic_tracker = LazyComponent(
+    "topic_tracker",
+    lambda: TopicTracker(half_life_seconds=settings.prewarm_half_life_seconds)
+)
+_prewarm_scheduler = LazyComponent(
+    "prewarm_scheduler",
+    lambda: PrewarmScheduler(
+        _news_fetcher.get(),
+        _summarizer.get(),
+        _topic_tracker.get(),
+        ranker=_ranker.get(),
+        top_k=settings.digest_top_k,
+        interval_seconds=settings.prewarm_interval_seconds,
+        top_topics=settings.prewarm_top_topics,
+        budget_share=settings.prewarm_budget_share,
+        max_concurrency=settings.prewarm_concurrency,
+        submit_job=lambda topic: _submit_digest_job(topic, None, (), JobPriority.PREWARM)[0]
+    )
+)
+_profiles = LazyComponent(
+    "profiles",
+    lambda: ProfileStore(
+        os.path.join(settings.cache_dir, "profiles.sqlite3") if settings.profiles_persistent else None
+    )
+)
+_digests = LazyComponent(
+    "digests",
+    lambda: DigestMaterializer(
+        _news_fetcher.get(),
+        _summarizer.get(),
+        _ranker.get(),
+        _profiles.get(),
+        top_k=settings.digest_top_k,
+        refresh_seconds=settings.digest_refresh_seconds,
+        max_concurrency=settings.digest_refresh_concurrency
+    )
+)
+_jobs = LazyComponent(
+    "jobs",
+    lambda: JobQueue(
+        _run_digest_job,
+        workers=settings.job_workers,
+        max_queued=settings.job_max_queued,
+        background_share=settings.job_background_share,
+        result_ttl=settings.job_result_ttl_seconds
+    )
+)
+_COMPONENTS = (
+    _news_fetcher, _summarizer, _ranker, _topic_tracker, _prewarm_scheduler, _profiles, _digests, _jobs
+)
+
+# Dependency providers - sync, so FastAPI calls them in its threadpool and a
+# first-use build never blocks the event loop
+def get_news_fetcher() -> AsyncNewsFetcher:
+    return _news_fetcher.get()
+
+def get_summarizer() -> SmartSummarizer:
+    return _summarizer.get()
+
+def get_ranker() -> ArticleRanker:
+    return _ranker.get()
+
+def get_topic_tracker() -> TopicTracker:
+    return _topic_tracker.get()
 
-# Initialize components
-news_fetcher = NewsFetcher()
-summarizer = SmartSummarizer()
+def get_prewarm_scheduler() -> PrewarmScheduler:
+    return _prewarm_scheduler.get()
+
+def get_digests() -> DigestMaterializer:
+    return _digests.get()
+
+def get_jobs() -> JobQueue:
+    return _jobs.get()
+
+_startup: Dict[str, Optional[float]] = {
+    "import_seconds": None,  # Importing this module (FastAPI, our modules)
+    "serving_seconds": None,  # ...until the app accepts requests
+    "components_ready_seconds": None  # ...until the warm-up has built every component
+}
+
+def _build_components():
+    """Warm-up, on a worker thread: build every component and load the OpenAI SDK and NumPy"""
+    for component in _COMPONENTS:
+        component.get()
+    _summarizer.get().async_client
+    _ranker.get().score([], "")
+
+async def _warm_up():
+    try:
+        if not settings.warm_up_components:
+            return
+        await asyncio.to_thread(_build_components)
+        _startup["components_ready_seconds"] = time.perf_counter() - _IMPORT_STARTED
+        STARTUP_SECONDS.labels(phase="components_ready").set(_startup["components_ready_seconds"])
+        built = ", ".join(f"{c.name} {c.init_seconds * 1000:.0f}ms" for c in _COMPONENTS if c.init_seconds is not None)
+        logger.info(f"Components ready {_startup['components_ready_seconds'] * 1000:.0f}ms after import ({built})")
+        
+        if settings.prewarm_enabled:
+            _prewarm_scheduler.get().start()
+        if settings.digest_refresh_enabled:
+            _digests.get().start()
+    except Exception as e:
+        # e.g. missing API keys - /health keeps answering; requests retry the build
+        logger.error(f"Component warm-up failed: {str(e)}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _startup["serving_seconds"] = time.perf_counter() - _IMPORT_STARTED
+    STARTUP_SECONDS.labels(phase="serving").set(_startup["serving_seconds"])
+    logger.info(
+        f"Serving {_startup['serving_seconds'] * 1000:.0f}ms after import started "
+        f"(imports {_startup['import_seconds'] * 1000:.0f}ms)"
+    )
+    warm_up = asyncio.create_task(_warm_up())
+    yield
+    
+    warm_up.cancel()
+    prewarm_scheduler = _prewarm_scheduler.peek()
+    if prewarm_scheduler is not None:
+        await prewarm_scheduler.stop()
+    jobs = _jobs.peek()
+    if jobs is not None:
+        await jobs.stop()
+    digests = _digests.peek()
+    if digests is not None:
+        await digests.stop()
+    profiles = _profiles.peek()
+    if profiles is not None:
+        profiles.close()
+    news_fetcher = _news_fetcher.peek()
+    if news_fetcher is not None:
+        await news_fetcher.aclose()
+
+app = FastAPI(title="Personalized News Digest", lifespan=lifespan)
+
+GZIP_MIN_BYTES = 1024  # Below this compression costs more than it saves
+GZIP_LEVEL = 6  # Most of level 9's ratio on JSON at a fraction of the CPU
+
+class DigestGZipMiddleware(GZipMiddleware):
+    """
+    Gzip for responses over GZIP_MIN_BYTES, except streamed NDJSON: the
+    compressor holds small chunks back, so summaries would arrive in bursts
+    instead of one by one.
+    """
+    
+    uncompressed_routes = {"stream_news"}  # Route (endpoint) names
+    
+    def __init__(self, app):
+        super().__init__(app, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self._route_name(scope) in self.uncompressed_routes:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+    
+    def _route_name(self, scope) -> Optional[str]:
+        """The route the router will pick - middleware runs before routing sets scope["route"]"""
+        for route in app.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.name
+        return None
+
+app.add_middleware(DigestGZipMiddleware)
+
+HTTP_LATENCY = metrics.histogram(
+    "http_request_seconds", "API request latency (until response headers), by route", ["route", "status"]
+)
+HTTP_IN_FLIGHT = metrics.gauge("http_requests_in_flight", "API requests currently being handled")
+DIGEST_STAGE_LATENCY = metrics.histogram(
+    "digest_stage_seconds", "Time spent in each stage of building a digest", ["stage"]
+)
+TOPIC_REQUESTS = metrics.counter(
+    "news_topic_requests_total", "Digest requests per topic", ["topic"], max_series=500
+)
+SUMMARY_CACHE_ENTRIES = metrics.gauge("summary_cache_entries", "Summaries held in the in-memory cache")
+SUMMARY_CACHE_BYTES = metrics.gauge("summary_cache_bytes", "Size of the in-memory summary cache")
+SUMMARY_CACHE_EVICTIONS = metrics.counter("summary_cache_evictions_total", "Summaries evicted from the in-memory cache")
+CIRCUIT_STATE = metrics.gauge(
+    "circuit_breaker_state", "1 for each upstream's current circuit state", ["upstream", "state"]
+)
+CIRCUIT_TRANSITIONS = metrics.counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes", ["upstream", "transition"]
+)
+LLM_SPEND = metrics.gauge("llm_daily_spend_dollars", "LLM spend so far today")
+LLM_BUDGET = metrics.gauge("llm_daily_budget_dollars", "Daily LLM budget")
+OPENAI_WINDOW = metrics.gauge("openai_concurrency_window", "Adaptive OpenAI concurrency limit")
+STARTUP_SECONDS = metrics.gauge(
+    "startup_seconds", "Seconds from the start of importing the app to each startup phase", ["phase"]
+)
+
+def _collect_component_metrics():
+    """Copy state the components already track into the registry, on scrape"""
+    summarizer, news_fetcher = _summarizer.peek(), _news_fetcher.peek()
+    if summarizer is None or news_fetcher is None:
+        return  # Still starting up - don't build components for a scrape
+    
+    if hasattr(summarizer.cache, "stats"):
+        cache_stats = summarizer.cache.stats()
+        SUMMARY_CACHE_ENTRIES.set(cache_stats["entries"])
+        SUMMARY_CACHE_BYTES.set(cache_stats["bytes"])
+        SUMMARY_CACHE_EVICTIONS.set_total(cache_stats["evictions"])
+    
+    for breaker in (summarizer.resilience.breaker, news_fetcher.breaker):
+        status = breaker.get_status()
+        for state in ("closed", "open", "half_open"):
+            CIRCUIT_STATE.labels(upstream=breaker.name, state=state).set(1 if status["state"] == state else 0)
+        for transition, count in status["transitions"].items():
+            CIRCUIT_TRANSITIONS.set_total(count, upstream=breaker.name, transition=transition)
+    
+    LLM_SPEND.set(summarizer.cost_controller.daily_spent)
+    LLM_BUDGET.set(summarizer.cost_controller.daily_budget)
+    if summarizer.rate_limiter is not None:
+        OPENAI_WINDOW.set(int(summarizer.rate_limiter.window))
+
+metrics.REGISTRY.on_collect(_collect_component_metrics)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        with HTTP_IN_FLIGHT.track_inprogress():
+            response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Route template (/news/{topic}), not the raw path, to keep label cardinality bounded
+        route = request.scope.get("route")
+        HTTP_LATENCY.labels(
+            route=getattr(route, "path", "unmatched"),
+            status=status
+        ).observe(time.perf_counter() - started)
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "News Digest API is running"}
+    """Liveness - answers as soon as the app is serving, without building components"""
+    return {
+        "status": "healthy",
+        "message": "News Digest API is running",
+        "components_ready": all(component.ready for component in _COMPONENTS)
+    }
 
-@app.get("/news/{topic}")
-async def get_news(topic: str):
+DIGEST_FIELDS = ("ai_summary", "relevance")  # Added by the digest, not stored on the article
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated article fields to return, e.g. title,url,ai_summary "
+                f"(available: {', '.join(ARTICLE_FIELDS + DIGEST_FIELDS)})"
+)
+TOP_K_QUERY = Query(
+    None,
+    ge=1,
+    description="Number of most relevant articles to summarize (default and cap set in settings)"
+)
+INTERESTS_QUERY = Query(
+    None,
+    description="Comma-separated reader interests to rank by, in addition to the topic"
+)
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate the ?fields= selection; None means every field"""
+    if not fields:
+        return None
+    selected = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in ARTICLE_FIELDS and name not in DIGEST_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown article fields: {', '.join(unknown)}")
+    return selected or None
+
+def _rank_candidates(
+    candidates: List[ArticleRecord],
+    topic: str,
+    interests: Optional[str],
+    top_k: Optional[int],
+    ranker: ArticleRanker,
+    summarizer: SmartSummarizer
+) -> List[Tuple[ArticleRecord, float]]:
+    """The top_k candidates most relevant to the topic and interests - only these get summarized"""
+    k = min(top_k or settings.digest_top_k, settings.digest_max_top_k)
+    interest_list = [interest.strip() for interest in (interests or "").split(",") if interest.strip()]
+    with DIGEST_STAGE_LATENCY.labels(stage="rank").time():
+        return ranker.top_k(
+            candidates, k, topic, interest_list,
+            eligible=summarizer.cost_controller.is_article_quality  # Junk would only be skipped later
+        )
+
+@app.get("/news/{topic}", responses={200: {"model": NewsDigestResponse}})
+async def get_news(
+    request: Request,
+    topic: str,
+    fields: Optional[str] = FIELDS_QUERY,
+    top_k: Optional[int] = TOP_K_QUERY,
+    interests: Optional[str] = INTERESTS_QUERY,
+    news_fetcher: AsyncNewsFetcher = Depends(get_news_fetcher),
+    summarizer: SmartSummarizer = Depends(get_summarizer),
+    ranker: ArticleRanker = Depends(get_ranker),
+    topic_tracker: TopicTracker = Depends(get_topic_tracker)
+):
     """
-    Enhanced endpoint with cost control and quality filtering
+    Enhanced endpoint with cost control and quality filtering.
+    Fetches a wide set of candidates, ranks them against the topic and
+    `interests`, and summarizes only the `top_k` most relevant.
+
+    Responses carry an ETag; send it back in If-None-Match to get a 304
+    instead of the same digest again.
     """
-    articles = news_fetcher.fetch_articles(topic)
+    selected = _parse_fields(fields)
+    _record_topic_request(topic_tracker, topic)
+    
+    digest = await _build_digest(topic, top_k, interests, selected, news_fetcher, summarizer, ranker)
+    render_started = time.perf_counter()
+    # Articles are already plain JSON-ready dicts - skip FastAPI's
+    # response validation / jsonable_encoder pass over every one of them.
+    # The ETag covers the whole body, cost_metrics included: a 304 always
+    # means the client's copy is exactly what we would have sent.
+    content = json.dumps(digest).encode("utf-8")
+    etag = _etag(content)
+    if _etag_matches(request, etag):
+        response = _not_modified(etag)
+    else:
+        response = _json_response(content, etag)
+    DIGEST_STAGE_LATENCY.labels(stage="render").observe(time.perf_counter() - render_started)
+    return response
+
+def _record_topic_request(topic_tracker: TopicTracker, topic: str) -> None:
+    """Count a reader's request for the topic; only the hottest topics get their own metric label"""
+    topic_tracker.record(topic)
+    label = normalize_topic(topic) if topic_tracker.is_hot(topic, settings.metrics_topic_labels) else "other"
+    TOPIC_REQUESTS.labels(topic=label).inc()
+
+def _etag(content: bytes) -> str:
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes don't matter"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+def _cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"private, max-age={settings.http_cache_max_age_seconds}"}
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=_cache_headers(etag))
+
+def _json_response(body: bytes, etag: str) -> Response:
+    return Response(content=body, media_type="application/json", headers=_cache_headers(etag))
+
+async def _build_digest(
+    topic: str,
+    top_k: Optional[int],
+    interests: Optional[str],
+    selected: Optional[List[str]],
+    news_fetcher: AsyncNewsFetcher,
+    summarizer: SmartSummarizer,
+    ranker: ArticleRanker
+) -> Dict:
+    """Fetch, rank and summarize one topic - the work behind /news/{topic} and digest jobs"""
+    article_fields = [name for name in selected if name not in DIGEST_FIELDS] if selected else None
+    include_summary = selected is None or "ai_summary" in selected
+    include_relevance = selected is None or "relevance" in selected
+    
+    with DIGEST_STAGE_LATENCY.labels(stage="fetch").time():
+        candidates = await news_fetcher.fetch_articles(topic)
+    ranked = _rank_candidates(candidates, topic, interests, top_k, ranker, summarizer)
+    articles = [article for article, _ in ranked]
+    with DIGEST_STAGE_LATENCY.labels(stage="summarize").time():
+        summaries = await summarizer.summarize_articles(articles)
     
     summarized_articles = []
     skipped_count = 0
+    extractive_count = 0
     
-    for article in articles:
-        summary = summarizer.summarize_article(article)
-        
+    for (article, relevance), summary in zip(ranked, summaries):
         if summary:
-            article_dict = article.dict()
-            article_dict["ai_summary"] = summary
+            article_dict = article.to_dict(article_fields)
+            if include_summary:
+                article_dict["ai_summary"] = summary.text
+                article_dict["summary_type"] = summary.kind
+            if include_relevance:
+                article_dict["relevance"] = round(relevance, 4)
+            if summary.kind == "extractive":
+                extractive_count += 1  # LLM unavailable or over budget - local fallback
             summarized_articles.append(article_dict)
         else:
             skipped_count += 1  # Track skipped articles
     
-    cost_metrics = summarizer.get_cost_metrics()
-    
     return {
         "topic": topic,
+        "candidate_count": len(candidates),
         "article_count": len(articles),
         "summarized_count": len(summarized_articles),
         "skipped_count": skipped_count,  # Articles skipped due to cost/quality
-        "cost_metrics": cost_metrics,
+        "extractive_count": extractive_count,
+        "cost_metrics": summarizer.get_cost_metrics(),
         "articles": summarized_articles
     }
 
+def _project_digest(digest: Dict, selected: Optional[List[str]]) -> Dict:
+    """Apply a ?fields= selection to a digest built with every field"""
+    if selected is None:
+        return digest
+    keep = set(selected)
+    if "ai_summary" in keep:
+        keep.add("summary_type")
+    return {
+        **digest,
+        "articles": [
+            {name: value for name, value in article.items() if name in keep}
+            for article in digest["articles"]
+        ]
+    }
+
+def _submit_digest_job(
+    topic: str, top_k: Optional[int], interests: Sequence[str], priority: JobPriority
+) -> Tuple[Job, bool]:
+    """Queue a digest build; identical requests still pending share one job"""
+    k = min(top_k or settings.digest_top_k, settings.digest_max_top_k)
+    interest_list = sorted({interest.strip().lower() for interest in interests if interest.strip()})
+    key = f"digest|{normalize_topic(topic)}|{k}|{','.join(interest_list)}"
+    params = {"topic": topic, "top_k": k, "interests": interest_list}
+    return _jobs.get().submit(key, params, priority)
+
+async def _run_digest_job(job: Job) -> Dict:
+    # Built off the event loop, like the dependency providers
+    news_fetcher = await asyncio.to_thread(_news_fetcher.get)
+    summarizer = await asyncio.to_thread(_summarizer.get)
+    ranker = await asyncio.to_thread(_ranker.get)
+    return await _build_digest(
+        job.params["topic"], job.params["top_k"], ",".join(job.params["interests"]), None,
+        news_fetcher, summarizer, ranker
+    )
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    job_request: DigestJobRequest,
+    jobs: JobQueue = Depends(get_jobs),
+    topic_tracker: TopicTracker = Depends(get_topic_tracker)
+):
+    """
+    Queue a digest build and return at once with a job id to poll. Identical
+    requests still pending share one job; when the queue is full the answer
+    is 429 with Retry-After.
+    """
+    try:
+        job, created = _submit_digest_job(
+            job_request.topic, job_request.top_k, job_request.interests, job_request.priority
+        )
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+    if job_request.priority == JobPriority.INTERACTIVE:
+        _record_topic_request(topic_tracker, job_request.topic)
+    
+    poll_url = f"/jobs/{job.id}"
+    return JSONResponse(
+        {**job.to_dict(), "deduplicated": not created, "poll_url": poll_url},
+        status_code=202,
+        headers={"Location": poll_url}
+    )
+
+@app.get("/jobs/{job_id}")
+async def get_job(
+    request: Request,
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to wait for the job to finish before answering"),
+    fields: Optional[str] = FIELDS_QUERY,
+    jobs: JobQueue = Depends(get_jobs)
+):
+    """
+    A job's status, with the digest under "result" once it has succeeded.
+    `wait` long-polls: the answer comes as soon as the job finishes, or
+    after `wait` seconds (capped in settings) with the job still pending.
+    """
+    selected = _parse_fields(fields)
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job '{job_id}'")
+    if wait and not job.finished:
+        await job.wait(min(wait, settings.job_max_wait_seconds))
+    
+    body = job.to_dict()
+    if not job.finished:
+        return JSONResponse(body)
+    if job.status == JobStatus.SUCCEEDED:
+        body["result"] = _project_digest(job.result, selected)
+    # A finished job never changes - repeat polls can be answered with a 304
+    content = json.dumps(body).encode("utf-8")
+    etag = _etag(content)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return _json_response(content, etag)
+
+@app.get("/news/{topic}/stream")
+async def stream_news(
+    topic: str,
+    fields: Optional[str] = FIELDS_QUERY,
+    top_k: Optional[int] = TOP_K_QUERY,
+    interests: Optional[str] = INTERESTS_QUERY,
+    news_fetcher: AsyncNewsFetcher = Depends(get_news_fetcher),
+    summarizer: SmartSummarizer = Depends(get_summarizer),
+    ranker: ArticleRanker = Depends(get_ranker),
+    topic_tracker: TopicTracker = Depends(get_topic_tracker)
+):
+    """
+    Streaming variant of /news/{topic} (NDJSON). Metadata for the top-ranked
+    articles is sent as soon as the fetch completes, then each summary as it
+    finishes:
+    
+        {"type": "meta", ...}
+        {"type": "article", "index": 0, "article": {...}}   (one per article)
+        {"type": "summary", "index": 3, "ai_summary": "...", "summary_type": "abstractive"}
+        {"type": "skipped", "index": 5}
+        {"type": "done", "summarized_count": ..., "skipped_count": ..., "cost_metrics": {...}}
+    
+    `fields`, `top_k` and `interests` work as for /news/{topic}.
+    """
+    selected = _parse_fields(fields)
+    article_fields = [name for name in selected if name not in DIGEST_FIELDS] if selected else None
+    include_relevance = selected is None or "relevance" in selected
+    
+    _record_topic_request(topic_tracker, topic)
+    with DIGEST_STAGE_LATENCY.labels(stage="fetch").time():
+        candidates = await news_fetcher.fetch_articles(topic)
+    ranked = _rank_candidates(candidates, topic, interests, top_k, ranker, summarizer)
+    articles = [article for article, _ in ranked]
+    
+    async def events():
+        yield _ndjson({
+            "type": "meta",
+            "topic": topic,
+            "candidate_count": len(candidates),
+            "article_count": len(articles)
+        })
+        for index, (article, relevance) in enumerate(ranked):
+            article_dict = article.to_dict(article_fields)
+            if include_relevance:
+                article_dict["relevance"] = round(relevance, 4)
+            yield _ndjson({"type": "article", "index": index, "article": article_dict})
+        
+        summarized_count = 0
+        skipped_count = 0
+        async for index, summary in summarizer.iter_summaries(articles):
+            if summary:
+                summarized_count += 1
+                yield _ndjson({
+                    "type": "summary",
+                    "index": index,
+                    "ai_summary": summary.text,
+                    "summary_type": summary.kind
+                })
+            else:
+                skipped_count += 1
+                yield _ndjson({"type": "skipped", "index": index})
+        
+        yield _ndjson({
+            "type": "done",
+            "summarized_count": summarized_count,
+            "skipped_count": skipped_count,
+            "cost_metrics": summarizer.get_cost_metrics()
+        })
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+def _ndjson(event: dict) -> str:
+    return json.dumps(event) + "\n"
+
+USER_ID_PATH = Path(..., min_length=1, max_length=64, pattern=r"^[A-Za-z0-9_.@-]+$")
+
+@app.put("/users/{user_id}/profile", response_model=UserProfile)
+async def put_profile(
+    profile: UserProfile,
+    user_id: str = USER_ID_PATH,
+    digests: DigestMaterializer = Depends(get_digests)
+):
+    """Create or replace a user's profile; their digest is rebuilt in the background"""
+    if len(profile.topics) > settings.profile_max_topics:
+        raise HTTPException(status_code=400, detail=f"At most {settings.profile_max_topics} topics per profile")
+    digests.set_profile(user_id, profile)
+    return profile
+
+@app.get("/users/{user_id}/profile", response_model=UserProfile)
+async def get_profile(user_id: str = USER_ID_PATH, digests: DigestMaterializer = Depends(get_digests)):
+    profile = digests.profiles.get(user_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile for user '{user_id}'")
+    return profile
+
+@app.delete("/users/{user_id}/profile")
+async def delete_profile(user_id: str = USER_ID_PATH, digests: DigestMaterializer = Depends(get_digests)):
+    if not digests.remove_profile(user_id):
+        raise HTTPException(status_code=404, detail=f"No profile for user '{user_id}'")
+    return {"deleted": user_id}
+
+@app.get("/digest/{user_id}")
+async def get_digest(
+    request: Request,
+    user_id: str = USER_ID_PATH,
+    digests: DigestMaterializer = Depends(get_digests)
+):
+    """
+    The user's multi-topic digest, served as precomputed JSON. It is kept up
+    to date in the background as topics are refreshed and summaries arrive;
+    only a brand-new subscription waits for its topics' first fetch. The
+    ETag changes only when the digest is rematerialized.
+    """
+    body = await digests.ensure_digest(user_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail=f"No profile for user '{user_id}'")
+    etag = _etag(body)
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+    return _json_response(body, etag)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus scrape endpoint (text exposition format)"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/cost-metrics")
-async def get_cost_metrics():
+async def get_cost_metrics(summarizer: SmartSummarizer = Depends(get_summarizer)):
     """Monitor our API spending"""
     return {
         **summarizer.get_cost_metrics(),
@@ -57,7 +680,13 @@ async def get_cost_metrics():
     }
 
 @app.get("/system-status")
-async def get_system_status():
+async def get_system_status(
+    news_fetcher: AsyncNewsFetcher = Depends(get_news_fetcher),
+    summarizer: SmartSummarizer = Depends(get_summarizer),
+    prewarm_scheduler: PrewarmScheduler = Depends(get_prewarm_scheduler),
+    digests: DigestMaterializer = Depends(get_digests),
+    jobs: JobQueue = Depends(get_jobs)
+):
     """Comprehensive system health and metrics"""
     cost_metrics = summarizer.get_cost_metrics()
     resilience_metrics = summarizer.get_resilience_metrics()
@@ -67,5 +696,25 @@ async def get_system_status():
         "timestamp": datetime.now().isoformat(),
         "cost_metrics": cost_metrics,
         "resilience_metrics": resilience_metrics,
+        "circuit_breakers": {
+            "openai": summarizer.resilience.breaker.get_status(),
+            "newsapi": news_fetcher.breaker.get_status()
+        },
+        "prewarm": prewarm_scheduler.get_status(),
+        "digests": digests.get_status(),
+        "jobs": jobs.get_status(),
+        "startup": _startup_report(),
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
+
+def _startup_report() -> Dict:
+    return {
+        **{phase: round(seconds, 3) if seconds is not None else None for phase, seconds in _startup.items()},
+        "component_init_seconds": {
+            component.name: round(component.init_seconds, 3)
+            for component in _COMPONENTS if component.init_seconds is not None
+        }
+    }
+
+_startup["import_seconds"] = time.perf_counter() - _IMPORT_STARTED
+STARTUP_SECONDS.labels(phase="imported").set(_startup["import_seconds"])
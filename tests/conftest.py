@@ -0,0 +1,6 @@
+import os
+
+# Settings are read lazily, but every component needs API keys to build -
+# these never reach a real API, the tests use mock transports
+os.environ.setdefault("NEWSAPI_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,57 @@
+import asyncio
+import httpx
+import pytest
+from openai import APIConnectionError, APITimeoutError, BadRequestError, InternalServerError
+from src.core.api_resilience import ResilienceManager
+from src.core.circuit_breaker import CircuitBreaker
+
+REQUEST = httpx.Request("POST", "https://api.openai.test/v1/chat/completions")
+
+def flaky(*errors):
+    """An API call that raises each error in turn, then succeeds"""
+    remaining = list(errors)
+    calls = []
+
+    def call():
+        calls.append(1)
+        if remaining:
+            raise remaining.pop(0)
+        return "ok"
+
+    return call, calls
+
+def manager(max_retries: int = 3) -> ResilienceManager:
+    return ResilienceManager(max_retries=max_retries, base_delay=0.0, breaker=CircuitBreaker("test", min_calls=100))
+
+@pytest.mark.parametrize("error", [
+    APIConnectionError(request=REQUEST),
+    APITimeoutError(request=REQUEST),
+    httpx.ConnectError("connection refused"),
+    InternalServerError("boom", response=httpx.Response(502, request=REQUEST), body=None),
+])
+def test_transient_errors_are_retried(error):
+    call, calls = flaky(error, error)
+    assert manager().execute_with_retry(call) == "ok"
+    assert len(calls) == 3
+
+def test_transient_errors_are_retried_async():
+    call, calls = flaky(APITimeoutError(request=REQUEST), httpx.ReadTimeout("slow"))
+
+    async def api_call():
+        return call()
+
+    assert asyncio.run(manager().execute_with_retry_async(api_call)) == "ok"
+    assert len(calls) == 3
+
+def test_client_errors_and_unexpected_errors_are_not_retried():
+    bad_request = BadRequestError("bad", response=httpx.Response(400, request=REQUEST), body=None)
+    for error in (bad_request, ValueError("bug")):
+        call, calls = flaky(error)
+        assert manager().execute_with_retry(call) is None
+        assert len(calls) == 1
+
+def test_gives_up_after_max_retries():
+    error = APIConnectionError(request=REQUEST)
+    call, calls = flaky(*[error] * 5)
+    assert manager(max_retries=2).execute_with_retry(call) is None
+    assert len(calls) == 3
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import httpx
+from src.batch import BatchRunner, item_id, load_checkpoint, read_items
+from src.core.cost_controller import CostController
+from src.core.models import Summary
+from src.core.news_fetcher import AsyncNewsFetcher
+from src.core.ranking import ArticleRanker
+
+def test_item_id_prefers_explicit_id_then_topic_then_url():
+    assert item_id({"id": 17, "topic": "ai"}) == "17"
+    assert item_id({"topic": "  Climate   Change "}) == "topic:climate change"
+    assert item_id({"url": "https://www.example.com/a/?utm_source=x", "title": "t"}) == "url:example.com/a"
+
+def test_read_items_skips_invalid_lines(tmp_path, caplog):
+    path = tmp_path / "in.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"topic": "ai"}),
+        "not json",
+        json.dumps([1, 2]),
+        json.dumps({"title": "no url"}),
+        json.dumps({"url": "http://x.com:99999/a", "title": "bad port"}),
+        "",
+        json.dumps({"url": "https://example.com/a", "title": "ok"}),
+    ]) + "\n")
+    items = list(read_items(str(path)))
+    assert [item.get("topic") or item["title"] for item in items] == ["ai", "bad port", "ok"]
+    assert caplog.text.count("skipping invalid line") == 3
+
+def test_load_checkpoint_takes_latest_status_per_id(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"id": "topic:a", "status": "ok"}),
+        json.dumps({"id": "topic:b", "status": "partial"}),
+        json.dumps({"id": "topic:c", "status": "ok"}),
+        json.dumps({"id": "topic:b", "status": "ok"}),
+        json.dumps({"id": "topic:c", "status": "error"}),
+    ]) + "\n")
+    assert load_checkpoint(str(path)) == {"topic:a", "topic:b"}
+
+def test_load_checkpoint_skips_truncated_and_foreign_lines(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text("\n".join([
+        "[1]",
+        "42",
+        json.dumps({"status": "ok"}),
+        json.dumps({"id": 5, "status": "ok"}),
+        json.dumps({"id": "topic:a", "status": "ok"}),
+        '{"id": "topic:b", "sta',
+    ]))
+    assert load_checkpoint(str(path)) == {"topic:a"}
+
+def test_load_checkpoint_missing_file(tmp_path):
+    assert load_checkpoint(str(tmp_path / "missing.jsonl")) == set()
+
+class FakeSummarizer:
+    """Stands in for the LLM: every article gets an abstractive summary"""
+
+    def __init__(self):
+        self.cost_controller = CostController(daily_budget=1.0)
+
+    async def summarize_articles(self, articles):
+        return [Summary(f"Summary of {article.title}") for article in articles]
+
+def run_topics(output_path, newsapi_status: int):
+    def newsapi(request: httpx.Request) -> httpx.Response:
+        if newsapi_status != 200:
+            return httpx.Response(newsapi_status, json={"status": "error"})
+        articles = [
+            {
+                "source": {"name": "Wire"},
+                "title": f"Climate story {i}",
+                "url": f"https://example.com/climate-{i}",
+                "description": "Emissions fell for the first time in a decade, the report says.",
+                "content": "Emissions fell for the first time in a decade, the report says. " * 5
+            }
+            for i in range(3)
+        ]
+        return httpx.Response(200, json={"status": "ok", "totalResults": 3, "articles": articles})
+
+    async def main():
+        fetcher = AsyncNewsFetcher()
+        fetcher.client = httpx.AsyncClient(base_url="https://newsapi.test/v2", transport=httpx.MockTransport(newsapi))
+        try:
+            with open(output_path, "a", encoding="utf-8") as output:
+                runner = BatchRunner(fetcher, FakeSummarizer(), ArticleRanker(), output, concurrency=2, top_k=2)
+                return await runner.run(iter([{"topic": "climate"}]), load_checkpoint(str(output_path)))
+        finally:
+            await fetcher.aclose()
+
+    return asyncio.run(main())
+
+def test_failed_fetch_is_an_error_and_retried_on_resume(tmp_path):
+    output_path = tmp_path / "out.jsonl"
+
+    counts = run_topics(output_path, newsapi_status=503)
+    assert counts["error"] == 1
+    assert json.loads(output_path.read_text().splitlines()[-1])["status"] == "error"
+    assert load_checkpoint(str(output_path)) == set()
+
+    counts = run_topics(output_path, newsapi_status=200)
+    assert counts["ok"] == 1 and counts["already_done"] == 0
+    record = json.loads(output_path.read_text().splitlines()[-1])
+    assert record["status"] == "ok" and record["summarized_count"] == 2
+    assert load_checkpoint(str(output_path)) == {"topic:climate"}
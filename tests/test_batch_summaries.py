@@ -0,0 +1,31 @@
+import json
+import pytest
+from src.core.summarizer import SmartSummarizer
+
+@pytest.fixture
+def summarizer(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_PERSISTENT", "false")
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+    return SmartSummarizer()
+
+def response(*items) -> str:
+    return "Here you go:\n" + json.dumps({"summaries": list(items)}) + "\nDone."
+
+def test_summaries_are_placed_by_id(summarizer):
+    text = response({"id": 2, "summary": " Second. "}, {"id": "1", "summary": "First."})
+    assert summarizer._parse_batch_summaries(text, 3) == ["First.", "Second.", None]
+
+def test_out_of_range_malformed_and_empty_items_are_ignored(summarizer):
+    text = response(
+        {"id": 0, "summary": "zero"}, {"id": 4, "summary": "four"}, {"id": True, "summary": "bool"},
+        "not an item", {"id": 2, "summary": "   "}, {"id": 3, "summary": ["list"]}, {"id": 1, "summary": "ok"}
+    )
+    assert summarizer._parse_batch_summaries(text, 3) == ["ok", None, None]
+
+def test_duplicated_ids_are_dropped(summarizer):
+    text = response({"id": 1, "summary": "A"}, {"id": 2, "summary": "B"}, {"id": 1, "summary": "A again"})
+    assert summarizer._parse_batch_summaries(text, 2) == [None, "B"]
+
+@pytest.mark.parametrize("text", ["no json here", "{not json}", json.dumps({"summaries": "nope"}), "[1, 2]"])
+def test_unusable_responses_give_all_none(summarizer, text):
+    assert summarizer._parse_batch_summaries(text, 2) == [None, None]
@@ -0,0 +1,76 @@
+import time
+from src.core.cache import LRUCache, SQLiteCache, TieredCache
+
+def test_lru_evicts_least_recently_used_by_count_and_bytes():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # b is now the least recently used
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+
+    sized = LRUCache(max_bytes=10)
+    sized.set("a", "x" * 6)
+    sized.set("b", "y" * 6)
+    assert sized.get("a") is None
+    assert sized.stats()["bytes"] == 6 and sized.evictions == 1
+
+def test_lru_expires_entries():
+    cache = LRUCache(ttl_seconds=60)
+    cache.set("old", "value", timestamp=time.time() - 61)
+    cache.set("new", "value")
+    assert cache.get("old") is None
+    assert cache.get("new") == "value"
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "summaries.sqlite3")
+    first = SQLiteCache(path)
+    first.set("key", "summary")
+    first.close()
+    assert SQLiteCache(path).get("key") == "summary"
+
+def test_sqlite_prune_keeps_most_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "summaries.sqlite3"))
+    for key in "abc":
+        cache.set(key, key)
+    cache.touch({"a": time.time() + 10})
+    cache.prune(2)
+    assert [key for key, _, _ in cache.load_recent(10)] == ["a", "c"]
+
+def tiered(tmp_path, **kwargs) -> TieredCache:
+    return TieredCache(LRUCache(max_entries=10), SQLiteCache(str(tmp_path / "summaries.sqlite3")), **kwargs)
+
+def test_tiered_reads_through_to_disk_and_promotes(tmp_path):
+    cache = tiered(tmp_path)
+    cache.persistent.set("key", "summary")
+    assert cache.memory.get("key") is None
+    assert cache.get("key") == "summary"
+    assert cache.memory.get("key") == "summary"
+
+def test_tiered_hits_update_disk_recency_in_batches(tmp_path):
+    cache = tiered(tmp_path, touch_batch=2)
+    for key in "abc":
+        cache.set(key, key)
+    accessed_at = dict(cache.persistent._conn.execute("SELECT key, accessed_at FROM cache").fetchall())
+
+    cache.get("a")  # A memory hit - buffered
+    assert cache.persistent._conn.execute("SELECT accessed_at FROM cache WHERE key = 'a'").fetchone()[0] == accessed_at["a"]
+    cache.get("a")
+    cache.get("b")  # Batch full - written
+    assert cache.persistent._conn.execute("SELECT accessed_at FROM cache WHERE key = 'a'").fetchone()[0] > accessed_at["a"]
+
+def test_tiered_prunes_disk_while_running(tmp_path):
+    cache = tiered(tmp_path, max_persistent_entries=2, maintenance_interval=0.0)
+    for key in "abcd":
+        cache.set(key, key)
+        time.sleep(0.001)
+    assert cache.persistent._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 2
+
+def test_warm_start_loads_recent_entries(tmp_path):
+    cache = tiered(tmp_path)
+    for key in "abc":
+        cache.set(key, key)
+    fresh = TieredCache(LRUCache(max_entries=10), cache.persistent)
+    assert fresh.warm_start(2) == 2
+    assert len(fresh.memory) == 2
@@ -0,0 +1,138 @@
+import httpx
+import pytest
+from openai import RateLimitError
+from src.core import circuit_breaker
+from src.core.api_resilience import ResilienceManager
+from src.core.circuit_breaker import CircuitBreaker, CircuitState
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = dict(failure_rate_threshold=0.5, window_seconds=60.0, min_calls=4, open_seconds=30.0, half_open_probes=2)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+def trip(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_calls):
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+def test_stays_closed_below_min_calls_and_threshold(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED  # Too few calls to judge
+    for _ in range(4):
+        breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED  # 3/7 failed
+
+def test_opens_on_failure_rate_and_rejects_until_cool_down(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    assert not breaker.allow_request()
+    clock.now += 29.0
+    assert not breaker.allow_request()
+    assert breaker.rejected == 2
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 61.0
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+def test_half_open_probes_close_the_circuit(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30.0
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # Only half_open_probes at a time
+    breaker.record_success()
+    assert breaker.state == CircuitState.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.transitions == {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker()
+    trip(breaker)
+    clock.now += 30.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()  # A fresh cool-down
+
+def test_lost_probe_slots_are_recovered(clock):
+    breaker = make_breaker(half_open_probes=1)
+    trip(breaker)
+    clock.now += 30.0
+    assert breaker.allow_request()  # This probe never reports back
+    assert not breaker.allow_request()
+    clock.now += 60.0
+    assert breaker.allow_request()
+
+def rate_limited():
+    response = httpx.Response(429, request=httpx.Request("POST", "https://api.openai.test/v1/chat/completions"))
+    raise RateLimitError("rate limited", response=response, body=None)
+
+def test_rate_limit_fails_a_half_open_probe(clock):
+    breaker = make_breaker(half_open_probes=1)
+    trip(breaker)
+    clock.now += 30.0
+    manager = ResilienceManager(max_retries=0, base_delay=0.0, breaker=breaker)
+    assert manager.execute_with_retry(rate_limited) is None
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.transitions["half_open->open"] == 1
+
+def test_rate_limit_does_not_count_against_a_closed_circuit(clock):
+    breaker = make_breaker(min_calls=1)
+    manager = ResilienceManager(max_retries=0, base_delay=0.0, breaker=breaker)
+    assert manager.execute_with_retry(rate_limited) is None
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.get_status()["calls_in_window"] == 0
+
+def test_status_reports_window_and_transitions(clock):
+    breaker = make_breaker()
+    breaker.record_success()
+    breaker.record_failure()
+    status = breaker.get_status()
+    assert status["state"] == "closed"
+    assert status["calls_in_window"] == 2
+    assert status["failure_rate"] == 0.5
+    breaker.record_failure()
+    breaker.record_failure()  # 3 of 4 failed
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    status = breaker.get_status()
+    assert status["state"] == "open" and status["rejected"] == 1
+    assert status["transitions"] == {"closed->open": 1}
+
+def test_client_errors_close_a_half_open_probe(clock):
+    from openai import BadRequestError
+
+    breaker = make_breaker(half_open_probes=1)
+    trip(breaker)
+    clock.now += 30.0
+    manager = ResilienceManager(max_retries=0, base_delay=0.0, breaker=breaker)
+
+    def bad_request():
+        response = httpx.Response(400, request=httpx.Request("POST", "https://api.openai.test/v1/chat/completions"))
+        raise BadRequestError("bad request", response=response, body=None)
+
+    assert manager.execute_with_retry(bad_request) is None
+    assert breaker.state == CircuitState.CLOSED  # The endpoint answered - only this request was bad
@@ -0,0 +1,43 @@
+import pytest
+from src.core.cost_controller import (
+    ARTICLES_SKIPPED, SKIP_BUDGET, SKIP_DUPLICATE, SKIP_IN_FLIGHT, SKIP_LOW_QUALITY, CostController
+)
+from src.core.models import ArticleRecord
+
+def article(url: str = "https://example.com/a", content: str = "Long enough article body. " * 20) -> ArticleRecord:
+    return ArticleRecord(title="A real headline about policy", url=url, source="Wire", content=content)
+
+def skipped(reason: str) -> float:
+    return ARTICLES_SKIPPED.labels(reason=reason).value
+
+def test_claimed_article_is_in_flight_not_a_duplicate_skip():
+    controller = CostController()
+    peer = CostController(state=controller.state)  # Another worker sharing the store
+    assert peer.reserve_article(article())
+
+    duplicates = skipped(SKIP_DUPLICATE)
+    assert controller.skip_reason(article()) == SKIP_IN_FLIGHT
+    assert not controller.reserve_article(article())
+    assert controller.is_in_flight(article())
+    assert skipped(SKIP_DUPLICATE) == duplicates
+
+def test_processed_article_is_a_duplicate():
+    controller = CostController()
+    controller.mark_processed(article(url="https://www.example.com/a?utm_source=feed"))
+
+    duplicates = skipped(SKIP_DUPLICATE)
+    assert controller.skip_reason(article()) == SKIP_DUPLICATE
+    assert skipped(SKIP_DUPLICATE) == duplicates + 1
+
+def test_released_claim_can_be_taken_again():
+    controller = CostController()
+    assert controller.reserve_article(article())
+    controller.release_article(article())
+    assert controller.reserve_article(article())
+
+@pytest.mark.parametrize("make_controller, item, reason", [
+    (lambda: CostController(daily_budget=0.0), article(), SKIP_BUDGET),
+    (lambda: CostController(), article(content="Too short"), SKIP_LOW_QUALITY),
+])
+def test_budget_and_quality_skips(make_controller, item, reason):
+    assert make_controller().skip_reason(item) == reason
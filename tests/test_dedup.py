@@ -0,0 +1,49 @@
+import pytest
+
+from src.core.dedup import MinHasher, NearDuplicateIndex, similarity
+from src.core.models import ArticleRecord
+
+STORY = (
+    "The central bank raised interest rates by a quarter point on Wednesday, "
+    "citing persistent inflation in services and a tight labour market. "
+    "Officials signalled that further increases remain possible this year."
+)
+
+def article(url: str, content: str, title: str = "Central bank raises rates") -> ArticleRecord:
+    return ArticleRecord(title=title, url=url, source="Wire", content=content)
+
+def test_signatures_are_stable_and_estimate_similarity():
+    assert MinHasher().signature(STORY) == MinHasher().signature(STORY)
+    signature = MinHasher().signature(STORY)
+    assert similarity(signature, signature) == 1.0
+    assert MinHasher().signature("") is None
+
+def test_syndicated_copy_maps_to_the_indexed_article():
+    index = NearDuplicateIndex()
+    index.add(article("https://wire.example/a", STORY), key="original")
+    copy = article("https://outlet.example/b", STORY + " Reporting by the wire desk. [+1234 chars]")
+    assert index.find(copy) == "original"
+    assert index.matches == 1
+
+def test_unrelated_article_is_not_matched():
+    index = NearDuplicateIndex()
+    index.add(article("https://wire.example/a", STORY), key="original")
+    other = article(
+        "https://outlet.example/c",
+        "A new telescope captured detailed images of a distant galaxy cluster, "
+        "helping astronomers study how dark matter shapes cosmic structure.",
+        title="Telescope images galaxy cluster"
+    )
+    assert index.find(other) is None
+    assert index.matches == 0
+
+def test_index_evicts_oldest_entries():
+    index = NearDuplicateIndex(max_entries=2)
+    for i in range(3):
+        index.add(article(f"https://wire.example/{i}", f"Story {i}: " + STORY.replace("quarter", f"{i}")))
+    assert len(index) == 2
+    assert "https://wire.example/0" not in index._signatures
+
+def test_bands_must_divide_the_signature():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(num_perm=64, bands=10)
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+from src.core.cost_controller import CostController
+from src.core.digests import DigestMaterializer, ProfileStore
+from src.core.models import ArticleRecord, Summary, UserProfile
+from src.core.ranking import ArticleRanker
+
+BODY = "A full article body that passes the quality check. " * 5
+
+class FakeFetcher:
+    """NewsAPI stand-in: a few articles per topic, or a failure that leaves the topic stale"""
+
+    def __init__(self):
+        self.available = True
+        self.fetches = []
+
+    async def fetch_articles(self, topic):
+        self.fetches.append(topic)
+        return [
+            ArticleRecord(title=f"{topic} story {i}", url=f"https://example.com/{topic}/{i}", source="Wire", content=BODY)
+            for i in range(3)
+        ]
+
+    def is_stale(self, topic):
+        return not self.available
+
+class FakeSummarizer:
+    def __init__(self):
+        self.cost_controller = CostController(daily_budget=1.0)
+
+    async def iter_summaries(self, articles):
+        for index, article in enumerate(articles):
+            yield index, Summary(f"Summary of {article.title}")
+
+def materializer(tmp_path=None) -> DigestMaterializer:
+    profiles = ProfileStore(str(tmp_path / "profiles.sqlite3") if tmp_path else None)
+    return DigestMaterializer(FakeFetcher(), FakeSummarizer(), ArticleRanker(), profiles, top_k=2)
+
+def digest(digests: DigestMaterializer, user_id: str) -> dict:
+    return json.loads(digests.get_digest(user_id))
+
+def test_new_subscription_waits_for_articles_and_fills_in_summaries():
+    async def run():
+        digests = materializer()
+        digests.set_profile("alice", UserProfile(topics={"ai": 1.0}))
+        assert digest(digests, "alice")["pending_topics"] == ["ai"]
+        await digests.ensure_digest("alice")
+        await asyncio.gather(*digests._background)
+        return digests
+
+    digests = asyncio.run(run())
+    result = digest(digests, "alice")
+    assert result["pending_topics"] == []
+    assert result["article_count"] == 2
+    assert result["summarized_count"] == 2
+    assert all(article["summary_type"] == "abstractive" for article in result["articles"])
+
+def test_profile_change_keeps_retained_topics_and_drops_removed_ones():
+    async def run():
+        digests = materializer()
+        digests.set_profile("alice", UserProfile(topics={"ai": 1.0}))
+        await digests.refresh_topic("ai")
+        snapshot = digests._topics["ai"]
+        refreshed_at = snapshot.refreshed_at
+
+        digests.set_profile("alice", UserProfile(topics={"ai": 1.0, "space": 1.0}))
+        assert digests._topics["ai"] is snapshot and snapshot.refreshed_at == refreshed_at
+        assert digest(digests, "alice")["pending_topics"] == ["space"]
+        await asyncio.gather(*digests._background)
+        assert digests.news_fetcher.fetches == ["ai", "space"]
+
+        digests.set_profile("alice", UserProfile(topics={"space": 1.0}))
+        assert "ai" not in digests._topics
+        assert {article["topic"] for article in digest(digests, "alice")["articles"]} == {"space"}
+
+    asyncio.run(run())
+
+def test_failed_fetch_keeps_the_snapshot():
+    async def run():
+        digests = materializer()
+        digests.set_profile("alice", UserProfile(topics={"ai": 1.0}))
+        await digests.refresh_topic("ai")
+        snapshot = digests._topics["ai"]
+        entries, refreshed_at = dict(snapshot.entries), snapshot.refreshed_at
+
+        digests.news_fetcher.available = False
+        await digests.refresh_topic("ai")
+        assert snapshot.entries == entries
+        assert snapshot.refreshed_at == refreshed_at
+        assert digest(digests, "alice")["summarized_count"] == 2
+
+    asyncio.run(run())
+
+def test_profiles_survive_a_restart(tmp_path):
+    async def run():
+        digests = materializer(tmp_path)
+        digests.set_profile("alice", UserProfile(topics={"ai": 1.0}))
+        await asyncio.gather(*digests._background)
+        digests.profiles.close()
+
+    asyncio.run(run())
+
+    restarted = materializer(tmp_path)
+    assert restarted.profiles.get("alice").topics == {"ai": 1.0}
+    assert restarted.get_status()["topics"] == 1
+    assert restarted.remove_profile("alice")
+    assert restarted.get_digest("alice") is None
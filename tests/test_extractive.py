@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.config.settings import get_settings
+from src.core.extractive import ExtractiveSummarizer
+from src.core.models import ArticleRecord, Summary
+from src.core.summarizer import SmartSummarizer
+
+TEXT = (
+    "The city council approved a new transit plan on Monday after months of debate. "
+    "The plan adds three bus rapid transit lines connecting the suburbs to downtown. "
+    "Council members said the transit lines would cut commute times for thousands of residents. "
+    "Local bakeries reported strong sales during the holiday weekend as usual. "
+    "Construction of the first line is expected to begin next spring, officials said. "
+    "Critics argued the plan does not do enough for cyclists and pedestri… [+2345 chars]"
+)
+
+def test_picks_key_sentences_in_article_order():
+    summary = ExtractiveSummarizer(max_sentences=2).summarize("Council approves transit plan", TEXT)
+    assert summary.count(".") == 2
+    assert "bakeries" not in summary
+    assert summary.startswith("The city council approved")
+
+def test_strips_newsapi_truncation_and_cut_off_sentence():
+    summary = ExtractiveSummarizer(max_sentences=10, max_chars=10_000).summarize("Transit", TEXT)
+    assert "[+" not in summary
+    assert "Critics" not in summary
+
+def test_respects_max_chars():
+    summary = ExtractiveSummarizer(max_sentences=5, max_chars=80).summarize("Transit", TEXT)
+    assert len(summary) <= 83
+    assert summary.endswith("...")
+
+def test_nothing_to_summarize():
+    assert ExtractiveSummarizer().summarize("Title", "") is None
+    assert ExtractiveSummarizer().summarize("Title", "Too short.") is None
+
+@pytest.fixture
+def summarizer(tmp_path, monkeypatch):
+    monkeypatch.setenv("CACHE_PERSISTENT", "false")
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("DAILY_BUDGET", "0")
+    get_settings.cache_clear()
+    yield SmartSummarizer()
+    get_settings.cache_clear()
+
+def test_over_budget_articles_get_an_extractive_summary(summarizer):
+    article = ArticleRecord(title="Council approves transit plan", url="https://example.com/transit", source="Wire", content=TEXT)
+    summary = asyncio.run(summarizer.summarize_article_async(article))
+    assert isinstance(summary, Summary)
+    assert summary.kind == "extractive"
+    assert "transit" in summary.text
+    assert summarizer.extractive_count == 1
+    assert summarizer.cache.get(summarizer.summary_key(article)) is None  # Not cached
+
+def test_low_quality_articles_get_no_fallback(summarizer):
+    article = ArticleRecord(title="SHOCKING transit news", url="https://example.com/shock", source="Wire", content=TEXT)
+    assert summarizer.summarize_article(article) is None
+    assert summarizer.extractive_count == 0
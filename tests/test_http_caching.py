@@ -0,0 +1,74 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from benchmarks.fake_servers import FaultConfig, start_fake_newsapi, start_fake_openai
+from src.config.settings import get_settings
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    newsapi, newsapi_url = start_fake_newsapi(faults=FaultConfig(latency=0.0))
+    openai, openai_url = start_fake_openai(faults=FaultConfig(latency=0.0))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name, value in {
+            "NEWSAPI_BASE_URL": newsapi_url,
+            "OPENAI_BASE_URL": openai_url,
+            "CACHE_DIR": str(tmp_path_factory.mktemp("cache")),
+            "OPENAI_RATE_LIMITER": "false",
+            "PREWARM_ENABLED": "false",
+            "DIGEST_REFRESH_ENABLED": "false",
+        }.items():
+            monkeypatch.setenv(name, value)
+        get_settings.cache_clear()
+        from src.main import app
+        try:
+            with TestClient(app) as client:
+                yield client
+        finally:
+            get_settings.cache_clear()
+            newsapi.shutdown()
+            openai.shutdown()
+
+def test_news_etag_covers_the_whole_body(client):
+    from src.main import _etag
+
+    response = client.get("/news/ai", params={"top_k": 2})
+    assert response.status_code == 200
+    assert "cost_metrics" in response.json()
+    assert response.headers["etag"] == _etag(response.content)
+    assert response.headers["cache-control"].startswith("private")
+
+def test_news_not_modified_until_the_body_changes(client):
+    etag = client.get("/news/ai", params={"top_k": 2}).headers["etag"]
+
+    again = client.get("/news/ai", params={"top_k": 2}, headers={"If-None-Match": f"W/{etag}"})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    other = client.get("/news/ai", params={"top_k": 2, "fields": "title"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+def test_finished_job_polls_are_not_modified(client):
+    job = client.post("/jobs", json={"topic": "ai", "top_k": 2}).json()
+    done = client.get(job["poll_url"], params={"wait": 10})
+    assert done.json()["status"] == "succeeded"
+    assert client.get(job["poll_url"], headers={"If-None-Match": done.headers["etag"]}).status_code == 304
+
+def test_digest_not_modified(client):
+    client.put("/users/reader/profile", json={"topics": {"ai": 1.0}})
+    etag = None
+    for _ in range(50):  # Summaries land in the background - wait for the digest to settle
+        digest = client.get("/digest/reader")
+        assert digest.status_code == 200
+        if digest.headers["etag"] == etag:
+            break
+        etag = digest.headers["etag"]
+        time.sleep(0.05)
+    assert client.get("/digest/reader", headers={"If-None-Match": etag}).status_code == 304
+
+def test_only_the_stream_route_skips_gzip(client):
+    assert client.get("/news/stream", params={"top_k": 5}).headers.get("content-encoding") == "gzip"
+    with client.stream("GET", "/news/ai/stream", params={"top_k": 5}) as stream:
+        assert stream.headers.get("content-encoding") is None
+        assert stream.headers["content-type"].startswith("application/x-ndjson")
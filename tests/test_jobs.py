@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.core.jobs import JobQueue, JobStatus, QueueFullError
+from src.core.models import JobPriority
+
+def test_jobs_run_by_priority_then_submission_order():
+    order = []
+
+    async def run():
+        release = asyncio.Event()
+
+        async def runner(job):
+            if job.key == "blocker":
+                await release.wait()
+            order.append(job.key)
+
+        queue = JobQueue(runner, workers=1)
+        queue.submit("blocker", {}, JobPriority.INTERACTIVE)
+        await asyncio.sleep(0)  # The only worker is now busy
+        jobs = [
+            queue.submit("batch", {}, JobPriority.BATCH)[0],
+            queue.submit("prewarm", {}, JobPriority.PREWARM)[0],
+            queue.submit("interactive-1", {}, JobPriority.INTERACTIVE)[0],
+            queue.submit("interactive-2", {}, JobPriority.INTERACTIVE)[0],
+        ]
+        assert queue.get_status()["queued"] == {"interactive": 2, "prewarm": 1, "batch": 1}
+        release.set()
+        for job in jobs:
+            assert await job.wait(timeout=1.0)
+        await queue.stop()
+
+    asyncio.run(run())
+    assert order == ["blocker", "interactive-1", "interactive-2", "prewarm", "batch"]
+
+def test_identical_jobs_are_deduplicated_and_reprioritized():
+    order = []
+
+    async def run():
+        release = asyncio.Event()
+
+        async def runner(job):
+            if job.key == "blocker":
+                await release.wait()
+            order.append(job.key)
+            return job.params["topic"]
+
+        queue = JobQueue(runner, workers=1)
+        queue.submit("blocker", {"topic": "blocker"}, JobPriority.INTERACTIVE)
+        await asyncio.sleep(0)
+        queue.submit("prewarm", {"topic": "prewarm"}, JobPriority.PREWARM)
+        batch, created = queue.submit("ai", {"topic": "ai"}, JobPriority.BATCH)
+        assert created
+        again, created = queue.submit("ai", {"topic": "ai"}, JobPriority.INTERACTIVE)
+        assert again is batch and not created
+        assert batch.priority == JobPriority.INTERACTIVE
+        assert queue.get_status()["queued"] == {"interactive": 1, "prewarm": 1, "batch": 0}
+
+        release.set()
+        assert await batch.wait(timeout=1.0)
+        assert batch.result == "ai"
+        # Finished jobs no longer absorb new submissions
+        _, created = queue.submit("ai", {"topic": "ai"}, JobPriority.BATCH)
+        assert created
+        await queue.stop()
+
+    asyncio.run(run())
+    assert order[:3] == ["blocker", "ai", "prewarm"]
+
+def test_full_queue_refuses_background_work_first():
+    async def run():
+        release = asyncio.Event()
+
+        async def runner(job):
+            await release.wait()
+
+        queue = JobQueue(runner, workers=1, max_queued=4, background_share=0.5)
+        queue.submit("running", {}, JobPriority.INTERACTIVE)
+        await asyncio.sleep(0)  # Running jobs don't count against the limit
+        queue.submit("a", {}, JobPriority.BATCH)
+        queue.submit("b", {}, JobPriority.PREWARM)
+        with pytest.raises(QueueFullError) as error:
+            queue.submit("c", {}, JobPriority.BATCH)
+        assert error.value.retry_after >= 1.0
+
+        queue.submit("c", {}, JobPriority.INTERACTIVE)
+        queue.submit("d", {}, JobPriority.INTERACTIVE)
+        with pytest.raises(QueueFullError):
+            queue.submit("e", {}, JobPriority.INTERACTIVE)
+        # A duplicate is never refused - it joins the queued job
+        assert queue.submit("a", {}, JobPriority.INTERACTIVE)[1] is False
+        release.set()
+        await queue.stop()
+
+    asyncio.run(run())
+
+def test_failed_jobs_record_the_error():
+    async def run():
+        async def runner(job):
+            raise RuntimeError("NewsAPI down")
+
+        queue = JobQueue(runner, workers=1)
+        job, _ = queue.submit("ai", {}, JobPriority.INTERACTIVE)
+        assert await job.wait(timeout=1.0)
+        await queue.stop()
+        return job
+
+    job = asyncio.run(run())
+    assert job.status == JobStatus.FAILED
+    assert job.error == "NewsAPI down"
+    assert job.to_dict()["status"] == "failed"
@@ -0,0 +1,35 @@
+from src.core.keys import canonicalize_url, content_key
+
+def test_tracking_params_dropped_and_query_sorted():
+    assert canonicalize_url("https://example.com/a?b=2&utm_source=feed&a=1&fbclid=x&mc_cid=7") == "example.com/a?a=1&b=2"
+
+def test_content_params_kept():
+    url = "https://example.com/story?id=42&source=rss&ref=home&amp=1"
+    assert canonicalize_url(url) == "example.com/story?amp=1&id=42&ref=home&source=rss"
+
+def test_scheme_www_amp_and_trailing_slash_share_a_key():
+    variants = [
+        "http://www.example.com/news/story/",
+        "https://example.com/news/story",
+        "https://amp.example.com/news/story/amp",
+        "https://m.example.com/news/story.amp",
+    ]
+    assert {canonicalize_url(url) for url in variants} == {"example.com/news/story"}
+
+def test_default_ports_dropped_others_kept():
+    assert canonicalize_url("https://example.com:443/a") == "example.com/a"
+    assert canonicalize_url("http://example.com:8080/a") == "example.com:8080/a"
+
+def test_invalid_port_falls_back_to_raw_url():
+    assert canonicalize_url(" http://x.com:99999/a ") == "http://x.com:99999/a"
+
+def test_content_key_changes_with_content_model_and_prompt():
+    key = content_key("Article body", "gpt-3.5-turbo", "v1")
+    assert key.startswith("summary:")
+    assert key == content_key("Article body", "gpt-3.5-turbo", "v1")
+    assert len({
+        key,
+        content_key("Article body, edited", "gpt-3.5-turbo", "v1"),
+        content_key("Article body", "gpt-4o", "v1"),
+        content_key("Article body", "gpt-3.5-turbo", "v2"),
+    }) == 4
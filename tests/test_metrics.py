@@ -0,0 +1,41 @@
+import pytest
+from src.core import metrics
+from src.core.metrics import OVERFLOW_LABEL, Counter, Gauge, Histogram, _Metric
+
+def test_metric_subclass_without_children_cannot_be_created():
+    class Incomplete(_Metric):
+        type_name = "untyped"
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete_total", "never built")
+
+def test_counter_series_and_cardinality_cap():
+    counter = Counter("test_requests_total", "Requests", ["topic"], max_series=2)
+    counter.labels(topic="ai").inc()
+    counter.labels(topic="ai").inc(2)
+    counter.labels(topic="climate").inc()
+    counter.labels(topic="space").inc()
+    counter.labels(topic="sports").inc()
+    rendered = counter.render()
+    assert 'test_requests_total{topic="ai"} 3' in rendered
+    assert f'test_requests_total{{topic="{OVERFLOW_LABEL}"}} 2' in rendered
+    assert len(rendered) == 2 + 3  # HELP, TYPE, and ai/climate/overflow
+
+def test_unlabelled_gauge_and_histogram():
+    gauge = Gauge("test_in_flight", "In flight")
+    gauge.inc()
+    gauge.dec()
+    gauge.set(4)
+    assert "test_in_flight 4" in gauge.render()
+
+    histogram = Histogram("test_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    rendered = histogram.render()
+    assert 'test_seconds_bucket{le="0.1"} 1' in rendered
+    assert 'test_seconds_bucket{le="+Inf"} 2' in rendered
+    assert "test_seconds_count 2" in rendered
+
+def test_registry_shares_a_metric_registered_twice():
+    first = metrics.counter("test_shared_total", "Shared")
+    assert metrics.counter("test_shared_total", "Shared") is first
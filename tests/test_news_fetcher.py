@@ -0,0 +1,135 @@
+import asyncio
+import json
+import httpx
+import pytest
+from src.core.news_fetcher import AsyncNewsFetcher
+
+def newsapi_page(count: int) -> dict:
+    return {
+        "status": "ok",
+        "totalResults": count,
+        "articles": [
+            {
+                "source": {"id": None, "name": "Wire"},
+                "title": f"Story {i}",
+                "url": f"https://example.com/story-{i}",
+                "publishedAt": f"2024-01-01T{i:02d}:00:00Z",
+                "description": "Description"
+            }
+            for i in range(count)
+        ]
+    }
+
+class FakeNewsAPI:
+    """Answers /everything with `status`, recording how often it was asked"""
+
+    def __init__(self):
+        self.status = 200
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.status != 200:
+            return httpx.Response(self.status, json={"status": "error"})
+        return httpx.Response(200, content=json.dumps(newsapi_page(3)).encode("utf-8"))
+
+@pytest.fixture
+def newsapi():
+    return FakeNewsAPI()
+
+def run(newsapi: FakeNewsAPI, steps):
+    """Run steps(fetcher) against a fetcher wired to the fake NewsAPI"""
+    async def main():
+        fetcher = AsyncNewsFetcher()
+        fetcher.client = httpx.AsyncClient(base_url="https://newsapi.test/v2", transport=httpx.MockTransport(newsapi))
+        try:
+            return await steps(fetcher)
+        finally:
+            await fetcher.aclose()
+    return asyncio.run(main())
+
+def test_fetch_page_distinguishes_failure_from_empty(newsapi):
+    newsapi.status = 500
+
+    async def steps(fetcher):
+        return await fetcher.fetch_page("ai")
+
+    assert run(newsapi, steps) is None
+
+def test_failed_first_fetch_is_not_cached(newsapi):
+    newsapi.status = 503
+
+    async def steps(fetcher):
+        articles = await fetcher.fetch_articles("ai", pages=1)
+        assert articles == []
+        assert fetcher.is_stale("ai", pages=1)
+        assert fetcher.topic_cache.get(fetcher._cache_key("ai", 1)) is None
+
+        newsapi.status = 200  # The next request retries rather than serving a cached outage
+        return await fetcher.fetch_articles("ai", pages=1)
+
+    assert len(run(newsapi, steps)) == 3
+    assert newsapi.requests == 2
+
+def test_failed_refresh_keeps_previous_articles_and_staleness(newsapi):
+    async def steps(fetcher):
+        fresh = await fetcher.fetch_articles("ai", pages=1)
+        key = fetcher._cache_key("ai", 1)
+        fetched_at = fetcher.topic_cache.get(key).fetched_at
+        assert not fetcher.is_stale("ai", pages=1)
+
+        fetcher.topic_cache.ttl_seconds = 0  # Due for a refresh
+        newsapi.status = 500
+        kept = await fetcher.fetch_articles("ai", pages=1)
+        assert [article.url for article in kept] == [article.url for article in fresh]
+        assert fetcher.topic_cache.get(key).fetched_at == fetched_at
+        assert fetcher.is_stale("ai", pages=1)
+
+    run(newsapi, steps)
+    assert newsapi.requests == 2
+
+def test_partial_failure_stores_the_pages_that_succeeded():
+    requests = []
+
+    def newsapi(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.params["page"] == "2":
+            return httpx.Response(500, json={"status": "error"})
+        return httpx.Response(200, json=newsapi_page(3))
+
+    async def steps(fetcher):
+        articles = await fetcher.fetch_articles("ai", pages=2)
+        assert len(articles) == 3
+        assert not fetcher.is_stale("ai", pages=2)
+
+    run(newsapi, steps)
+    assert len(requests) == 2
+
+def test_refresh_asks_only_for_newer_articles_and_merges():
+    requests = []
+
+    def newsapi(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if "from" not in request.url.params:
+            return httpx.Response(200, json=newsapi_page(3))
+        newer = newsapi_page(5)["articles"][3:]  # Stories 3 and 4, plus a tracking copy of story 2
+        copy = dict(newsapi_page(3)["articles"][2], url="https://www.example.com/story-2?utm_source=feed")
+        return httpx.Response(200, json={"status": "ok", "totalResults": 3, "articles": newer + [copy]})
+
+    async def steps(fetcher):
+        await fetcher.fetch_articles("ai", pages=1)
+        fetcher.topic_cache.ttl_seconds = 0
+        return await fetcher.fetch_articles("ai", pages=1)
+
+    articles = run(newsapi, steps)
+    assert requests[1].url.params["from"] == "2024-01-01T02:00:00"
+    assert [article.title for article in articles] == [f"Story {i}" for i in (4, 3, 2, 1, 0)]
+    assert articles[2].url == "https://www.example.com/story-2?utm_source=feed"  # The new copy wins
+
+def test_concurrent_fetches_of_a_topic_share_one_request(newsapi):
+    async def steps(fetcher):
+        return await asyncio.gather(*(fetcher.fetch_articles(" AI ", pages=1) for _ in range(5)))
+
+    results = run(newsapi, steps)
+    assert newsapi.requests == 1
+    assert all(len(articles) == 3 for articles in results)
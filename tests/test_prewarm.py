@@ -0,0 +1,51 @@
+import asyncio
+from types import SimpleNamespace
+from src.core.jobs import JobQueue
+from src.core.models import JobPriority
+from src.core.prewarm import PrewarmScheduler, TopicTracker
+
+def hot_tracker(topics: str) -> TopicTracker:
+    tracker = TopicTracker()
+    for topic in topics:
+        for _ in range(3):
+            tracker.record(topic)
+    return tracker
+
+def test_tracker_normalizes_and_ranks_topics():
+    tracker = TopicTracker()
+    for topic in ("space", "AI ", "ai", "  Climate   Change", "climate change"):
+        tracker.record(topic)
+    assert {topic for topic, _ in tracker.hottest(2)} == {"ai", "climate change"}
+    assert tracker.is_hot("Climate change", 2)
+    assert not tracker.is_hot("space", 2)
+
+def test_job_path_runs_max_concurrency_jobs_and_honours_budget_share():
+    cost_controller = SimpleNamespace(daily_spent=0.0, daily_budget=1.0)
+    active = []
+    peak = []
+
+    async def runner(job):
+        active.append(job.key)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.remove(job.key)
+        cost_controller.daily_spent += 0.2
+        return {"article_count": 1, "articles": [{"summary_type": "abstractive"}]}
+
+    async def main():
+        queue = JobQueue(runner, workers=4, max_queued=20, background_share=1.0)
+        queue.start()
+        scheduler = PrewarmScheduler(
+            None, SimpleNamespace(cost_controller=cost_controller), hot_tracker("abcdefgh"),
+            top_topics=8, budget_share=0.5, max_concurrency=2,
+            submit_job=lambda topic: queue.submit(topic, {"topic": topic}, JobPriority.PREWARM)[0]
+        )
+        try:
+            return await scheduler.run_once()
+        finally:
+            await queue.stop()
+
+    refreshed = asyncio.run(main())
+    assert max(peak) == 2
+    # Two windows of two jobs: 0.4 spent after the first still allows the second, 0.8 stops the run
+    assert len(refreshed) == 4
@@ -0,0 +1,40 @@
+from src.core.models import ArticleRecord
+from src.core.ranking import ArticleRanker, terms
+
+def article(title: str, description: str = "", url: str = "") -> ArticleRecord:
+    return ArticleRecord(title=title, url=url or "https://example.com/" + "-".join(title.lower().split()), source="Wire", description=description)
+
+ARTICLES = [
+    article("Celebrity chef opens restaurant", "A new menu of seasonal dishes downtown."),
+    article("Election results delayed in two states", "Officials recount ballots after a close election."),
+    article("Stock markets rally", "Investors cheer strong earnings from tech companies."),
+    article("Voters head to the polls", "Turnout in the election is expected to be high."),
+]
+
+def test_terms_fold_plurals_and_drop_stopwords():
+    assert terms("The Elections and the votes") == ["election", "vote"]
+
+def test_top_k_ranks_by_topic_relevance():
+    ranked = ArticleRanker().top_k(ARTICLES, 2, "elections")
+    assert [a.title for a, _ in ranked] == ["Election results delayed in two states", "Voters head to the polls"]
+    assert ranked[0][1] >= ranked[1][1]
+
+def test_interests_break_ties_within_a_topic():
+    ranked = ArticleRanker().top_k(ARTICLES, 1, "news", interests=["tech earnings"])
+    assert ranked[0][0].title == "Stock markets rally"
+
+def test_ineligible_articles_do_not_take_a_place():
+    ranked = ArticleRanker().top_k(
+        ARTICLES, 2, "election", eligible=lambda a: not a.title.startswith("Election")
+    )
+    assert [a.title for a, _ in ranked][0] == "Voters head to the polls"
+    assert len(ranked) == 2
+
+def test_unmatched_topic_keeps_newsapi_order():
+    ranked = ArticleRanker().top_k(ARTICLES, 4, "volcano")
+    assert [a for a, _ in ranked] == ARTICLES
+
+def test_empty_inputs():
+    ranker = ArticleRanker()
+    assert ranker.top_k([], 3, "election") == []
+    assert ranker.top_k(ARTICLES, 0, "election") == []
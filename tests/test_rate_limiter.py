@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from src.core.rate_limiter import AdaptiveRateLimiter, parse_duration
+
+def test_window_halves_on_rate_limit_and_grows_additively():
+    limiter = AdaptiveRateLimiter(max_concurrency=16)
+    limiter.record_rate_limited()
+    assert limiter.window == 8
+    limiter.record_rate_limited()  # Same wave of 429s - counted once
+    assert limiter.window == 8
+    assert limiter.rate_limited == 2
+
+    for _ in range(8):
+        limiter.record_success()
+    assert 8.9 < limiter.window < 9.1  # About one slot per window of successes
+
+def test_window_stays_within_bounds():
+    limiter = AdaptiveRateLimiter(max_concurrency=4, min_concurrency=2, initial_concurrency=3)
+    for _ in range(10):
+        limiter.record_success()
+    assert limiter.window == 4
+    for _ in range(3):
+        limiter._last_decrease = 0.0
+        limiter.record_rate_limited()
+    assert limiter.window == 2
+
+def test_retry_after_headers():
+    limiter = AdaptiveRateLimiter()
+    assert limiter.retry_after({"retry-after-ms": "250"}) == pytest.approx(0.25)
+    assert limiter.retry_after({"retry-after": "2"}) == 2.0
+    assert limiter.retry_after({}) is None
+    assert parse_duration("6m0s") == 360.0
+    assert parse_duration("20ms") == pytest.approx(0.02)
+    assert parse_duration("soon") is None
+
+def test_rate_limit_pauses_every_caller():
+    limiter = AdaptiveRateLimiter()
+    limiter.record_rate_limited(retry_after=0.05)
+
+    async def call():
+        async with limiter.slot():
+            pass
+
+    started = time.monotonic()
+    asyncio.run(call())
+    assert time.monotonic() - started >= 0.04
+    assert limiter.throttled >= 1
+
+def test_slots_cap_concurrency_at_the_window():
+    limiter = AdaptiveRateLimiter(max_concurrency=8, initial_concurrency=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot(tokens=10):
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+def test_headers_resize_and_cap_the_buckets():
+    limiter = AdaptiveRateLimiter(requests_per_minute=3500, tokens_per_minute=90_000)
+    limiter.update_from_headers({
+        "x-ratelimit-limit-requests": "500",
+        "x-ratelimit-remaining-requests": "10",
+        "x-ratelimit-remaining-tokens": "not a number"
+    })
+    status = limiter.get_status()
+    assert status["requests_per_minute"] == 500
+    assert status["requests_available"] == 10
+    assert status["tokens_available"] == 90_000
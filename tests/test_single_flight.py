@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from src.core.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_flight():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+        return flights, results
+
+    flights, results = asyncio.run(run())
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert flights.shared_calls == 4
+    assert flights.in_flight() == 0
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def run():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do("key", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        with pytest.raises(RuntimeError):
+            await flights.do("key", fail)  # A new flight after the failed one finished
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+def test_different_keys_run_independently():
+    started = []
+
+    async def work(key):
+        started.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def run():
+        flights = SingleFlight()
+        return await asyncio.gather(flights.do("a", lambda: work("a")), flights.do("b", lambda: work("b")))
+
+    assert asyncio.run(run()) == ["a", "b"]
+    assert sorted(started) == ["a", "b"]
+
+def test_a_cancelled_waiter_does_not_cancel_the_flight():
+    async def work():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def run():
+        flights = SingleFlight()
+        first = asyncio.ensure_future(flights.do("key", work))
+        second = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "result"
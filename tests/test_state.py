@@ -0,0 +1,75 @@
+import sqlite3
+import time
+
+import pytest
+
+from src.core.state import InMemoryStateStore, SQLiteStateStore, create_state_store
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    return create_state_store(request.param, str(tmp_path / "state.sqlite3"))
+
+def test_claims_are_exclusive_until_released(store):
+    assert store.try_claim("article", "worker-1", ttl_seconds=60)
+    assert store.try_claim("article", "worker-1", ttl_seconds=60)  # Re-claiming our own key is fine
+    assert not store.try_claim("article", "worker-2", ttl_seconds=60)
+    assert store.is_claimed("article")
+
+    store.release_claim("article", "worker-2")  # Not the holder - ignored
+    assert store.is_claimed("article")
+    store.release_claim("article", "worker-1")
+    assert not store.is_claimed("article")
+    assert store.try_claim("article", "worker-2", ttl_seconds=60)
+
+def test_expired_claims_are_taken_over(store):
+    assert store.try_claim("article", "worker-1", ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert not store.is_claimed("article")
+    assert store.try_claim("article", "worker-2", ttl_seconds=60)
+
+def test_spend_and_processed_are_per_day(store):
+    assert store.add_spend("2024-01-01", 0.25) == pytest.approx(0.25)
+    assert store.add_spend("2024-01-01", 0.5) == pytest.approx(0.75)
+    assert store.get_spend("2024-01-02") == 0.0
+
+    store.mark_processed("2024-01-01", "article")
+    assert store.is_processed("2024-01-01", "article")
+    assert not store.is_processed("2024-01-02", "article")
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    first, second = SQLiteStateStore(path), SQLiteStateStore(path)
+    assert first.try_claim("article", "worker-1", ttl_seconds=60)
+    assert not second.try_claim("article", "worker-2", ttl_seconds=60)
+    first.add_spend("2024-01-01", 0.5)
+    second.add_spend("2024-01-01", 0.25)
+    assert first.get_spend("2024-01-01") == pytest.approx(0.75)
+
+def test_sqlite_store_does_not_wait_on_a_locked_file(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    store = SQLiteStateStore(path, lock_timeout=0.05)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        assert not store.try_claim("article", "worker-1", ttl_seconds=60)
+        # Spend is kept in memory and still counted
+        assert store.add_spend("2024-01-01", 0.5) == pytest.approx(0.5)
+        store.mark_processed("2024-01-01", "article")  # Skipped, not raised
+        assert time.monotonic() - started < 1.0
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    # The deferred spend goes out with the next write
+    assert store.add_spend("2024-01-01", 0.25) == pytest.approx(0.75)
+    assert SQLiteStateStore(path).get_spend("2024-01-01") == pytest.approx(0.75)
+
+def test_prune_drops_old_days_and_expired_claims():
+    store = InMemoryStateStore()
+    store.mark_processed("2024-01-01", "old")
+    store.mark_processed("2024-01-02", "new")
+    store.try_claim("article", "worker-1", ttl_seconds=0.0)
+    store.prune("2024-01-02")
+    assert store._processed == {"new": "2024-01-02"}
+    assert store._claims == {}
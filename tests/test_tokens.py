@@ -0,0 +1,50 @@
+import pytest
+
+from src.core.cost_controller import CostController
+from src.core.tokens import TOKENS_PER_MESSAGE, TOKENS_PER_REPLY, TokenBudgeter
+
+@pytest.fixture
+def budgeter():
+    return TokenBudgeter("gpt-3.5-turbo")
+
+def test_short_text_is_not_truncated(budgeter):
+    text = "One sentence. Another one."
+    assert budgeter.truncate(text, 100) == text
+
+def test_truncation_stays_within_budget_and_ends_on_a_sentence(budgeter):
+    text = " ".join(f"Sentence number {i} says something about the news." for i in range(100))
+    truncated = budgeter.truncate(text, 50)
+    assert budgeter.count(truncated) <= 52  # The added ellipsis may cost a token or two
+    assert truncated.endswith("news...")
+    assert text.startswith(truncated[:-2])
+
+def test_truncation_without_a_sentence_end_adds_an_ellipsis(budgeter):
+    truncated = budgeter.truncate("word " * 500, 20)
+    assert truncated.endswith("word...")
+
+def test_message_count_includes_chat_overhead(budgeter):
+    messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": ""}]
+    expected = 2 * TOKENS_PER_MESSAGE + budgeter.count("Be brief.") + TOKENS_PER_REPLY
+    assert budgeter.count_messages(messages) == expected
+
+def test_reservation_is_settled_against_actual_usage():
+    controller = CostController(daily_budget=1.0)
+    reserved = controller.reserve_budget(prompt_tokens=1000, max_completion_tokens=1000)
+    assert reserved == pytest.approx(controller.estimate_cost(1000, 1000))
+    assert controller.daily_spent == pytest.approx(reserved)
+
+    controller.record_usage(prompt_tokens=1000, completion_tokens=100, reserved=reserved)
+    assert controller.daily_spent == pytest.approx(controller.estimate_cost(1000, 100))
+
+def test_failed_call_releases_its_reservation():
+    controller = CostController(daily_budget=1.0)
+    reserved = controller.reserve_budget(prompt_tokens=1000, max_completion_tokens=1000)
+    controller.release_budget(reserved)
+    assert controller.daily_spent == pytest.approx(0.0)
+
+def test_reservation_over_budget_is_refused():
+    controller = CostController(daily_budget=0.004)
+    assert controller.reserve_budget(prompt_tokens=1000, max_completion_tokens=1000) is not None
+    assert controller.reserve_budget(prompt_tokens=1000, max_completion_tokens=1000) is None
+    assert controller.budget_refusals == 1
+    assert controller.daily_spent == pytest.approx(controller.estimate_cost(1000, 1000))